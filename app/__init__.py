@@ -3,6 +3,8 @@ Module APP
 ----------
 Contient tous les composants liés à l'interface utilisateur :
 - main_window.py : fenêtre principale
+- blit.py : rendu Matplotlib par blitting (fond en cache)
+- compute_worker.py : thread de calcul HRV / EDR (dernier état publié)
 - ui_helpers.py : widgets utilitaires
 - signals.py : signaux Qt personnalisés
 - config.py : constantes UI
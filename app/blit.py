@@ -0,0 +1,130 @@
+# app/blit.py
+"""
+blit.py
+-------
+Rendu Matplotlib par blitting pour les canvases de MainWindow.
+
+Un redraw complet (canvas.draw) refait la mise en page des axes, ticks
+et textes. BlitManager ne le fait que lorsque c'est nécessaire :
+    - au premier affichage / après un redimensionnement (draw_event)
+    - quand des limites d'axes changent réellement (set_limits)
+Le reste du temps, update() restaure le fond mis en cache
+(copy_from_bbox), redessine les seuls artistes animés et blit.
+
+sticky_limits() arrondit les limites à un pas et garde les limites
+courantes tant que les données y tiennent, pour que le cache ne soit
+pas invalidé à chaque frame.
+
+Avec `timings` (core.debug.StageTimings), la durée de chaque update()
+(blit ou redraw complet) est enregistrée sous `name`.
+"""
+
+import math
+from typing import Iterable, Optional, Tuple
+
+
+def sticky_limits(current: Optional[Tuple[float, float]], lo: float, hi: float,
+                  step: float) -> Tuple[float, float]:
+    """
+    Limites (lo, hi) arrondies vers l'extérieur à un multiple de `step`.
+    Les limites courantes sont conservées tant qu'elles contiennent les
+    données et que celles-ci en occupent au moins la moitié.
+    """
+    if step <= 0:
+        return lo, hi
+    if current is not None:
+        c_lo, c_hi = current
+        span = c_hi - c_lo
+        if c_lo <= lo and hi <= c_hi and (hi - lo) >= 0.5 * span:
+            return current
+    new_lo = math.floor(lo / step) * step
+    new_hi = math.ceil(hi / step) * step
+    if new_hi <= new_lo:
+        new_hi = new_lo + step
+    return new_lo, new_hi
+
+
+def nice_step(value: float) -> float:
+    """Pas « rond » (1, 2 ou 5 × 10^k) d'environ value / 5."""
+    if value <= 0 or not math.isfinite(value):
+        return 1.0
+    raw = value / 5.0
+    base = 10.0 ** math.floor(math.log10(raw))
+    for m in (1.0, 2.0, 5.0, 10.0):
+        if raw <= m * base:
+            return m * base
+    return 10.0 * base
+
+
+class BlitManager:
+    """Redessine par blit les artistes animés d'un canvas Matplotlib."""
+
+    def __init__(self, canvas, artists: Iterable = (), timings=None, name: str = "draw"):
+        self.canvas = canvas
+        self.timings = timings
+        self.name = name
+        self._bg = None
+        self._artists = []
+        self.full_draws = 0
+        self.blits = 0
+        for art in artists:
+            self.add_artist(art)
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    # ------------------------------------------------------------------
+    def add_artist(self, art) -> None:
+        """Artiste redessiné à chaque update() (exclu du fond en cache)."""
+        art.set_animated(True)
+        self._artists.append(art)
+
+    def invalidate(self) -> None:
+        """Force un redraw complet au prochain update()."""
+        self._bg = None
+
+    def set_limits(self, ax, xlim=None, ylim=None) -> bool:
+        """
+        Applique des limites d'axes ; n'invalide le fond que si elles
+        changent. Retourne True si un redraw complet sera nécessaire.
+        """
+        changed = False
+        if xlim is not None and tuple(ax.get_xlim()) != tuple(map(float, xlim)):
+            ax.set_xlim(*xlim)
+            changed = True
+        if ylim is not None and tuple(ax.get_ylim()) != tuple(map(float, ylim)):
+            ax.set_ylim(*ylim)
+            changed = True
+        if changed:
+            self.invalidate()
+        return changed
+
+    # ------------------------------------------------------------------
+    def _on_draw(self, event) -> None:
+        # appelé après chaque draw complet (y compris resize) : on met le
+        # fond (sans artistes animés) en cache puis on les redessine
+        if event is not None and event.canvas is not self.canvas:
+            return
+        self._bg = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        fig = self.canvas.figure
+        for art in self._artists:
+            fig.draw_artist(art)
+
+    def update(self) -> None:
+        """Redessine les artistes animés (blit) ou la figure entière si besoin."""
+        if self.timings is None:
+            self._update()
+            return
+        with self.timings.stage(self.name):
+            self._update()
+
+    def _update(self) -> None:
+        if self._bg is None:
+            self.canvas.draw()
+            self.full_draws += 1
+            return
+        self.canvas.restore_region(self._bg)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+        self.blits += 1
@@ -0,0 +1,146 @@
+# app/compute_worker.py
+"""
+compute_worker.py
+-----------------
+Thread de calcul dédié au pipeline HRV / EDR.
+
+- possède le Processor (seul ce thread y touche)
+- reçoit les RR (instant, RR ms) par un anneau un écrivain / un lecteur
+  sans lock (core.circular_buffer.SPSCRingBuffer) : push_rr / push_batch
+  sont appelés directement par le thread qui reçoit les RR (thread
+  asyncio du capteur, ou thread GUI pour la simulation) ; un Event ne
+  sert qu'à réveiller le thread de calcul
+- publie le dernier ProcessorState : « le plus récent gagne ». Si l'UI
+  n'a pas encore récupéré l'état précédent, il est remplacé (compté
+  dans dropped_states) et aucun signal supplémentaire n'est émis.
+
+Cadences (core.scheduler) : le domaine temporel est recalculé à chaque
+battement, le spectre / la respiration estimée au plus à heavy_rate_hz
+(1 Hz par défaut), même si les RR arrivent plus vite.
+
+Le thread GUI ne fait plus que le rendu ; la latence de calcul
+(last_compute_ms) est mesurée ici, indépendamment du temps de frame.
+"""
+
+import math
+import threading
+import time
+
+from PySide6 import QtCore
+
+from core.circular_buffer import SPSCRingBuffer
+from core.scheduler import MultiRateScheduler
+from pipeline.processor import Processor, ProcessorState
+
+RR_RING = 4096      # RR en attente au plus (plusieurs dizaines de minutes)
+
+
+class ComputeWorker(QtCore.QThread):
+    """Thread de calcul : RR en entrée, ProcessorState en sortie."""
+
+    # émis (une fois par état non consommé) quand take_latest() a du nouveau
+    state_ready = QtCore.Signal()
+
+    def __init__(self, processor: Processor | None = None, parent=None,
+                 heavy_rate_hz: float = 1.0):
+        super().__init__(parent)
+        self.processor = processor or Processor()
+        self._published_gen = -1
+        self._heavy_gen = -1
+
+        # spectre / EDR d'abord : s'il tourne, il couvre aussi le battement
+        self.scheduler = MultiRateScheduler()
+        self.scheduler.add("spectral", self._compute_heavy, rate_hz=heavy_rate_hz, priority=1)
+        self.scheduler.add("time_domain", self._compute_light, priority=0)
+
+        # un seul écrivain (source RR), un seul lecteur (ce thread)
+        self.rr_in = SPSCRingBuffer(RR_RING)
+        self._cursor = 0
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._latest: ProcessorState | None = None
+        self._notified = False
+        self._stopping = False      # stop() peut précéder le démarrage du thread
+
+        self.last_compute_ms = 0.0
+        self.dropped_states = 0
+        self.dropped_rr = 0         # RR écrasés avant lecture (anneau plein)
+
+    # ------------------------------------------------------------------
+    # API source RR (un seul thread écrivain) / thread GUI
+    # ------------------------------------------------------------------
+    def push_rr(self, rr: float, t: float | None = None) -> None:
+        """Transmet un RR (ms) terminé à l'instant t (s ; None : cumul des RR)."""
+        self.rr_in.append(math.nan if t is None else t, rr)
+        self._wake.set()
+
+    def push_batch(self, t, rr_ms) -> None:
+        """Transmet un lot (instants de battement, RR ms) en une écriture."""
+        self.rr_in.extend(t, rr_ms)
+        self._wake.set()
+
+    def take_latest(self) -> ProcessorState | None:
+        """Récupère le dernier état publié (None si rien de nouveau)."""
+        with self._lock:
+            state = self._latest
+            self._latest = None
+            self._notified = False
+        return state
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Boucle du thread
+    # ------------------------------------------------------------------
+    def run(self):
+        while True:
+            self._wake.wait(self.scheduler.time_to_next())
+            self._wake.clear()
+            # lu avant la lecture de l'anneau : les RR transmis avant
+            # stop() sont encore absorbés
+            stopping = self._stopping
+            # on absorbe tous les RR déjà arrivés avant de recalculer
+            if self._drain():
+                self.scheduler.trigger("time_domain")
+            if stopping:
+                break
+            self.scheduler.tick()
+
+    def _drain(self) -> int:
+        """RR écrits depuis la dernière lecture → Processor ; renvoie leur nombre."""
+        ts, rr, cursor = self.rr_in.read_since(self._cursor)
+        self.dropped_rr += cursor - self._cursor - ts.size
+        self._cursor = cursor
+        for t, x in zip(ts.tolist(), rr.tolist()):
+            self.processor.push_rr(x, None if math.isnan(t) else t)
+        return ts.size
+
+    def _compute_light(self) -> None:
+        """Par battement : domaine temporel, spectre / RSA repris du cache."""
+        if self.processor.generation != self._published_gen:
+            self._compute(heavy=False)
+
+    def _compute_heavy(self) -> None:
+        """Cadence lente : spectre + respiration estimée."""
+        if self.processor.generation != self._heavy_gen:
+            self._heavy_gen = self.processor.generation
+            self._compute(heavy=True)
+
+    def _compute(self, heavy: bool) -> None:
+        t0 = time.perf_counter()
+        state = self.processor.compute_state(heavy=heavy)
+        self.last_compute_ms = (time.perf_counter() - t0) * 1000.0
+        self._published_gen = self.processor.generation
+        self._publish(state)
+
+    def _publish(self, state: ProcessorState) -> None:
+        with self._lock:
+            if self._latest is not None:
+                self.dropped_states += 1
+            self._latest = state
+            emit = not self._notified
+            self._notified = True
+        if emit:
+            self.state_ready.emit()
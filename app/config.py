@@ -9,6 +9,8 @@ class AppConfig:
     INH = 4.0
     EXH = 6.0
 
+    # Fenêtres d'analyse (s) : spectre / RSA, puis domaine temporel
+    # (RMSSD, SDNN, pNN50, HR) — durée fixe quel que soit le rythme
     RR_WINDOW_SECONDS = 120
     HRV_WINDOW_SECONDS = 60
 
@@ -17,3 +19,26 @@ class AppConfig:
     COLOR_BAD = "#f7b5b5"
 
     DEFAULT_STYLE = "sinus"
+
+    # Source RR : "sim" (simulation) ou "bleak" (capteur réel, 0x2A37)
+    BLE_BACKEND = "sim"
+    BLE_ADDRESS = None      # None = scan par nom (Polar H10)
+
+    # Rendu des graphes de app.graphs : "matplotlib" ou "qpainter"
+    GRAPH_BACKEND = "matplotlib"
+
+    # Surimpression de performance (p50 / p95 par étage), basculée par F3
+    PERF_HUD = False
+
+    # Trace Chrome (core.debug.TRACER) : F4 démarre / arrête, le fichier
+    # trace-AAAAMMJJ-HHMMSS.json est écrit dans ce répertoire à l'arrêt
+    TRACE_DIR = "traces"
+
+    # Logging (core.debug.setup_logger) : "queue" = écriture console /
+    # fichier dans un thread de fond, jamais dans le thread GUI
+    LOG_MODE = "queue"
+    LOG_FILE = None         # ex. "coherence.log" (fichier tournant)
+
+    # Enregistrement des RR reçus (pipeline.recording) : None = désactivé,
+    # sinon répertoire où créer un fichier .rrb par session
+    RECORD_DIR = None
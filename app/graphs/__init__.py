@@ -7,11 +7,75 @@ Sous-module UI : graphes principaux de l'application.
 - SpectralGraph     : affichage des composantes LF / HF + ratio
 - RespirationGraph  : affichage respiration guidée + respiration réelle / sinus
 
-Chaque graphe est un QWidget contenant un canvas Matplotlib.
+Deux implémentations, mêmes API update(...) :
+- "matplotlib" : QWidget contenant un canvas Matplotlib (rr_graph.py…)
+- "qpainter"   : LinePlot dessiné au QPainter (qt_plot.py, qt_graphs.py),
+                 sans import de Matplotlib
+
+create_graph(kind) choisit selon AppConfig.GRAPH_BACKEND ; les classes
+ne sont importées qu'à la demande.
 """
 
-from .rr_graph import RRGraph
-from .spectral_graph import SpectralGraph
-from .respiration_graph import RespirationGraph
+from app.config import AppConfig
+from core.registry import BackendRegistry
+
+GRAPH_KINDS = ("rr", "spectral", "respiration", "guided")
+
+GRAPH_BACKENDS = {
+    "matplotlib": BackendRegistry("graph-matplotlib"),
+    "qpainter": BackendRegistry("graph-qpainter"),
+}
+GRAPH_BACKENDS["matplotlib"].register("rr", "app.graphs.rr_graph:RRGraph", requires=("matplotlib",))
+GRAPH_BACKENDS["matplotlib"].register("spectral", "app.graphs.spectral_graph:SpectralGraph",
+                                      requires=("matplotlib",))
+GRAPH_BACKENDS["matplotlib"].register("respiration", "app.graphs.respiration_graph:RespirationGraph",
+                                      requires=("matplotlib",))
+GRAPH_BACKENDS["matplotlib"].register("guided", "app.ui_graphs:RespirationGraph",
+                                      requires=("matplotlib",))
+GRAPH_BACKENDS["qpainter"].register("rr", "app.graphs.qt_graphs:QtRRGraph")
+GRAPH_BACKENDS["qpainter"].register("spectral", "app.graphs.qt_graphs:QtSpectralGraph")
+GRAPH_BACKENDS["qpainter"].register("respiration", "app.graphs.qt_graphs:QtRespirationGraph")
+GRAPH_BACKENDS["qpainter"].register("guided", "app.graphs.qt_graphs:QtGuidedRespirationGraph")
+
+
+def graph_class(kind: str, backend: str = None):
+    """Classe du graphe `kind` pour `backend` (défaut : AppConfig.GRAPH_BACKEND)."""
+    backend = backend or AppConfig.GRAPH_BACKEND
+    try:
+        registry = GRAPH_BACKENDS[backend]
+    except KeyError:
+        raise KeyError(
+            f"backend graphique inconnu : {backend!r} (connus : {', '.join(GRAPH_BACKENDS)})"
+        ) from None
+    return registry.get(kind)
+
+
+def create_graph(kind: str, parent=None, backend: str = None):
+    """Instancie le graphe `kind` ("rr", "spectral", "respiration", "guided")."""
+    return graph_class(kind, backend)(parent)
+
+
+_LAZY = {
+    "RRGraph": ("matplotlib", "rr"),
+    "SpectralGraph": ("matplotlib", "spectral"),
+    "RespirationGraph": ("matplotlib", "respiration"),
+}
+
+__all__ = [
+    "RRGraph",
+    "SpectralGraph",
+    "RespirationGraph",
+    "GRAPH_BACKENDS",
+    "GRAPH_KINDS",
+    "graph_class",
+    "create_graph",
+]
+
 
-__all__ = ["RRGraph", "SpectralGraph", "RespirationGraph"]
+def __getattr__(name):
+    # `from app.graphs import RRGraph` reste possible, mais Matplotlib
+    # n'est importé qu'à ce moment-là
+    if name in _LAZY:
+        backend, kind = _LAZY[name]
+        return GRAPH_BACKENDS[backend].get(kind)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
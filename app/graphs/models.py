@@ -0,0 +1,145 @@
+# app/graphs/models.py
+"""
+Préparation des données des graphes, indépendante du moteur de rendu.
+
+Partagé par les widgets Matplotlib (rr_graph, spectral_graph…) et leurs
+équivalents QPainter (qt_graphs) : chaque modèle reçoit les mêmes
+arguments que update(...) et renvoie les courbes + limites d'axes.
+N'importe ni Qt ni Matplotlib.
+"""
+
+from collections import deque
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Fenêtre de temps (en secondes) pour l'affichage RR
+RR_WINDOW_SEC = 120.0
+# Bornes de RR raisonnables
+MIN_RR_MS = 300.0
+MAX_RR_MS = 2000.0
+# Lissage visuel
+EMA_VISUAL_RR = 0.6
+
+SPECTRAL_WINDOW_POINTS = 120  # nombre de points gardés en historique
+MIN_Y_MAX = 200.0             # hauteur minimale du graphe
+
+
+def _moving_average_like(rr: np.ndarray, win: int = 7) -> np.ndarray:
+    """
+    Lissage simple façon "sinusoïde" pour lisser un peu les RR.
+    """
+    if rr.size <= 2:
+        return rr.copy()
+
+    w = max(3, int(win) | 1)  # fenêtre impaire
+    pad = w // 2
+    pad_rr = np.pad(rr, (pad, pad), mode="edge")
+    k = np.ones(w) / w
+    return np.convolve(pad_rr, k, mode="valid")
+
+
+class RRPlotModel:
+    """RR lissés sur une fenêtre glissante de RR_WINDOW_SEC secondes."""
+
+    def __init__(self):
+        self._last_vis_rr: Optional[float] = None
+
+    def prepare(self, rr_ts: Sequence[float], rr_ms: Sequence[float]):
+        """
+        Retourne (x, y, xlim, ylim), ou None s'il n'y a rien à tracer.
+
+        On suppose :
+            len(rr_ts) == len(rr_ms)
+        et rr_ts en secondes croissants.
+        """
+        if len(rr_ts) == 0 or len(rr_ms) == 0 or len(rr_ts) != len(rr_ms):
+            return None
+
+        ts = np.asarray(rr_ts, dtype=float)
+        rr = np.asarray(rr_ms, dtype=float)
+
+        # Clamp grossier
+        rr = np.clip(rr, MIN_RR_MS, MAX_RR_MS)
+
+        # Lissage
+        rr_smooth = _moving_average_like(rr, win=7)
+
+        # EMA sur le dernier point pour éviter les sauts
+        vis = rr_smooth.copy()
+        if self._last_vis_rr is not None:
+            vis[-1] = (
+                EMA_VISUAL_RR * rr_smooth[-1] + (1.0 - EMA_VISUAL_RR) * self._last_vis_rr
+            )
+        self._last_vis_rr = float(vis[-1])
+
+        # Fenêtre glissante
+        t_max = float(ts[-1])
+        t_min = max(ts[0], t_max - RR_WINDOW_SEC)
+
+        mask = ts >= t_min
+        ts_win = ts[mask] - t_min  # on remet à zéro pour l'affichage
+        rr_win = vis[mask]
+
+        # X : 0 -> RR_WINDOW_SEC
+        xmax = max(5.0, ts_win[-1]) if ts_win.size > 0 else RR_WINDOW_SEC
+        xlim = (0.0, max(10.0, min(xmax + 1.0, RR_WINDOW_SEC)))
+
+        # Y auto, mais borné
+        ylim = None
+        if rr_win.size > 0:
+            ymin = float(np.min(rr_win)) - 60.0
+            ymax = float(np.max(rr_win)) + 60.0
+            ymin = max(MIN_RR_MS, ymin)
+            ymax = min(MAX_RR_MS, ymax)
+            if ymax - ymin < 200.0:
+                ymax = ymin + 200.0
+            ylim = (ymin, ymax)
+
+        return ts_win, rr_win, xlim, ylim
+
+
+class SpectralHistoryModel:
+    """Historique LF / HF / ratio, avec plafond Y lissé par EMA."""
+
+    def __init__(self, maxlen: int = SPECTRAL_WINDOW_POINTS):
+        self.maxlen = maxlen
+        self._lf_hist: deque[float] = deque(maxlen=maxlen)
+        self._hf_hist: deque[float] = deque(maxlen=maxlen)
+        self._ratio_hist: deque[float] = deque(maxlen=maxlen)
+        self._ymax_ema: Optional[float] = None
+
+    def push(self, lf: float, hf: float, ratio: float):
+        """Ajoute un point ; retourne (x, lf, hf, ratio, xlim, ylim)."""
+        self._lf_hist.append(float(max(lf, 0.0)))
+        self._hf_hist.append(float(max(hf, 0.0)))
+        self._ratio_hist.append(float(max(ratio, 0.0)))
+
+        # Axe X = index des points
+        x = np.arange(len(self._lf_hist))
+        lf_arr = np.asarray(self._lf_hist)
+        hf_arr = np.asarray(self._hf_hist)
+        ratio_arr = np.asarray(self._ratio_hist)
+
+        # X : fenêtre glissante
+        x_max = float(x[-1])
+        x_min = max(0.0, x_max - self.maxlen + 1)
+        xlim = (x_min, x_max + 1.0)
+
+        # Y : dynamique + lissage EMA
+        current_max = float(
+            max(
+                MIN_Y_MAX,
+                float(np.max(lf_arr)),
+                float(np.max(hf_arr)),
+            )
+        )
+        target_ymax = current_max * 1.2
+
+        if self._ymax_ema is None:
+            self._ymax_ema = target_ymax
+        else:
+            self._ymax_ema = 0.85 * self._ymax_ema + 0.15 * target_ymax
+
+        ylim = (0.0, max(MIN_Y_MAX, self._ymax_ema))
+        return x, lf_arr, hf_arr, ratio_arr, xlim, ylim
@@ -0,0 +1,123 @@
+# app/graphs/qt_graphs.py
+"""
+Versions QPainter des graphes (sans Matplotlib).
+
+Mêmes API update(...) que RRGraph, SpectralGraph, RespirationGraph et
+ui_graphs.RespirationGraph ; la préparation des données est partagée
+via app.graphs.models. Sélection par AppConfig.GRAPH_BACKEND.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QVBoxLayout, QWidget
+
+from .models import RRPlotModel, SPECTRAL_WINDOW_POINTS, SpectralHistoryModel
+from .qt_plot import LinePlot
+
+
+class _PlotHost(QWidget):
+    """QWidget contenant un LinePlot, comme les graphes contiennent un canvas."""
+
+    def __init__(self, title: str, parent: Optional[QWidget] = None, **plot_kw):
+        super().__init__(parent)
+        self.plot = LinePlot(title, **plot_kw)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.plot)
+
+
+# ----------------------------------------------------------------------
+# RR
+# ----------------------------------------------------------------------
+class QtRRGraph(_PlotHost):
+    """Équivalent QPainter de RRGraph : update(rr_ts, rr_ms)."""
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__("RR (ms)", parent)
+        self._line_rr = self.plot.add_curve("#2f7ed8", 1.4)
+        self._model = RRPlotModel()
+
+    def update(self, rr_ts: Sequence[float], rr_ms: Sequence[float]) -> None:
+        prepared = self._model.prepare(rr_ts, rr_ms)
+        if prepared is None:
+            self.plot.set_data(self._line_rr, [], [])
+            return
+
+        ts_win, rr_win, xlim, ylim = prepared
+        self.plot.set_xlim(*xlim)
+        if ylim is not None:
+            self.plot.set_ylim(*ylim)
+        self.plot.set_data(self._line_rr, ts_win, rr_win)
+
+
+# ----------------------------------------------------------------------
+# Spectral
+# ----------------------------------------------------------------------
+class QtSpectralGraph(_PlotHost):
+    """Équivalent QPainter de SpectralGraph : update(lf, hf, ratio)."""
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__("Spectral LF / HF", parent)
+        self._line_lf = self.plot.add_curve("#2f7ed8", 1.4)
+        self._line_hf = self.plot.add_curve("#8bbc21", 1.4)
+        self._line_ratio = self.plot.add_curve("#910000", 1.2, Qt.DashLine)
+        self._model = SpectralHistoryModel(SPECTRAL_WINDOW_POINTS)
+
+    def update(self, lf: float, hf: float, ratio: float) -> None:
+        x, lf_arr, hf_arr, ratio_arr, xlim, ylim = self._model.push(lf, hf, ratio)
+        self.plot.set_xlim(*xlim)
+        self.plot.set_ylim(*ylim)
+        self.plot.set_data(self._line_lf, x, lf_arr)
+        self.plot.set_data(self._line_hf, x, hf_arr)
+        self.plot.set_data(self._line_ratio, x, ratio_arr)
+
+
+# ----------------------------------------------------------------------
+# Respiration
+# ----------------------------------------------------------------------
+class QtRespirationGraph(_PlotHost):
+    """
+    Équivalent QPainter de RespirationGraph :
+    update(guide_curve, edr_curve=None, dot_value=None).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__("Respiration", parent, background="#f2f2f2", frame="#f2f2f2")
+        self.plot.set_xlim(-20, 0)
+        self.plot.set_ylim(-1.2, 1.2)
+        self._line_guide = self.plot.add_curve("#008800", 2.0)
+        self._line_edr = self.plot.add_curve("#0055cc", 1.4)
+        self._dot = self.plot.add_curve("red", 1.0, marker=4.0)
+
+    def update(self, guide_curve, edr_curve=None, dot_value=None):
+        if guide_curve is None:
+            return
+
+        t_guide, y_guide = guide_curve
+        self.plot.set_data(self._line_guide, t_guide, y_guide)
+
+        if edr_curve:
+            t_edr, y_edr = edr_curve
+            self.plot.set_data(self._line_edr, t_edr, y_edr)
+
+        if dot_value is not None:
+            self.plot.set_data(self._dot, [0.0], [dot_value])
+
+
+class QtGuidedRespirationGraph(_PlotHost):
+    """Équivalent QPainter de ui_graphs.RespirationGraph : plot_guided_resp(t, y)."""
+
+    def __init__(self, parent=None):
+        super().__init__("Respiration guidée", parent)
+        self.plot.set_ylim(-1.1, 1.1)
+        self._line_guide = self.plot.add_curve("green", 1.4)
+
+    def plot_guided_resp(self, t: Sequence[float], y: Sequence[float]):
+        t = np.asarray(t, float)
+        y = np.asarray(y, float)
+
+        if t.size > 0:
+            self.plot.set_xlim(float(t.min()), float(t.max()))
+        self.plot.set_data(self._line_guide, t, y)
@@ -0,0 +1,230 @@
+# app/graphs/qt_plot.py
+"""
+LinePlot : widget de tracé de courbes minimal, dessiné au QPainter.
+
+Alternative légère au couple Figure + FigureCanvasQTAgg : pas d'import
+de Matplotlib, pas d'artistes ni de layout à recalculer. Chaque courbe
+est un QPolygonF dont la mémoire est remplie directement depuis NumPy
+(vue float64 (n, 2) sur les QPointF) : aucun objet Python par point.
+
+Les coordonnées sont converties en pixels au moment du set_data, pas à
+chaque paintEvent ; un redimensionnement ou un changement de limites
+marque simplement les polygones comme à reconvertir.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import shiboken6
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from core.debug import TRACER
+
+
+# ----------------------------------------------------------------------
+# QPolygonF <- NumPy
+# ----------------------------------------------------------------------
+def polygon_view(poly: QtGui.QPolygonF) -> np.ndarray:
+    """
+    Vue NumPy (n, 2) float64 inscriptible sur les points d'un QPolygonF.
+
+    Valide tant que le polygone n'est pas redimensionné.
+    """
+    n = poly.size()
+    if n == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    ptr = shiboken6.VoidPtr(poly.data(), 16 * n, True)
+    return np.frombuffer(ptr, dtype=np.float64).reshape(n, 2)
+
+
+# ----------------------------------------------------------------------
+# Courbe
+# ----------------------------------------------------------------------
+class _Curve:
+    __slots__ = ("pen", "marker", "x", "y", "poly", "dirty")
+
+    def __init__(self, pen: QtGui.QPen, marker: float):
+        self.pen = pen
+        self.marker = marker              # rayon du point (0 = ligne)
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.poly = QtGui.QPolygonF()
+        self.dirty = True
+
+
+# ----------------------------------------------------------------------
+# LinePlot
+# ----------------------------------------------------------------------
+class LinePlot(QtWidgets.QWidget):
+    """
+    Axes + grille + courbes, dessinés au QPainter.
+
+    API :
+        add_curve(color, width, style, marker) -> index
+        set_data(index, x, y)
+        set_xlim(lo, hi) / set_ylim(lo, hi)
+    """
+
+    MARGIN_LEFT = 46
+    MARGIN_RIGHT = 10
+    MARGIN_TOP = 24
+    MARGIN_BOTTOM = 24
+    GRID_TICKS = 5
+
+    def __init__(self, title: str = "", parent: Optional[QtWidgets.QWidget] = None,
+                 background: str = "#ffffff", frame: str = "#f7f7f7"):
+        super().__init__(parent)
+        self.title = title
+        self._bg = QtGui.QColor(background)
+        self._frame = QtGui.QColor(frame)
+        self._grid_pen = QtGui.QPen(QtGui.QColor(0, 0, 0, 40), 1.0)
+        self._axis_pen = QtGui.QPen(QtGui.QColor("#666666"), 1.0)
+        self._text_pen = QtGui.QPen(QtGui.QColor("#333333"))
+
+        self._curves: list[_Curve] = []
+        self._xlim = (0.0, 1.0)
+        self._ylim = (0.0, 1.0)
+        self._plot_rect = QtCore.QRectF()
+
+        # nombre de paintEvent effectués (bench / debug)
+        self.paints = 0
+
+        self.setMinimumSize(160, 100)
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent, True)
+
+    # --------------------------------------------------------------
+    def add_curve(self, color: str, width: float = 1.4,
+                  style: QtCore.Qt.PenStyle = QtCore.Qt.SolidLine,
+                  marker: float = 0.0) -> int:
+        """Ajoute une courbe vide et renvoie son index."""
+        pen = QtGui.QPen(QtGui.QColor(color), width, style)
+        pen.setCapStyle(QtCore.Qt.RoundCap)
+        pen.setJoinStyle(QtCore.Qt.RoundJoin)
+        self._curves.append(_Curve(pen, marker))
+        return len(self._curves) - 1
+
+    def set_data(self, index: int, x: Sequence[float], y: Sequence[float]) -> None:
+        c = self._curves[index]
+        c.x = np.asarray(x, dtype=np.float64)
+        c.y = np.asarray(y, dtype=np.float64)
+        c.dirty = True
+        self.update()
+
+    def set_xlim(self, lo: float, hi: float) -> None:
+        lim = (float(lo), float(hi))
+        if lim != self._xlim:
+            self._xlim = lim
+            self._mark_dirty()
+
+    def set_ylim(self, lo: float, hi: float) -> None:
+        lim = (float(lo), float(hi))
+        if lim != self._ylim:
+            self._ylim = lim
+            self._mark_dirty()
+
+    def xlim(self):
+        return self._xlim
+
+    def ylim(self):
+        return self._ylim
+
+    # --------------------------------------------------------------
+    def _mark_dirty(self):
+        for c in self._curves:
+            c.dirty = True
+        self.update()
+
+    def resizeEvent(self, event):
+        self._mark_dirty()
+        super().resizeEvent(event)
+
+    def _compute_plot_rect(self) -> QtCore.QRectF:
+        top = self.MARGIN_TOP if self.title else self.MARGIN_RIGHT
+        return QtCore.QRectF(
+            self.MARGIN_LEFT,
+            top,
+            max(1.0, self.width() - self.MARGIN_LEFT - self.MARGIN_RIGHT),
+            max(1.0, self.height() - top - self.MARGIN_BOTTOM),
+        )
+
+    def _to_pixels(self, c: _Curve, rect: QtCore.QRectF) -> None:
+        """Données -> pixels, écrits directement dans le QPolygonF."""
+        x0, x1 = self._xlim
+        y0, y1 = self._ylim
+        sx = rect.width() / (x1 - x0) if x1 != x0 else 0.0
+        sy = rect.height() / (y1 - y0) if y1 != y0 else 0.0
+        n = min(c.x.size, c.y.size)
+        if c.poly.size() != n:
+            c.poly.resize(n)
+        if n:
+            pts = polygon_view(c.poly)
+            np.multiply(c.x[:n] - x0, sx, out=pts[:, 0])
+            pts[:, 0] += rect.left()
+            np.multiply(c.y[:n] - y0, -sy, out=pts[:, 1])
+            pts[:, 1] += rect.bottom()
+        c.dirty = False
+
+    # --------------------------------------------------------------
+    def paintEvent(self, event):
+        with TRACER.span("paint"):
+            self._paint()
+
+    def _paint(self):
+        self.paints += 1
+        rect = self._compute_plot_rect()
+        if rect != self._plot_rect:
+            self._plot_rect = rect
+            for c in self._curves:
+                c.dirty = True
+
+        p = QtGui.QPainter(self)
+        p.fillRect(self.rect(), self._frame)
+        p.fillRect(rect, self._bg)
+
+        self._draw_grid(p, rect)
+
+        p.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        p.setClipRect(rect)
+        for c in self._curves:
+            if c.dirty:
+                self._to_pixels(c, rect)
+            if c.poly.isEmpty():
+                continue
+            p.setPen(c.pen)
+            if c.marker > 0:
+                p.setBrush(c.pen.color())
+                for i in range(c.poly.size()):
+                    p.drawEllipse(c.poly.at(i), c.marker, c.marker)
+                p.setBrush(QtCore.Qt.NoBrush)
+            else:
+                p.drawPolyline(c.poly)
+        p.end()
+
+    def _draw_grid(self, p: QtGui.QPainter, rect: QtCore.QRectF) -> None:
+        x0, x1 = self._xlim
+        y0, y1 = self._ylim
+        n = self.GRID_TICKS
+        fm = p.fontMetrics()
+
+        for i in range(n + 1):
+            fx = rect.left() + rect.width() * i / n
+            fy = rect.bottom() - rect.height() * i / n
+            p.setPen(self._grid_pen)
+            p.drawLine(QtCore.QPointF(fx, rect.top()), QtCore.QPointF(fx, rect.bottom()))
+            p.drawLine(QtCore.QPointF(rect.left(), fy), QtCore.QPointF(rect.right(), fy))
+
+            p.setPen(self._text_pen)
+            xl = f"{x0 + (x1 - x0) * i / n:.4g}"
+            yl = f"{y0 + (y1 - y0) * i / n:.4g}"
+            p.drawText(QtCore.QPointF(fx - fm.horizontalAdvance(xl) / 2,
+                                      rect.bottom() + fm.ascent() + 3), xl)
+            p.drawText(QtCore.QPointF(rect.left() - fm.horizontalAdvance(yl) - 4,
+                                      fy + fm.ascent() / 2 - 1), yl)
+
+        p.setPen(self._axis_pen)
+        p.drawRect(rect)
+
+        if self.title:
+            p.setPen(self._text_pen)
+            p.drawText(QtCore.QRectF(0, 2, self.width(), self.MARGIN_TOP - 4),
+                       QtCore.Qt.AlignCenter, self.title)
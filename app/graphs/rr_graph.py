@@ -1,34 +1,18 @@
 # app/graphs/rr_graph.py
 
-from collections import deque
 from typing import Sequence, Optional
 
-import numpy as np
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 
-# Fenêtre de temps (en secondes) pour l'affichage RR
-RR_WINDOW_SEC = 120.0
-# Bornes de RR raisonnables
-MIN_RR_MS = 300.0
-MAX_RR_MS = 2000.0
-# Lissage visuel
-EMA_VISUAL_RR = 0.6
-
-
-def _moving_average_like(rr: np.ndarray, win: int = 7) -> np.ndarray:
-    """
-    Lissage simple façon "sinusoïde" pour lisser un peu les RR.
-    """
-    if rr.size <= 2:
-        return rr.copy()
-
-    w = max(3, int(win) | 1)  # fenêtre impaire
-    pad = w // 2
-    pad_rr = np.pad(rr, (pad, pad), mode="edge")
-    k = np.ones(w) / w
-    return np.convolve(pad_rr, k, mode="valid")
+from .models import (  # noqa: F401  (constantes ré-exportées)
+    EMA_VISUAL_RR,
+    MAX_RR_MS,
+    MIN_RR_MS,
+    RR_WINDOW_SEC,
+    RRPlotModel,
+)
 
 
 class RRGraph(QWidget):
@@ -65,11 +49,8 @@ class RRGraph(QWidget):
 
         (self.line_rr,) = self.ax.plot([], [], lw=1.4, color="#2f7ed8")
 
-        self._last_vis_rr: Optional[float] = None
-
-        # Historique interne (optionnel, si on veut l'utiliser plus tard)
-        self._rr_ts_hist: deque[float] = deque(maxlen=4000)
-        self._rr_ms_hist: deque[float] = deque(maxlen=4000)
+        # Lissage / fenêtrage (partagé avec la version QPainter)
+        self._model = RRPlotModel()
 
     # ------------------------------------------------------------------ #
     def update(self, rr_ts: Sequence[float], rr_ms: Sequence[float]) -> None:
@@ -80,54 +61,17 @@ class RRGraph(QWidget):
             len(rr_ts) == len(rr_ms)
         et rr_ts en secondes croissants.
         """
-        if not rr_ts or not rr_ms or len(rr_ts) != len(rr_ms):
+        prepared = self._model.prepare(rr_ts, rr_ms)
+        if prepared is None:
             # rien à tracer
             self.line_rr.set_data([], [])
             self._canvas.draw_idle()
             return
 
-        ts = np.asarray(rr_ts, dtype=float)
-        rr = np.asarray(rr_ms, dtype=float)
-
-        # Clamp grossier
-        rr = np.clip(rr, MIN_RR_MS, MAX_RR_MS)
-
-        # Lissage
-        rr_smooth = _moving_average_like(rr, win=7)
-
-        # EMA sur le dernier point pour éviter les sauts
-        if self._last_vis_rr is None:
-            vis = rr_smooth.copy()
-            self._last_vis_rr = float(vis[-1])
-        else:
-            vis = rr_smooth.copy()
-            vis[-1] = (
-                EMA_VISUAL_RR * rr_smooth[-1] + (1.0 - EMA_VISUAL_RR) * self._last_vis_rr
-            )
-            self._last_vis_rr = float(vis[-1])
-
-        # Fenêtre glissante
-        t_max = float(ts[-1])
-        t_min = max(ts[0], t_max - RR_WINDOW_SEC)
-
-        mask = ts >= t_min
-        ts_win = ts[mask] - t_min  # on remet à zéro pour l'affichage
-        rr_win = vis[mask]
-
+        ts_win, rr_win, xlim, ylim = prepared
         self.line_rr.set_data(ts_win, rr_win)
-
-        # X : 0 -> RR_WINDOW_SEC
-        xmax = max(5.0, ts_win[-1]) if ts_win.size > 0 else RR_WINDOW_SEC
-        self.ax.set_xlim(0.0, max(10.0, min(xmax + 1.0, RR_WINDOW_SEC)))
-
-        # Y auto, mais borné
-        if rr_win.size > 0:
-            ymin = float(np.min(rr_win)) - 60.0
-            ymax = float(np.max(rr_win)) + 60.0
-            ymin = max(MIN_RR_MS, ymin)
-            ymax = min(MAX_RR_MS, ymax)
-            if ymax - ymin < 200.0:
-                ymax = ymin + 200.0
-            self.ax.set_ylim(ymin, ymax)
+        self.ax.set_xlim(*xlim)
+        if ylim is not None:
+            self.ax.set_ylim(*ylim)
 
         self._canvas.draw_idle()
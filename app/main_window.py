@@ -1,14 +1,27 @@
 # app/main_window.py
 
+import logging
+import os
+import time
+
 import numpy as np
-from PySide6 import QtCore, QtWidgets
+from PySide6 import QtCore, QtGui, QtWidgets
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 
 from pipeline.processor import Processor
+from pipeline.recording import RECORDING_SUFFIX, RRRecorder
+from app.blit import BlitManager, nice_step, sticky_limits
+from app.compute_worker import ComputeWorker
+from app.config import AppConfig
+from app.perf_hud import PerfHUD
+from core.debug import TRACER, StageTimings
+from core.scheduler import MultiRateScheduler
 from ble.ble_worker import BLEWorker
 from resp_guide.guide import RespGuideGenerator
 
+log = logging.getLogger("coherence")
+
 
 # ----------------------------------------------------------------------
 # Petit wrapper Matplotlib
@@ -23,39 +36,98 @@ class MplCanvas(FigureCanvasQTAgg):
 # FENÊTRE PRINCIPALE
 # ----------------------------------------------------------------------
 class MainWindow(QtWidgets.QMainWindow):
+    FRAME_MS = 33   # ≈ 30 FPS : le rendu par blit ne redessine que les courbes
+    GUIDE_FPS = 30.0
+    HUD_HZ = 2.0
+    HUD_COMPUTE_STAGES = ("compute", "spectral", "interpolation", "welch",
+                          "resp", "time_domain")
+
     def __init__(self):
         super().__init__()
 
         self.setWindowTitle("Cohérence Cardiaque – V3 Stable")
         self.resize(1280, 720)
 
-        # === HRV Processor ===
-        self.processor = Processor()
+        # === HRV Processor (thread de calcul dédié) ===
+        self.compute = ComputeWorker(Processor(window_s=AppConfig.RR_WINDOW_SECONDS,
+                                               hrv_window_s=AppConfig.HRV_WINDOW_SECONDS))
+        self.compute.state_ready.connect(self.on_state_ready)
+        self._state = None          # dernier ProcessorState reçu
+        self.last_frame_ms = 0.0
+        self._label_text = {}       # dernier texte affiché par label
+        self._drawn_power = None    # spectre actuellement tracé
 
         # === Respiration guidée ===
-        self.resp_guide = RespGuideGenerator()
+        self.resp_guide = RespGuideGenerator(AppConfig.INH, AppConfig.EXH,
+                                             shape=AppConfig.DEFAULT_STYLE)
+        self._guide_wave = None     # onde actuellement tracée
 
         # === BLE (simulation RR) ===
-        self.ble = BLEWorker()
-        self.ble.new_rr_signal.connect(self.on_new_rr)
+        self.ble = BLEWorker(AppConfig.BLE_BACKEND, AppConfig.BLE_ADDRESS)
+        self.ble.sink = self.compute        # RR → thread de calcul, sans boucle Qt
         self.ble.status_signal.connect(self.on_ble_status)
 
+        # === Enregistrement de la session (fsync groupés en arrière-plan) ===
+        self.recorder = None
+        if AppConfig.RECORD_DIR:
+            os.makedirs(AppConfig.RECORD_DIR, exist_ok=True)
+            name = time.strftime("session-%Y%m%d-%H%M%S") + RECORDING_SUFFIX
+            self.recorder = RRRecorder(os.path.join(AppConfig.RECORD_DIR, name))
+        self.ble.recorder = self.recorder
+
         # === UI ===
+        # durées de frame / de dessin par canvas (HUD de performance)
+        self.ui_timings = StageTimings()
         self.build_ui()
+        self.hud = PerfHUD(self.centralWidget())
+        QtGui.QShortcut(QtGui.QKeySequence("F3"), self, activated=self.hud.toggle)
+        QtGui.QShortcut(QtGui.QKeySequence("F4"), self, activated=self.toggle_trace)
+        if AppConfig.PERF_HUD:
+            self.hud.toggle()
+
+        # === Cadences UI ===
+        # guide animé à ~30 FPS ; graphes et labels seulement quand un
+        # nouvel état arrive ; au-delà du budget d'une image, les tâches
+        # restantes sont reportées au tick suivant
+        self.scheduler = MultiRateScheduler(budget_ms=self.FRAME_MS)
+        self.scheduler.add("guide", self.update_guide, rate_hz=self.GUIDE_FPS,
+                           priority=2, skippable=False)
+        self.scheduler.add("plots", self.render_plots, priority=1)
+        self.scheduler.add("labels", self.render_labels, priority=0)
+        self.scheduler.add("hud", self.update_hud, rate_hz=self.HUD_HZ, priority=-1)
 
         # === Timer UI ===
         self.timer = QtCore.QTimer()
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
         self.timer.timeout.connect(self.refresh_ui)
-        self.timer.start(250)  # 5 Hz
+        self.timer.start(self.FRAME_MS)
 
-        # === Lancer simulation BLE ===
+        # === Lancer calcul + simulation BLE ===
+        self.compute.start()
         self.ble.start()
 
+    def closeEvent(self, event):
+        self.ble.stop()
+        self.compute.stop()
+        self.compute.wait(1000)
+        if self.recorder is not None:
+            try:
+                self.recorder.close()
+            except Exception:
+                # erreur d'écriture de fond : la fenêtre se ferme quand même
+                log.exception("Fermeture de l'enregistrement RR")
+        super().closeEvent(event)
+
     # ------------------------------------------------------------------
-    # RÉCEPTION RR BLE
+    # RÉCEPTION RR BLE / ÉTATS CALCULÉS
     # ------------------------------------------------------------------
-    def on_new_rr(self, rr_value: int):
-        self.processor.push_rr(rr_value)
+    def on_state_ready(self):
+        """Nouvel état publié par le thread de calcul (le plus récent gagne)."""
+        state = self.compute.take_latest()
+        if state is not None:
+            self._state = state
+            self.scheduler.trigger("plots")
+            self.scheduler.trigger("labels")
 
     def on_ble_status(self, txt: str):
         self.label_ble.setText(f"BLE : {txt}")
@@ -84,6 +156,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ax_rr = self.can_rr.fig.add_subplot(111)
         self.ax_rr.grid(alpha=0.3)
         self.line_rr, = self.ax_rr.plot([], [], lw=1.6)
+        self.blit_rr = BlitManager(self.can_rr, [self.line_rr],
+                                   timings=self.ui_timings, name="draw_rr")
 
         box_rr_layout.addWidget(self.can_rr)
         left.addWidget(box_rr)
@@ -96,6 +170,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ax_spec = self.can_spec.fig.add_subplot(111)
         self.ax_spec.grid(alpha=0.3)
         self.line_spec, = self.ax_spec.plot([], [], lw=1.6)
+        self.ax_spec.set_xlim(0, 0.5)
+        self.blit_spec = BlitManager(self.can_spec, [self.line_spec],
+                                     timings=self.ui_timings, name="draw_spec")
 
         box_spec_layout.addWidget(self.can_spec)
         left.addWidget(box_spec)
@@ -110,9 +187,17 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Resp. guidée (vert)
         self.line_resp, = self.ax_resp.plot([], [], lw=1.8, color="green")
-
-        # Resp estimée (orange)
-        self.line_resp_est, = self.ax_resp.plot([], [], lw=1.5, color="orange")
+        self.dot_resp, = self.ax_resp.plot([], [], "o", color="red", markersize=8)
+
+        # Resp estimée (orange) : axe X propre (battements), Y partagé,
+        # pour ne pas se disputer les limites avec la courbe guidée
+        self.ax_resp_est = self.ax_resp.twiny()
+        self.ax_resp_est.xaxis.set_visible(False)
+        self.line_resp_est, = self.ax_resp_est.plot([], [], lw=1.5, color="orange")
+        self.ax_resp.set_ylim(-1.1, 1.1)
+        self.blit_resp = BlitManager(self.can_resp, [self.line_resp, self.line_resp_est,
+                                                      self.dot_resp],
+                                     timings=self.ui_timings, name="draw_resp")
 
         box_resp_layout.addWidget(self.can_resp)
         left.addWidget(box_resp)
@@ -142,12 +227,15 @@ class MainWindow(QtWidgets.QMainWindow):
         lbl_i = QtWidgets.QLabel("Inspiration (s)")
         self.sl_insp = QtWidgets.QSlider(QtCore.Qt.Horizontal)
         self.sl_insp.setRange(3, 8)
-        self.sl_insp.setValue(4)
+        self.sl_insp.setValue(int(AppConfig.INH))
 
         lbl_e = QtWidgets.QLabel("Expiration (s)")
         self.sl_exp = QtWidgets.QSlider(QtCore.Qt.Horizontal)
         self.sl_exp.setRange(3, 12)
-        self.sl_exp.setValue(6)
+        self.sl_exp.setValue(int(AppConfig.EXH))
+
+        self.sl_insp.valueChanged.connect(self.on_durations_changed)
+        self.sl_exp.valueChanged.connect(self.on_durations_changed)
 
         sliders_layout.addWidget(lbl_i)
         sliders_layout.addWidget(self.sl_insp)
@@ -186,80 +274,113 @@ class MainWindow(QtWidgets.QMainWindow):
         self.line_resp.set_data(t, y)
 
         if len(t) > 1:
-            # Fixe X de 0 → durée totale
-            self.ax_resp.set_xlim(0, t[-1])
-
-            # Fixe Y pour garder un affichage stable
-            self.ax_resp.set_ylim(-1.1, 1.1)
-
-        self.can_resp.draw()
+            # Fixe X de 0 → durée totale (ne change qu'avec les sliders)
+            # Y fixe pour garder un affichage stable
+            self.blit_resp.set_limits(self.ax_resp, xlim=(0, t[-1]), ylim=(-1.1, 1.1))
 
     # ------------------------------------------------------------------
-    # Rafraîchissement UI
+    # Rafraîchissement UI (ordonnancé)
     # ------------------------------------------------------------------
     def refresh_ui(self):
-        # ------------------------------------------------------------
-        # 1) Avance la respiration guidée (phase interne)
-        # ------------------------------------------------------------
-        self.resp_guide.step()
-
-        # ------------------------------------------------------------
-        # 2) Lire les sliders et mettre à jour les durées
-        # ------------------------------------------------------------
-        insp = self.sl_insp.value()
-        exp = self.sl_exp.value()
-        self.resp_guide.set_durations(insp, exp)
-
-        # ------------------------------------------------------------
-        # 3) Générer l’onde respiration guidée (premium cohérence 365)
-        # ------------------------------------------------------------
+        with self.ui_timings.stage("frame"):
+            self.scheduler.tick()
+        self.last_frame_ms = self.ui_timings.histogram("frame").last_ms
+
+    def toggle_trace(self):
+        """F4 : démarre la trace, ou l'arrête et l'écrit dans AppConfig.TRACE_DIR."""
+        if not TRACER.enabled:
+            TRACER.clear()
+            TRACER.enable()
+            self.on_ble_status("Trace en cours (F4 pour arrêter)")
+            return
+        TRACER.disable()
+        os.makedirs(AppConfig.TRACE_DIR, exist_ok=True)
+        path = os.path.join(AppConfig.TRACE_DIR, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        n = TRACER.dump(path)
+        self.on_ble_status(f"Trace : {n} événements → {path}")
+
+    def update_hud(self):
+        """~2 Hz, seulement si visible : histogrammes calcul + interface."""
+        if not self.hud.isVisible():
+            return
+        processor = self.compute.processor
+        compute = {k: v for k, v in processor.stats().items() if k in self.HUD_COMPUTE_STAGES}
+        self.hud.set_sections([("calcul", compute), ("interface", self.ui_timings.stats())],
+                              budget_ms=self.FRAME_MS)
+
+    def on_durations_changed(self, _value=None):
+        self.resp_guide.set_durations(self.sl_insp.value(), self.sl_exp.value())
+
+    def update_guide(self):
+        """~30 FPS : point de phase lu dans la table du guide (horloge monotone)."""
+        value = self.resp_guide.tick()
+
+        # onde respiration guidée : mêmes tableaux tant que le motif
+        # ne change pas, on ne la repasse à Matplotlib qu'à ce moment-là
         t, y = self.resp_guide.generate_waveform()
-        self.update_resp_guided_plot(t, y)
+        if t is not self._guide_wave:
+            self._guide_wave = t
+            self.update_resp_guided_plot(t, y)
 
-        # ------------------------------------------------------------
-        # 4) Calcul HRV complet (RR + spectre + score + EDR)
-        # ------------------------------------------------------------
-        state = self.processor.compute_state()
+        # blit du canvas respiration (courbe estimée comprise)
+        self.dot_resp.set_data([self.resp_guide.phase], [value])
+        self.blit_resp.update()
+
+    # ------------------------------------------------------------------
+    # Rendu d'un ProcessorState (thread GUI uniquement)
+    # ------------------------------------------------------------------
+    def render_plots(self):
+        state = self._state
+        if state is None:
+            return
 
         # ------------------------------------------------------------
-        # 5) Mise à jour du graphe RR
+        # 1) Mise à jour du graphe RR (à chaque battement)
         # ------------------------------------------------------------
         if len(state.rr_list) > 2:
             x = np.arange(len(state.rr_list))
             self.line_rr.set_data(x, state.rr_list)
 
-            self.ax_rr.set_xlim(0, len(state.rr_list))
-            self.ax_rr.set_ylim(min(state.rr_list) - 50,
-                                max(state.rr_list) + 50)
-            self.can_rr.draw()
+            ylim = sticky_limits(self.ax_rr.get_ylim(),
+                                 float(state.rr_list.min()) - 50,
+                                 float(state.rr_list.max()) + 50, step=50.0)
+            self.blit_rr.set_limits(self.ax_rr, xlim=(0, len(state.rr_list)), ylim=ylim)
+            self.blit_rr.update()
 
         # ------------------------------------------------------------
-        # 6) Mise à jour spectre (power vs freq)
+        # 2) Mise à jour spectre (power vs freq) : l'étage spectral est
+        #    mémoïsé, même objet tant qu'il n'a pas été recalculé (~1 Hz)
         # ------------------------------------------------------------
-        if len(state.freq) > 2:
+        if len(state.freq) > 2 and state.power is not self._drawn_power:
+            self._drawn_power = state.power
             self.line_spec.set_data(state.freq, state.power)
 
-            self.ax_spec.set_xlim(0, 0.5)
-            self.ax_spec.set_ylim(0, max(state.power) * 1.1)
-            self.can_spec.draw()
+            top = float(np.max(state.power)) * 1.1
+            ylim = sticky_limits(self.ax_spec.get_ylim(), 0.0, top, step=nice_step(top))
+            self.blit_spec.set_limits(self.ax_spec, ylim=ylim)
+            self.blit_spec.update()
 
         # ------------------------------------------------------------
-        # 7) Mise à jour respiration estimée (EDR / RSA)
+        # 3) Mise à jour respiration estimée (EDR / RSA)
+        #    (signal déjà normalisé dans [-1, 1] ; blit avec le guide)
         # ------------------------------------------------------------
         if state.resp_signal is not None and len(state.resp_signal) > 2:
             self.line_resp_est.set_data(state.resp_time, state.resp_signal)
-
-            self.ax_resp.set_xlim(0, max(state.resp_time))
-            self.ax_resp.set_ylim(min(state.resp_signal),
-                                  max(state.resp_signal))
-            self.can_resp.draw()
-
-        # ------------------------------------------------------------
-        # 8) Mise à jour des labels HRV
-        # ------------------------------------------------------------
-        self.lbl_rmssd.setText(f"{state.rmssd:.1f}")
-        self.lbl_lf.setText(f"{state.lf:.3f}")
-        self.lbl_hf.setText(f"{state.hf:.3f}")
-        self.lbl_ratio.setText(f"{state.lf_hf_ratio:.3f}")
-        self.lbl_resp.setText(f"{state.resp_freq:.3f}")
-        self.lbl_score.setText(f"{state.score:.1f}")
+            self.blit_resp.set_limits(self.ax_resp_est, xlim=(0, float(state.resp_time[-1])))
+
+    def render_labels(self):
+        """Labels HRV : setText seulement si le texte affiché change."""
+        state = self._state
+        if state is None:
+            return
+        self._set_label(self.lbl_rmssd, f"{state.rmssd:.1f}")
+        self._set_label(self.lbl_lf, f"{state.lf:.3f}")
+        self._set_label(self.lbl_hf, f"{state.hf:.3f}")
+        self._set_label(self.lbl_ratio, f"{state.lf_hf_ratio:.3f}")
+        self._set_label(self.lbl_resp, f"{state.resp_freq:.3f}")
+        self._set_label(self.lbl_score, f"{state.score:.1f}")
+
+    def _set_label(self, label, text):
+        if self._label_text.get(label) != text:
+            self._label_text[label] = text
+            label.setText(text)
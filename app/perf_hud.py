@@ -0,0 +1,75 @@
+# app/perf_hud.py
+"""
+perf_hud.py
+-----------
+Surimpression de performance pour MainWindow (touche F3, ou
+AppConfig.PERF_HUD = True au démarrage).
+
+Affiche p50 / p95 / max des histogrammes core.debug.StageTimings :
+    - calcul : étages du Processor / EDR (thread de calcul)
+    - interface : temps de frame et temps de dessin par canvas
+Une ligne dont le p95 dépasse le budget d'une frame est marquée « ! ».
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PySide6 import QtCore, QtWidgets
+
+Section = Tuple[str, Dict[str, Dict[str, float]]]
+
+
+def format_sections(sections: Iterable[Section], budget_ms: Optional[float] = None,
+                    only: Optional[Iterable[str]] = None) -> str:
+    """Texte du HUD : un bloc par section, une ligne par étage mesuré."""
+    keep = set(only) if only is not None else None
+    lines: List[str] = [f"{'':<14}{'p50':>8}{'p95':>8}{'max':>8}  ms"]
+    for title, stats in sections:
+        lines.append(title)
+        for name, s in stats.items():
+            if not s["count"] or (keep is not None and name not in keep):
+                continue
+            over = budget_ms is not None and s["p95_ms"] > budget_ms
+            lines.append(f"{'!' if over else ' '} {name:<12}{s['p50_ms']:>8.2f}"
+                         f"{s['p95_ms']:>8.2f}{s['max_ms']:>8.1f}")
+    return "\n".join(lines)
+
+
+class PerfHUD(QtWidgets.QLabel):
+    """Panneau semi-transparent ancré en haut à droite de son parent."""
+
+    MARGIN = 8
+
+    def __init__(self, parent: QtWidgets.QWidget):
+        super().__init__(parent)
+        self.setObjectName("perfHud")
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(QtCore.Qt.PlainText)
+        self.setStyleSheet(
+            "QLabel#perfHud { background: rgba(20, 20, 20, 190); color: #e8e8e8;"
+            " font-family: monospace; font-size: 11px; padding: 6px; border-radius: 6px; }"
+        )
+        parent.installEventFilter(self)
+        self.hide()
+
+    def set_sections(self, sections: Iterable[Section], budget_ms: Optional[float] = None,
+                     only: Optional[Iterable[str]] = None) -> None:
+        text = format_sections(sections, budget_ms, only)
+        if text != self.text():
+            self.setText(text)
+            self.adjustSize()
+            self._reposition()
+
+    def toggle(self) -> None:
+        self.setVisible(not self.isVisible())
+        if self.isVisible():
+            self._reposition()
+            self.raise_()
+
+    def _reposition(self) -> None:
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - self.MARGIN, self.MARGIN)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Resize and self.isVisible():
+            self._reposition()
+        return False
@@ -2,13 +2,35 @@
 Module BLE – initialisation
 
 Expose uniquement les classes et constantes nécessaires pour le reste du programme.
+
+- ble_worker.py    : BLEWorker (QObject, simulation ou capteur réel)
+- bleak_backend.py : notifications 0x2A37 via bleak / asyncio, par lots
+- hr_parser.py     : décodage Heart Rate Measurement (struct + NumPy)
+
+BLEWorker (PySide6) n'est importé qu'à la demande : parser et backend
+bleak restent utilisables sans Qt (runtime headless).
 """
 
-from .ble_worker import BLEWorker
 from .polar_constants import POLAR_H10_UUID, POLAR_H10_NAME
+from .hr_parser import HRMeasurement, RRBatch, parse_hr_measurement, parse_packets
 
 __all__ = [
     "BLEWorker",
+    "BleakHRBackend",
+    "HRMeasurement",
+    "RRBatch",
+    "parse_hr_measurement",
+    "parse_packets",
     "POLAR_H10_UUID",
     "POLAR_H10_NAME",
 ]
+
+
+def __getattr__(name):
+    if name == "BLEWorker":
+        from .ble_worker import BLEWorker
+        return BLEWorker
+    if name == "BleakHRBackend":
+        from .bleak_backend import BleakHRBackend
+        return BleakHRBackend
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,34 +1,83 @@
 # ble/ble_worker.py
 
+import logging
 import random
+import time
+
 from PySide6 import QtCore
 
+from core.debug import TRACER
+
+log = logging.getLogger("coherence")
+
 
 class BLEWorker(QtCore.QObject):
     """
-    Simulation BLE :
-      - génère des RR aléatoires autour de 800 ms
+    backend="sim" (défaut) — simulation BLE :
+      - génère des RR aléatoires autour de 800 ms (new_rr_signal)
       - émet un signal de statut pour l'UI
+
+    backend="bleak" — capteur réel (ble.bleak_backend) :
+      - notifications 0x2A37 décodées par lots dans un thread asyncio
+      - rr_batch_signal(beat_times, rr_ms) par lot, livré dans le thread
+        GUI : instant estimé de chaque battement (s) et RR flottants (ms)
+
+    Depuis le thread qui reçoit les RR (asyncio pour bleak, GUI pour la
+    simulation), avec l'instant de chaque battement et le RR flottant :
+      - sink : consommateur optionnel (ex. app.compute_worker.ComputeWorker,
+        push_rr(rr, t) / push_batch(t, rr_ms)), appelé directement,
+        sans passer par la boucle Qt ;
+      - recorder : pipeline.recording.RRRecorder optionnel.
     """
 
     new_rr_signal = QtCore.Signal(int)
+    rr_batch_signal = QtCore.Signal(object, object)
     status_signal = QtCore.Signal(str)
 
-    def __init__(self):
+    def __init__(self, backend="sim", address=None):
         super().__init__()
+        self.backend = backend
+        self.sink = None
+        self.recorder = None
         self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self.generate_rr)
 
+        self._bleak = None
+        if backend == "bleak":
+            from .bleak_backend import BleakHRBackend
+            self._bleak = BleakHRBackend(address=address)
+        elif backend != "sim":
+            raise ValueError(f"backend BLE inconnu : {backend!r}")
+
     def start(self):
-        """Démarre la simulation."""
+        """Démarre la simulation (ou la connexion au capteur)."""
+        if self._bleak is not None:
+            self._bleak.start_in_thread(self._deliver_batch, on_status=self.status_signal.emit)
+            return
         self.status_signal.emit("Simulation active")
         self.timer.start(600)   # ~100 bpm simulés
 
     def stop(self):
         """Arrête la simulation."""
+        if self._bleak is not None:
+            self._bleak.stop()
+            self._bleak.join(2.0)
+            return
         self.status_signal.emit("Arrêt")
         self.timer.stop()
 
+    def _deliver_batch(self, batch):
+        """Thread asyncio : sink (anneau sans lock), enregistrement, puis signal Qt."""
+        t = batch.beat_times()
+        # args construits seulement si la trace est active (chemin chaud)
+        args = {"rr": len(batch)} if TRACER.enabled else None
+        with TRACER.span("ble_deliver", args):
+            if self.sink is not None:
+                self.sink.push_batch(t, batch.rr_ms)
+            if self.recorder is not None:
+                self._record(t, batch.rr_ms)
+        self.rr_batch_signal.emit(t, batch.rr_ms)
+
     def generate_rr(self):
         """
         Génère un RR réaliste :
@@ -37,4 +86,20 @@ class BLEWorker(QtCore.QObject):
         base_rr = 800
         noise = random.randint(-60, 60)
         rr = max(500, base_rr + noise)
+        if TRACER.enabled:
+            TRACER.instant("ble_rr", {"rr": rr})
+        now = time.time()
+        if self.sink is not None:
+            self.sink.push_rr(rr, now)
+        if self.recorder is not None:
+            self._record([now], [rr])
         self.new_rr_signal.emit(rr)
+
+    def _record(self, t, rr_ms):
+        """Enregistrement (thread-safe) ; une erreur d'écriture l'arrête sans couper le flux RR."""
+        try:
+            self.recorder.append_many(t, rr_ms)
+        except Exception:
+            log.exception("Enregistrement RR interrompu")
+            self.recorder = None
+            self.status_signal.emit("⚠️ Enregistrement interrompu (voir le journal)")
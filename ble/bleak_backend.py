@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+ble/bleak_backend.py
+--------------------
+Backend BLE réel (bleak, asyncio) : notifications 0x2A37 → lots de RR.
+
+- le callback de notification ne fait que stocker (instant, octets) ;
+- toutes les `batch_interval_s`, les paquets en attente sont décodés
+  d'un coup (hr_parser.parse_packets) et livrés en RRBatch ;
+- batches() est un itérateur asynchrone utilisable dans une boucle
+  existante (runtime headless) ; start_in_thread() fait tourner la même
+  boucle dans un thread de fond (BLEWorker / interface Qt).
+
+bleak n'est importé qu'à la connexion ; client_factory permet de
+fournir un autre client (ex. client factice qui rejoue des captures).
+
+Erreurs : PolarNotFoundError, BLEScanError, BLEConnectionError,
+BLENotificationError (ble.exceptions) ; les paquets illisibles sont comptés (bad_packets).
+"""
+
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from core.debug import TRACER
+
+from .exceptions import (
+    BLEConnectionError,
+    BLEError,
+    BLENotificationError,
+    BLEScanError,
+    PolarNotFoundError,
+)
+from .hr_parser import RRBatch, parse_packets
+from .polar_constants import POLAR_H10_NAME, POLAR_H10_UUID
+
+
+def _bleak_client(address):
+    from bleak import BleakClient
+    return BleakClient(address)
+
+
+async def _bleak_find(name: str, timeout: float):
+    from bleak import BleakScanner
+    return await BleakScanner.find_device_by_name(name, timeout=timeout)
+
+
+class BleakHRBackend:
+    """Abonnement 0x2A37 sur un capteur cardiaque, livraison par lots."""
+
+    def __init__(self, address: Optional[str] = None, name: str = POLAR_H10_NAME,
+                 batch_interval_s: float = 0.25, scan_timeout_s: float = 10.0,
+                 client_factory: Callable = _bleak_client,
+                 clock: Callable[[], float] = time.time):
+        self.address = address
+        self.name = name
+        self.batch_interval_s = float(batch_interval_s)
+        self.scan_timeout_s = float(scan_timeout_s)
+        self.client_factory = client_factory
+        self.clock = clock
+
+        self._pending: List[Tuple[float, bytes]] = []
+        self._stopping = False
+        self._stop: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.packets = 0
+        self.bad_packets = 0
+        self.rr_count = 0
+        self.last_hr = 0
+
+    # ------------------------------------------------------------------
+    # Notifications
+    # ------------------------------------------------------------------
+    def _on_notify(self, _sender, data) -> None:
+        # appelé dans la boucle asyncio : le strict minimum
+        self._pending.append((self.clock(), bytes(data)))
+
+    def _drain(self) -> Optional[RRBatch]:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return None
+        t, packets = zip(*pending)
+        args = {"packets": len(packets)} if TRACER.enabled else None
+        with TRACER.span("ble_batch", args):
+            batch, bad = parse_packets(packets, t)
+        self.packets += len(packets)
+        self.bad_packets += bad
+        self.rr_count += len(batch)
+        if batch.hr:
+            self.last_hr = batch.hr
+        return batch
+
+    # ------------------------------------------------------------------
+    # Connexion
+    # ------------------------------------------------------------------
+    async def _connect(self):
+        address = self.address
+        if address is None:
+            try:
+                device = await _bleak_find(self.name, self.scan_timeout_s)
+            except Exception as e:
+                raise BLEScanError() from e
+            if device is None:
+                raise PolarNotFoundError()
+            address = device
+
+        client = self.client_factory(address)
+        try:
+            await client.connect()
+        except Exception as e:
+            raise BLEConnectionError(f"❌ Connexion BLE impossible : {e}") from e
+
+        try:
+            await client.start_notify(POLAR_H10_UUID, self._on_notify)
+        except Exception as e:
+            await self._disconnect(client)
+            raise BLENotificationError() from e
+        return client
+
+    @staticmethod
+    async def _disconnect(client) -> None:
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # API asyncio
+    # ------------------------------------------------------------------
+    async def batches(self, on_connected: Optional[Callable[[], None]] = None
+                      ) -> AsyncIterator[RRBatch]:
+        """Connecte, puis livre un RRBatch par intervalle non vide jusqu'à stop()."""
+        self._stop = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        client = await self._connect()
+        if on_connected is not None:
+            on_connected()
+        try:
+            while not self._stopping:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), self.batch_interval_s)
+                except asyncio.TimeoutError:
+                    pass
+                batch = self._drain()
+                if batch is not None and len(batch):
+                    yield batch
+                if not getattr(client, "is_connected", True):
+                    raise BLEConnectionError("❌ Capteur déconnecté.")
+        finally:
+            try:
+                await client.stop_notify(POLAR_H10_UUID)
+            except Exception:
+                pass
+            await self._disconnect(client)
+
+    def stop(self) -> None:
+        """Demande l'arrêt (depuis n'importe quel thread)."""
+        self._stopping = True
+        loop, ev = self._loop, self._stop
+        if loop is not None and ev is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(ev.set)
+
+    # ------------------------------------------------------------------
+    # Thread de fond
+    # ------------------------------------------------------------------
+    def start_in_thread(self, on_batch: Callable[[RRBatch], None],
+                        on_status: Optional[Callable[[str], None]] = None,
+                        on_error: Optional[Callable[[BLEError], None]] = None) -> threading.Thread:
+        """
+        Lance batches() dans une boucle asyncio dédiée. Les callbacks sont
+        appelés depuis ce thread (côté Qt : passer par un signal). Sans
+        on_error, l'erreur est passée à on_status. Toute autre exception
+        (bleak absent, erreur OS…) est remontée comme BLEConnectionError :
+        le thread ne meurt jamais en silence.
+        """
+        on_status = on_status or (lambda _msg: None)
+        report = on_error or (lambda err: on_status(str(err)))
+
+        async def pump():
+            on_status("Connexion…")
+            async for batch in self.batches(lambda: on_status(f"Connecté ({self.name})")):
+                on_batch(batch)
+
+        def run():
+            try:
+                asyncio.run(pump())
+                on_status("Arrêt")
+            except BLEError as e:
+                report(e)
+            except Exception as e:
+                err = BLEConnectionError(f"❌ Erreur BLE : {type(e).__name__}: {e}")
+                err.__cause__ = e
+                report(err)
+
+        self._stopping = False
+        self._thread = threading.Thread(target=run, name="ble-bleak", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
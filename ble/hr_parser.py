@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+ble/hr_parser.py
+----------------
+Décodage de la caractéristique Heart Rate Measurement (0x2A37).
+
+Format (Bluetooth SIG, little-endian) :
+    octet 0        : flags
+        bit 0      : FC sur uint16 (sinon uint8)
+        bit 1      : contact capteur détecté
+        bit 2      : détection de contact supportée
+        bit 3      : énergie dépensée présente (uint16, kJ)
+        bit 4      : intervalles RR présents
+    FC             : uint8 ou uint16
+    [énergie]      : uint16
+    [RR ...]       : uint16 chacun, unité 1/1024 s
+
+parse_hr_measurement() décode un paquet (struct pour l'en-tête,
+np.frombuffer pour les RR). parse_packets() décode un lot entier :
+en-têtes au struct, puis tous les champs RR du lot en un seul
+np.frombuffer sur les octets concaténés.
+"""
+
+import struct
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .exceptions import BLEDataError
+
+FLAG_HR_UINT16 = 0x01
+FLAG_CONTACT_DETECTED = 0x02
+FLAG_CONTACT_SUPPORTED = 0x04
+FLAG_ENERGY = 0x08
+FLAG_RR = 0x10
+
+RR_UNIT_MS = 1000.0 / 1024.0
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+
+
+class HRMeasurement(NamedTuple):
+    hr: int
+    rr_ms: np.ndarray                 # float64, ms
+    contact: Optional[bool]           # None si non supporté
+    energy_kj: Optional[int]
+
+
+class RRBatch(NamedTuple):
+    """RR d'un lot de notifications, dans l'ordre d'arrivée."""
+    t_arrival: np.ndarray   # s, instant de réception du paquet de chaque RR
+    rr_ms: np.ndarray       # ms
+    offset_ms: np.ndarray   # ms, somme des RR suivants du même paquet
+    hr: int                 # dernière FC reçue (bpm), 0 si aucune
+
+    def beat_times(self) -> np.ndarray:
+        """Instant estimé de chaque battement : le dernier RR d'un paquet
+        se termine à la réception, les précédents le précèdent."""
+        return self.t_arrival - self.offset_ms / 1000.0
+
+    def __len__(self) -> int:
+        return int(self.rr_ms.size)
+
+
+def _header(data) -> Tuple[int, int, Optional[bool], Optional[int], int]:
+    """(flags, hr, contact, energy, offset des RR)."""
+    n = len(data)
+    if n < 2:
+        raise BLEDataError(f"⚠️ Paquet 0x2A37 trop court ({n} octet(s)).")
+    flags = data[0]
+    off = 1
+    if flags & FLAG_HR_UINT16:
+        if n < 3:
+            raise BLEDataError("⚠️ Paquet 0x2A37 tronqué (FC uint16).")
+        hr = _U16.unpack_from(data, off)[0]
+        off += 2
+    else:
+        hr = _U8.unpack_from(data, off)[0]
+        off += 1
+
+    energy = None
+    if flags & FLAG_ENERGY:
+        if n < off + 2:
+            raise BLEDataError("⚠️ Paquet 0x2A37 tronqué (énergie).")
+        energy = _U16.unpack_from(data, off)[0]
+        off += 2
+
+    contact = bool(flags & FLAG_CONTACT_DETECTED) if flags & FLAG_CONTACT_SUPPORTED else None
+
+    if not flags & FLAG_RR:
+        off = n                         # pas de RR : rien à lire au-delà
+    elif (n - off) % 2:
+        raise BLEDataError("⚠️ Paquet 0x2A37 : champ RR incomplet.")
+    return flags, hr, contact, energy, off
+
+
+def parse_hr_measurement(data) -> HRMeasurement:
+    """Décode un paquet 0x2A37 (bytes / bytearray / memoryview)."""
+    _, hr, contact, energy, off = _header(data)
+    raw = np.frombuffer(data, dtype="<u2", offset=off) if off < len(data) else np.empty(0, "<u2")
+    return HRMeasurement(hr, raw * RR_UNIT_MS, contact, energy)
+
+
+def parse_packets(packets: Sequence[bytes], t_arrival: Sequence[float],
+                  strict: bool = False) -> Tuple[RRBatch, int]:
+    """
+    Décode un lot de paquets reçus aux instants t_arrival.
+
+    Renvoie (RRBatch, nb de paquets invalides). strict=True lève
+    BLEDataError au premier paquet invalide au lieu de l'ignorer.
+    """
+    chunks = []
+    counts = []
+    t_ok = []
+    hr = 0
+    bad = 0
+    for data, t in zip(packets, t_arrival):
+        try:
+            _, hr_i, _, _, off = _header(data)
+        except BLEDataError:
+            if strict:
+                raise
+            bad += 1
+            continue
+        hr = hr_i
+        k = (len(data) - off) // 2
+        if k:
+            chunks.append(data[off:])
+            counts.append(k)
+            t_ok.append(t)
+
+    if not counts:
+        empty = np.empty(0)
+        return RRBatch(empty, empty, empty, hr), bad
+
+    rr = np.frombuffer(b"".join(chunks), dtype="<u2") * RR_UNIT_MS
+    counts = np.asarray(counts)
+    t_rr = np.repeat(np.asarray(t_ok, dtype=float), counts)
+
+    # somme des RR suivants dans le même paquet (cumul inverse par paquet)
+    ends = np.cumsum(counts)
+    csum = np.cumsum(rr)
+    offset = csum[ends - 1].repeat(counts) - csum
+
+    return RRBatch(t_rr, rr, offset, hr), bad
+
+
+def encode_hr_measurement(hr: int, rr_ms: Sequence[float] = (), contact: Optional[bool] = True,
+                          energy_kj: Optional[int] = None) -> bytes:
+    """Construit un paquet 0x2A37 (tests, simulation, rejeu)."""
+    flags = 0
+    body = b""
+    if hr > 0xFF:
+        flags |= FLAG_HR_UINT16
+        body += _U16.pack(hr)
+    else:
+        body += _U8.pack(hr)
+    if contact is not None:
+        flags |= FLAG_CONTACT_SUPPORTED | (FLAG_CONTACT_DETECTED if contact else 0)
+    if energy_kj is not None:
+        flags |= FLAG_ENERGY
+        body += _U16.pack(energy_kj)
+    if len(rr_ms):
+        flags |= FLAG_RR
+        raw = np.rint(np.asarray(rr_ms, dtype=float) / RR_UNIT_MS).astype("<u2")
+        body += raw.tobytes()
+    return _U8.pack(flags) + body
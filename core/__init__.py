@@ -6,7 +6,11 @@ Utilitaires transverses utilisés par toute l'application :
 - time_utils      : horloges, conversions ms/s, helpers temporels
 - math_utils      : clamp, safe_float, moyenne glissante, etc.
 - smoothing       : EMA, lissage, anti-sauts, rate limiter
-- debug           : logger prêt à l'emploi, décorateurs d'aide au debug
+- debug           : logger (synchrone ou par file non bloquante), décorateurs
+                    d'aide au debug, histogrammes de durées par étage
+                    (StageTimings), trace Chrome (Tracer)
+- registry        : backends optionnels résolus par nom à la première utilisation
+- scheduler       : ordonnanceur multi-cadence (priorités, images sautées)
 """
 from .math_utils import clamp, safe_float
 
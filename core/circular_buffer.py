@@ -3,12 +3,19 @@ circular_buffer.py
 ------------------
 Buffers circulaires génériques, thread-safe, pour stocker des séries
 temps réel (ex. RR, LF/HF, score…).
+
+- CircularBuffer   : deque d'objets quelconques protégée par un lock
+- TimeSeriesBuffer : variante (ts, value)
+- ArrayRingBuffer  : anneau NumPy float64 préalloué, vue contiguë sans copie
+- SPSCRingBuffer   : anneau NumPy (ts, value) un écrivain / un lecteur, sans lock
 """
 
 from collections import deque
 from threading import Lock
 from typing import Deque, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
+import numpy as np
+
 T = TypeVar("T")
 
 
@@ -37,8 +44,7 @@ class CircularBuffer(Generic[T]):
             return list(self._buf)
 
     def __len__(self) -> int:
-        with self._lock:
-            return len(self._buf)
+        return len(self._buf)     # len(deque) est atomique sous le GIL
 
     def __iter__(self) -> Iterator[T]:
         # itère sur un snapshot pour éviter de garder le lock
@@ -55,10 +61,223 @@ class TimeSeriesBuffer(CircularBuffer[Tuple[float, float]]):
         super().append((ts, float(value)))
 
     def window_since(self, t_min: float) -> List[Tuple[float, float]]:
-        """Sous-série avec ts >= t_min."""
-        data = self.snapshot()
-        return [(t, v) for (t, v) in data if t >= t_min]
+        """
+        Sous-série avec ts >= t_min (ts croissants). Parcours depuis la
+        fin, en O(taille du résultat) : une dichotomie sur une deque ne
+        serait pas en O(log n), chaque accès indexé la parcourant.
+        Pour des requêtes par plage sur de longues séries : SPSCRingBuffer.since().
+        """
+        out = []
+        with self._lock:
+            for point in reversed(self._buf):
+                if point[0] < t_min:
+                    break
+                out.append(point)
+        out.reverse()
+        return out
+
+    def last(self) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            return self._buf[-1] if self._buf else None
+
+
+class ArrayRingBuffer:
+    """
+    Anneau NumPy de capacité fixe (float64), sans allocation par ajout.
+
+    Le stockage fait 2 × capacité : chaque valeur est écrite à l'indice i
+    et à son miroir i + capacité. La fenêtre courante est donc toujours
+    une tranche contiguë du tableau, exposée en lecture seule par view().
+
+    Attention : la vue partage la mémoire de l'anneau. Elle reste valide
+    jusqu'au prochain append() ; copier si on doit la conserver.
+    Non thread-safe (un seul écrivain, lecture dans le même thread).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity doit être >= 1")
+        self.capacity = int(capacity)
+        self._data = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._start = 0   # indice (dans [0, capacité)) de la plus ancienne valeur
+        self._size = 0
+
+    def append(self, value: float) -> Optional[float]:
+        """
+        Ajoute une valeur. Retourne la valeur évincée si l'anneau était
+        plein, sinon None.
+        """
+        cap = self.capacity
+        evicted = None
+        if self._size < cap:
+            i = (self._start + self._size) % cap
+            self._size += 1
+        else:
+            i = self._start
+            evicted = float(self._data[i])
+            self._start = (self._start + 1) % cap
+        self._data[i] = value
+        self._data[i + cap] = value
+        return evicted
+
+    def extend(self, values: Iterable[float]) -> None:
+        for v in values:
+            self.append(v)
+
+    def drop_oldest(self, n: int = 1) -> None:
+        """Retire les n plus anciennes valeurs."""
+        n = max(0, min(int(n), self._size))
+        self._start = (self._start + n) % self.capacity
+        self._size -= n
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def view(self) -> np.ndarray:
+        """Fenêtre courante (plus ancienne → plus récente), contiguë, lecture seule."""
+        v = self._data[self._start:self._start + self._size]
+        v.flags.writeable = False
+        return v
+
+    def last(self) -> Optional[float]:
+        if self._size == 0:
+            return None
+        return float(self._data[self._start + self._size - 1])
+
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class SPSCRingBuffer:
+    """
+    Anneau (ts, value) à colonnes NumPy typées, un seul écrivain et un
+    seul lecteur, sans lock (ex. thread BLE → thread GUI / calcul).
+
+    Même stockage miroir que ArrayRingBuffer (2 × capacité) : les n
+    derniers points sont toujours une tranche contiguë de chaque colonne.
+    L'écrivain remplit les deux copies du slot puis publie en avançant
+    `written`, compteur monotone d'ajouts (une seule affectation
+    d'entier, atomique sous le GIL) ; le lecteur ne lit `written` qu'une
+    fois par appel et ne voit donc jamais un point à moitié écrit.
+
+    Les vues renvoyées par latest() / since() partagent la mémoire de
+    l'anneau : elles restent exactes tant que l'écrivain n'a pas ajouté
+    plus de (capacité - n) points. Prévoir de la marge dans la capacité,
+    ou passer copy=True (copie vérifiée, recommencée si l'écrivain a
+    fait le tour pendant la copie).
+
+    Les ts doivent être croissants (since() fait une recherche
+    dichotomique).
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64, ts_dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("capacity doit être >= 1")
+        self.capacity = int(capacity)
+        self._ts = np.zeros(2 * self.capacity, dtype=ts_dtype)
+        self._values = np.zeros(2 * self.capacity, dtype=dtype)
+        self.written = 0    # nombre total d'ajouts (seul l'écrivain le modifie)
+        self._base = 0      # `written` au dernier clear()
+
+    # --------------------------------------------------------------
+    # Écrivain
+    # --------------------------------------------------------------
+    def append(self, ts: float, value: float) -> None:
+        cap = self.capacity
+        i = self.written % cap
+        self._ts[i] = self._ts[i + cap] = ts
+        self._values[i] = self._values[i + cap] = value
+        self.written += 1       # publication, après l'écriture des données
+
+    def extend(self, ts, values) -> None:
+        """Ajoute un lot (ex. RRBatch) ; seuls les `capacité` derniers comptent."""
+        ts = np.asarray(ts, dtype=self._ts.dtype)
+        values = np.asarray(values, dtype=self._values.dtype)
+        if ts.shape != values.shape:
+            raise ValueError("ts et values doivent avoir la même taille")
+        m = ts.size
+        if m == 0:
+            return
+        cap = self.capacity
+        skip = max(0, m - cap)
+        idx = (self.written + skip + np.arange(m - skip)) % cap
+        for col, src in ((self._ts, ts[skip:]), (self._values, values[skip:])):
+            col[idx] = src
+            col[idx + cap] = src
+        self.written += m
+
+    def clear(self) -> None:
+        """Réservé à l'écrivain : les points déjà écrits sont ignorés."""
+        self._base = self.written
+
+    # --------------------------------------------------------------
+    # Lecteur
+    # --------------------------------------------------------------
+    def __len__(self) -> int:
+        return min(self.written - self._base, self.capacity)
+
+    def _slice(self, written: int, n: int) -> slice:
+        end = written % self.capacity + self.capacity
+        return slice(end - n, end)
+
+    def _views(self, s: slice) -> Tuple[np.ndarray, np.ndarray]:
+        ts, values = self._ts[s], self._values[s]
+        ts.flags.writeable = False
+        values.flags.writeable = False
+        return ts, values
+
+    def latest(self, n: Optional[int] = None,
+               copy: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """(ts, values) des n derniers points (tous si n est None), du plus ancien au plus récent."""
+        while True:
+            written = self.written
+            size = min(written - self._base, self.capacity)
+            n = size if n is None else max(0, min(int(n), size))
+            ts, values = self._views(self._slice(written, n))
+            if not copy:
+                return ts, values
+            ts, values = ts.copy(), values.copy()
+            if self.written - written <= self.capacity - n:
+                return ts, values
+
+    def since(self, t_min: float, copy: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """(ts, values) des points avec ts >= t_min (recherche dichotomique)."""
+        while True:
+            written = self.written
+            size = min(written - self._base, self.capacity)
+            s = self._slice(written, size)
+            k = int(np.searchsorted(self._ts[s], t_min, side="left"))
+            n = size - k
+            ts, values = self._views(self._slice(written, n))
+            if not copy:
+                return ts, values
+            ts, values = ts.copy(), values.copy()
+            if self.written - written <= self.capacity - size:
+                return ts, values
+
+    def read_since(self, cursor: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Consommation en flux : copies (ts, values) des points écrits
+        depuis `cursor` (valeur de `written` à la lecture précédente,
+        0 au départ) et nouveau curseur. Si l'écrivain a pris plus d'un
+        tour d'avance, seuls les `capacité` derniers points sont rendus :
+        (nouveau curseur - cursor) - len(ts) points ont été perdus.
+        """
+        while True:
+            written = self.written
+            n = max(0, min(written - max(cursor, self._base), self.capacity))
+            s = self._slice(written, n)
+            ts, values = self._ts[s].copy(), self._values[s].copy()
+            if self.written - written <= self.capacity - n:
+                return ts, values, written
 
     def last(self) -> Optional[Tuple[float, float]]:
-        data = self.snapshot()
-        return data[-1] if data else None
+        written = self.written
+        if written == self._base:
+            return None
+        i = (written - 1) % self.capacity + self.capacity
+        return float(self._ts[i]), float(self._values[i])
@@ -2,36 +2,328 @@
 debug.py
 --------
 Petit outillage de logging et de profilage.
+
+- setup_logger / log_exceptions : logging console (+ fichier tournant) ;
+                   mode "queue" : QueueHandler sur file bornée, écriture
+                   dans un thread QueueListener, messages perdus comptés
+- timeblock      : chronomètre un bloc (log, ou enregistrement dans un StageTimings)
+- TimingHistogram: histogramme de durées à bins logarithmiques fixes
+                   (mémoire constante, p50 / p95 sans garder les mesures)
+- StageTimings   : un histogramme par étage, chronomètres réutilisables ;
+                   stats() pour l'API / le HUD de performance
+- Tracer / TRACER: spans début / fin dans un anneau préalloué, export au
+                   format Chrome trace-event (chrome://tracing, Perfetto)
 """
 
+import atexit
+import itertools
+import json
 import logging
+import logging.handlers
+import math
+import os
+import queue
+import threading
 import time
 from contextlib import contextmanager
 from functools import wraps
+from typing import Dict, List, Optional
+
+LOG_FORMAT = "[%(asctime)s] %(levelname)s: %(message)s"
+LOG_MODES = ("sync", "queue")
+LOG_QUEUE_SIZE = 10000
+
+_LISTENERS: Dict[str, logging.handlers.QueueListener] = {}
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler sur file bornée qui ne bloque jamais l'appelant : file
+    pleine → l'enregistrement est jeté et compté (dropped). Dès qu'il y
+    a de nouveau de la place, un avertissement donne le nombre perdu.
+    """
 
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+        self._unreported = 0
 
-def setup_logger(name: str = "coherence", level: int = logging.INFO) -> logging.Logger:
-    """Configure un logger simple (console)."""
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._unreported:
+            lost = self._unreported
+            notice = logging.LogRecord(record.name, logging.WARNING, __file__, 0,
+                                       "⚠️ %d message(s) de log perdu(s) (file pleine)",
+                                       (lost,), None)
+            try:
+                self.queue.put_nowait(self.prepare(notice))
+                self._unreported -= lost
+            except queue.Full:
+                pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+
+def setup_logger(name: str = "coherence", level: int = logging.INFO, mode: str = "sync",
+                 log_file: Optional[str] = None, max_bytes: int = 1_000_000,
+                 backup_count: int = 3, queue_size: int = LOG_QUEUE_SIZE,
+                 console: bool = True) -> logging.Logger:
+    """
+    Configure un logger (sans effet s'il a déjà des handlers).
+
+    mode="sync"  : handlers appelés dans le thread qui logge (historique).
+    mode="queue" : le logger n'a qu'un DroppingQueueHandler (file bornée à
+                   queue_size) ; console / fichier sont écrits par un
+                   QueueListener dans un thread de fond, arrêté (et vidé)
+                   par shutdown_logging() ou à la sortie du programme.
+    log_file     : fichier tournant (RotatingFileHandler, max_bytes ×
+                   backup_count) en plus de la console (console=False
+                   pour ne garder que le fichier).
+    """
+    if mode not in LOG_MODES:
+        raise ValueError(f"mode de logging inconnu : {mode!r}")
     logger = logging.getLogger(name)
-    if not logger.handlers:
-        logger.setLevel(level)
-        h = logging.StreamHandler()
-        fmt = logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s")
+    if logger.handlers:
+        return logger
+    logger.setLevel(level)
+
+    fmt = logging.Formatter(LOG_FORMAT)
+    handlers: List[logging.Handler] = []
+    if console:
+        handlers.append(logging.StreamHandler())
+    if log_file:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"))
+    for h in handlers:
         h.setFormatter(fmt)
-        logger.addHandler(h)
+
+    if mode == "sync":
+        for h in handlers:
+            logger.addHandler(h)
+        return logger
+
+    q: queue.Queue = queue.Queue(maxsize=max(1, int(queue_size)))
+    logger.addHandler(DroppingQueueHandler(q))
+    logger.propagate = False
+    listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    listener.start()
+    _LISTENERS[name] = listener
     return logger
 
 
+def dropped_log_records(name: str = "coherence") -> int:
+    """Messages perdus par le logger `name` (mode "queue", file pleine)."""
+    for h in logging.getLogger(name).handlers:
+        if isinstance(h, DroppingQueueHandler):
+            return h.dropped
+    return 0
+
+
+def shutdown_logging(name: Optional[str] = None) -> None:
+    """Vide la file et arrête le(s) QueueListener (tous si name=None)."""
+    names = list(_LISTENERS) if name is None else [name]
+    for n in names:
+        listener = _LISTENERS.pop(n, None)
+        if listener is None:
+            continue
+        deadline = time.monotonic() + 5.0
+        while True:
+            try:
+                listener.stop()         # sentinelle en fin de file, puis join
+                break
+            except queue.Full:          # file pleine : le thread la vide
+                if time.monotonic() > deadline:
+                    break               # handler bloqué : on abandonne le reste
+                time.sleep(0.001)
+        for h in listener.handlers:
+            h.close()
+        logger = logging.getLogger(n)
+        for h in list(logger.handlers):
+            if isinstance(h, DroppingQueueHandler):
+                logger.removeHandler(h)
+
+
+atexit.register(shutdown_logging)
+
+
 @contextmanager
-def timeblock(label: str, logger: logging.Logger | None = None):
-    """Mesure le temps d'un bloc avec `with timeblock('X'):`"""
+def timeblock(label: str, logger: logging.Logger | None = None,
+              timings: "StageTimings | None" = None):
+    """
+    Mesure le temps d'un bloc avec `with timeblock('X'):`. Avec
+    `timings`, la durée va dans l'histogramme de l'étage `label` au lieu
+    d'être loggée.
+    """
     t0 = time.perf_counter()
     try:
         yield
     finally:
         dt = (time.perf_counter() - t0) * 1000.0
-        msg = f"{label} took {dt:.1f} ms"
-        (logger or setup_logger()).info(msg)
+        if timings is not None:
+            timings.record(label, dt)
+        else:
+            msg = f"{label} took {dt:.1f} ms"
+            (logger or setup_logger()).info(msg)
+
+
+# ----------------------------------------------------------------------
+# Histogrammes de durées
+# ----------------------------------------------------------------------
+HIST_MIN_MS = 1e-3          # 1 µs
+HIST_DECADES = 7            # jusqu'à 10 s
+HIST_PER_DECADE = 10        # résolution ≈ 26 % par bin
+HIST_BINS = HIST_DECADES * HIST_PER_DECADE + 2     # + sous / dépassement
+
+_LOG_MIN = math.log10(HIST_MIN_MS)
+
+
+class TimingHistogram:
+    """
+    Durées (ms) comptées dans des bins logarithmiques fixes : record()
+    est O(1) sans allocation, la mémoire ne grandit pas avec la durée de
+    la session. Les percentiles sont approchés au centre géométrique du
+    bin (écart < ±13 %), bornés par le maximum observé.
+
+    Un seul thread écrit ; une lecture depuis un autre thread peut
+    manquer la mesure en cours, sans autre effet.
+    """
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "last_ms")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = [0] * HIST_BINS
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        if ms < HIST_MIN_MS:
+            i = 0
+        else:
+            i = min(HIST_BINS - 1, 1 + int((math.log10(ms) - _LOG_MIN) * HIST_PER_DECADE))
+        self.counts[i] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.last_ms = ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    @staticmethod
+    def _bin_center(i: int) -> float:
+        if i == 0:
+            return HIST_MIN_MS
+        return 10.0 ** (_LOG_MIN + (i - 0.5) / HIST_PER_DECADE)
+
+    def percentile(self, q: float) -> float:
+        """Percentile q (0–100) approché, 0.0 sans mesure."""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * q / 100.0))
+        acc = 0
+        for i, c in enumerate(list(self.counts)):
+            acc += c
+            if acc >= target:
+                return min(self._bin_center(i), self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> Dict[str, float]:
+        n = self.count
+        return {
+            "count": n,
+            "mean_ms": self.total_ms / n if n else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": self.max_ms,
+            "last_ms": self.last_ms,
+        }
+
+
+class _StageClock:
+    """
+    Chronomètre réutilisable d'un étage (pas d'allocation par mesure).
+    Si TRACER est actif, la mesure est aussi enregistrée comme span.
+    """
+
+    __slots__ = ("hist", "name", "t0")
+
+    def __init__(self, hist: Optional[TimingHistogram], name: str = ""):
+        self.hist = hist
+        self.name = name
+        self.t0 = 0.0
+
+    def __enter__(self):
+        if self.hist is not None:
+            self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.hist is not None:
+            t1 = time.perf_counter()
+            self.hist.record((t1 - self.t0) * 1000.0)
+            if TRACER.enabled:
+                TRACER.complete(self.name, self.t0, t1)
+        return False
+
+
+_NO_CLOCK = _StageClock(None)
+
+
+class StageTimings:
+    """
+    Un TimingHistogram par étage nommé :
+
+        timings = StageTimings()
+        with timings.stage("welch"):
+            ...
+        timings.stats()   # {"welch": {"count", "p50_ms", "p95_ms", ...}}
+
+    enabled=False : stage() devient un no-op (coût d'un appel de méthode).
+    Les chronomètres ne sont pas réentrants pour un même étage.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._hists: Dict[str, TimingHistogram] = {}
+        self._clocks: Dict[str, _StageClock] = {}
+
+    def histogram(self, name: str) -> TimingHistogram:
+        hist = self._hists.get(name)
+        if hist is None:
+            hist = self._hists[name] = TimingHistogram()
+        return hist
+
+    def stage(self, name: str) -> _StageClock:
+        if not self.enabled:
+            return _NO_CLOCK
+        clock = self._clocks.get(name)
+        if clock is None:
+            clock = self._clocks[name] = _StageClock(self.histogram(name), name)
+        return clock
+
+    def record(self, name: str, ms: float) -> None:
+        if self.enabled:
+            self.histogram(name).record(ms)
+
+    def record_interval(self, name: str, t0: float, t1: float) -> None:
+        """Mesure faite par l'appelant (instants time.perf_counter) ; tracée si TRACER est actif."""
+        if self.enabled:
+            self.histogram(name).record((t1 - t0) * 1000.0)
+            if TRACER.enabled:
+                TRACER.complete(name, t0, t1)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Résumé par étage, dans l'ordre de première mesure."""
+        return {name: h.as_dict() for name, h in list(self._hists.items())}
+
+    def reset(self) -> None:
+        for h in self._hists.values():
+            h.reset()
 
 
 def log_exceptions(logger: logging.Logger | None = None):
@@ -47,3 +339,154 @@ def log_exceptions(logger: logging.Logger | None = None):
                 raise
         return wrapper
     return deco
+
+
+# ----------------------------------------------------------------------
+# Traces (format Chrome trace-event)
+# ----------------------------------------------------------------------
+TRACE_CAPACITY = 65536
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "t0")
+
+    def __init__(self, tracer: "Tracer", name: str, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.t0, time.perf_counter(), self.args)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """
+    Spans (nom, début, durée, thread) dans un anneau préalloué de
+    `capacity` entrées : les plus anciennes sont écrasées, la mémoire ne
+    grandit pas. Écriture sans verrou depuis n'importe quel thread
+    (l'indice vient d'un itertools.count, atomique sous le GIL).
+
+    Désactivé, span() renvoie un contexte vide partagé : le coût se
+    limite à un appel de méthode et un test de booléen.
+
+        with TRACER.span("push_rr"):
+            ...
+        TRACER.dump("trace.json")   # à ouvrir dans chrome://tracing / Perfetto
+    """
+
+    def __init__(self, capacity: int = TRACE_CAPACITY, enabled: bool = False):
+        self.capacity = int(capacity)
+        self.enabled = enabled
+        self._origin = time.perf_counter()
+        self.clear()
+
+    # --------------------------------------------------------------
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        cap = self.capacity
+        self._name = [None] * cap
+        self._t0 = [0.0] * cap
+        self._dur = [0.0] * cap
+        self._tid = [0] * cap
+        self._args = [None] * cap
+        self._counter = itertools.count()
+        self._written = 0
+        self._threads: Dict[int, str] = {}      # tid -> nom, noté au premier span
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    # --------------------------------------------------------------
+    def span(self, name: str, args: Optional[dict] = None):
+        """Contexte qui enregistre un span « X » (début + durée)."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, args)
+
+    def complete(self, name: str, t0: float, t1: float, args: Optional[dict] = None) -> None:
+        """Span mesuré par l'appelant (instants time.perf_counter)."""
+        n = next(self._counter)
+        i = n % self.capacity
+        self._name[i] = name
+        self._t0[i] = t0
+        self._dur[i] = t1 - t0
+        tid = self._tid[i] = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._args[i] = args
+        self._written = n + 1
+
+    def instant(self, name: str, args: Optional[dict] = None) -> None:
+        """Événement ponctuel (durée nulle)."""
+        if self.enabled:
+            t = time.perf_counter()
+            self.complete(name, t, t, args)
+
+    # --------------------------------------------------------------
+    def events(self) -> list:
+        """Événements Chrome trace-event, du plus ancien au plus récent."""
+        written, cap = self._written, self.capacity
+        start = max(0, written - cap)
+        pid = os.getpid()
+        names = self._threads
+        out, tids = [], set()
+        for n in range(start, written):
+            i = n % cap
+            name = self._name[i]
+            if name is None:
+                continue
+            tid = self._tid[i]
+            tids.add(tid)
+            ev = {
+                "name": name, "ph": "X" if self._dur[i] > 0 else "i", "pid": pid, "tid": tid,
+                "ts": round((self._t0[i] - self._origin) * 1e6, 3),
+            }
+            if ev["ph"] == "X":
+                ev["dur"] = round(self._dur[i] * 1e6, 3)
+            else:
+                ev["s"] = "t"
+            if self._args[i] is not None:
+                ev["args"] = self._args[i]
+            out.append(ev)
+        for tid in sorted(tids):
+            out.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                        "args": {"name": names.get(tid, f"thread-{tid}")}})
+        return out
+
+    def dump(self, out) -> int:
+        """Écrit le JSON (chemin ou fichier texte) ; renvoie le nb d'événements."""
+        events = self.events()
+        doc = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if isinstance(out, (str, os.PathLike)):
+            with open(out, "w", encoding="utf-8") as f:
+                json.dump(doc, f, separators=(",", ":"))
+        else:
+            json.dump(doc, out, separators=(",", ":"))
+        return len(events)
+
+
+# instance partagée ; COHERENCE_TRACE=1 l'active dès l'import
+TRACER = Tracer(enabled=os.environ.get("COHERENCE_TRACE", "") not in ("", "0"))
@@ -0,0 +1,154 @@
+"""
+registry.py
+-----------
+Registre de backends optionnels, résolus par nom à la première utilisation.
+
+Les implémentations lourdes (neurokit2, hrvanalysis…) ne sont importées
+que lorsqu'on les demande : au démarrage, seuls NumPy / SciPy sont chargés.
+
+    EDR = BackendRegistry("edr")
+    EDR.register("neurokit", "edr.respiration_edr:extract_respiration_edr",
+                 requires=("neurokit2",))
+    fn = EDR.get("neurokit")          # import effectif ici
+
+import_report() mesure, dans un interpréteur neuf, combien de
+millisecondes chaque dépendance optionnelle ajouterait au lancement :
+    python -m core.registry
+"""
+
+import importlib
+import importlib.util
+import subprocess
+import sys
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Dépendances toujours chargées : le coût mesuré est en plus de celles-ci
+BASE_MODULES = ("numpy", "scipy.signal", "scipy.interpolate")
+
+
+class BackendRegistry:
+    """Associe un nom à une cible "module:attribut" importée à la demande."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._specs: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self._loaded: Dict[str, object] = {}
+        self._lock = Lock()
+
+    def register(self, name: str, target: str, requires: Iterable[str] = ()) -> None:
+        """
+        target   : "paquet.module:attribut"
+        requires : modules tiers optionnels nécessaires (pour available()
+                   et import_report()).
+        """
+        if ":" not in target:
+            raise ValueError(f"cible invalide (attendu 'module:attribut') : {target!r}")
+        self._specs[name] = (target, tuple(requires))
+
+    def names(self) -> List[str]:
+        return list(self._specs)
+
+    def requires(self, name: str) -> Tuple[str, ...]:
+        return self._spec(name)[1]
+
+    def module(self, name: str) -> str:
+        return self._spec(name)[0].split(":", 1)[0]
+
+    def available(self, name: str) -> bool:
+        """Vrai si les dépendances sont installées (sans les importer)."""
+        return all(importlib.util.find_spec(m.split(".")[0]) is not None
+                   for m in self.requires(name))
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def get(self, name: str):
+        """Résout (et met en cache) l'implémentation `name`."""
+        obj = self._loaded.get(name)
+        if obj is not None:
+            return obj
+        target, _ = self._spec(name)
+        module_name, attr = target.split(":", 1)
+        with self._lock:
+            obj = self._loaded.get(name)
+            if obj is None:
+                obj = getattr(importlib.import_module(module_name), attr)
+                self._loaded[name] = obj
+        return obj
+
+    def _spec(self, name: str):
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise KeyError(
+                f"backend {self.kind} inconnu : {name!r} (connus : {', '.join(self._specs)})"
+            ) from None
+
+
+# ----------------------------------------------------------------------
+# Coût d'import
+# ----------------------------------------------------------------------
+def import_cost_ms(modules: Iterable[str], python: str = sys.executable,
+                   timeout: float = 60.0) -> Optional[float]:
+    """
+    Temps d'import (ms) de `modules` dans un interpréteur neuf, BASE_MODULES
+    déjà chargés. None si l'un des modules est absent.
+    """
+    modules = list(modules)
+    if not modules:
+        return 0.0
+    code = (
+        "import time\n"
+        + "".join(f"import {m}\n" for m in BASE_MODULES)
+        + "t0 = time.perf_counter()\n"
+        + "".join(f"import {m}\n" for m in modules)
+        + "print((time.perf_counter() - t0) * 1000.0)\n"
+    )
+    try:
+        out = subprocess.run([python, "-c", code], capture_output=True, text=True,
+                             timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if out.returncode != 0:
+        return None
+    try:
+        return float(out.stdout.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        return None
+
+
+def import_report(registries: Iterable[BackendRegistry]) -> List[Dict[str, object]]:
+    """Une ligne par backend : dépendances, disponibilité, coût d'import (ms)."""
+    rows = []
+    for reg in registries:
+        for name in reg.names():
+            req = reg.requires(name)
+            ok = reg.available(name)
+            rows.append({
+                "kind": reg.kind,
+                "name": name,
+                "requires": ",".join(req) or "-",
+                "available": ok,
+                "import_ms": import_cost_ms(req + (reg.module(name),)) if ok else None,
+            })
+    return rows
+
+
+def main() -> None:
+    from edr.backends import EDR_BACKENDS
+    from hrv.hrv_backend import CLEAN_BACKENDS
+
+    print(f"{'type':<6} {'backend':<12} {'dépendances':<14} {'import (ms)':>11}")
+    for row in import_report([EDR_BACKENDS, CLEAN_BACKENDS]):
+        if not row["available"]:
+            cost = "absent"
+        elif row["import_ms"] is None:
+            cost = "erreur"
+        else:
+            cost = f"{row['import_ms']:.1f}"
+        print(f"{row['kind']:<6} {row['name']:<12} {row['requires']:<14} {cost:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+scheduler.py
+------------
+Ordonnanceur multi-cadence, sans dépendance Qt.
+
+Chaque tâche déclare une cadence cible (Hz) ou est événementielle
+(rate_hz=None, exécutée après trigger()), et une priorité. tick() exécute
+les tâches dues, de la plus prioritaire à la moins prioritaire :
+
+- une tâche périodique en retard de plusieurs périodes ne rattrape pas :
+  les images manquées sont sautées (comptées dans `skipped`) ;
+- si budget_ms est dépassé pendant le tick, les tâches restantes marquées
+  skippable sont reportées : une tâche périodique perd son image, une
+  tâche événementielle reste en attente pour le tick suivant.
+
+    sched = MultiRateScheduler(budget_ms=33)
+    sched.add("guide", step_guide, rate_hz=30, priority=3, skippable=False)
+    sched.add("spectral", redraw_spectrum, rate_hz=1, priority=1)
+    sched.add("labels", update_labels, priority=0)      # événementielle
+    sched.trigger("labels")
+    sched.tick()                                        # depuis un QTimer
+"""
+
+import math
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class ScheduledTask:
+    """Tâche enregistrée et ses compteurs."""
+
+    __slots__ = ("name", "fn", "period", "priority", "skippable",
+                 "next_due", "pending", "last_run", "runs", "skipped",
+                 "last_ms", "total_ms")
+
+    def __init__(self, name: str, fn: Callable[[], object], period: Optional[float],
+                 priority: int, skippable: bool):
+        self.name = name
+        self.fn = fn
+        self.period = period            # s ; None = événementielle
+        self.priority = priority
+        self.skippable = skippable
+        self.next_due = 0.0
+        self.pending = False
+        self.last_run: Optional[float] = None
+        self.runs = 0
+        self.skipped = 0
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+
+    @property
+    def rate_hz(self) -> Optional[float]:
+        return None if self.period is None else 1.0 / self.period
+
+    def is_due(self, now: float) -> bool:
+        if self.period is None:
+            return self.pending
+        return now >= self.next_due
+
+    def as_dict(self) -> dict:
+        return {
+            "rate_hz": self.rate_hz,
+            "priority": self.priority,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "last_ms": self.last_ms,
+            "mean_ms": self.total_ms / self.runs if self.runs else 0.0,
+        }
+
+
+class MultiRateScheduler:
+    """Exécute des tâches à cadences différentes depuis une seule horloge."""
+
+    def __init__(self, budget_ms: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.budget_ms = budget_ms
+        self.clock = clock
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._order: List[ScheduledTask] = []
+
+    # --------------------------------------------------------------
+    def add(self, name: str, fn: Callable[[], object], rate_hz: Optional[float] = None,
+            priority: int = 0, skippable: bool = True) -> ScheduledTask:
+        """
+        rate_hz   : cadence cible ; None = tâche événementielle (trigger)
+        priority  : plus grand = exécuté plus tôt dans le tick
+        skippable : peut être reportée si le budget du tick est dépassé
+        """
+        if name in self._tasks:
+            raise ValueError(f"tâche déjà enregistrée : {name!r}")
+        task = ScheduledTask(name, fn, self._period(rate_hz), priority, skippable)
+        task.next_due = self.clock()
+        self._tasks[name] = task
+        self._order = sorted(self._tasks.values(), key=lambda t: -t.priority)
+        return task
+
+    def set_rate(self, name: str, rate_hz: Optional[float]) -> None:
+        task = self._tasks[name]
+        task.period = self._period(rate_hz)
+        task.next_due = self.clock()
+
+    def trigger(self, name: str) -> None:
+        """Demande l'exécution au prochain tick (périodique : immédiate)."""
+        task = self._tasks[name]
+        if task.period is None:
+            task.pending = True
+        else:
+            task.next_due = min(task.next_due, self.clock())
+
+    def task(self, name: str) -> ScheduledTask:
+        return self._tasks[name]
+
+    # --------------------------------------------------------------
+    def tick(self, now: Optional[float] = None) -> int:
+        """Exécute les tâches dues ; renvoie le nombre de tâches exécutées."""
+        now = self.clock() if now is None else now
+        t_start = time.perf_counter()
+        ran = 0
+
+        for task in self._order:
+            if not task.is_due(now):
+                continue
+
+            if (self.budget_ms is not None and task.skippable and ran
+                    and (time.perf_counter() - t_start) * 1000.0 >= self.budget_ms):
+                # budget épuisé : on saute plutôt que d'allonger l'image
+                task.skipped += 1
+                if task.period is not None:
+                    self._advance(task, now)
+                continue
+
+            self._advance(task, now)
+            t0 = time.perf_counter()
+            try:
+                task.fn()
+            finally:
+                dt = (time.perf_counter() - t0) * 1000.0
+                task.last_ms = dt
+                task.total_ms += dt
+                task.runs += 1
+                task.last_run = now
+            ran += 1
+
+        return ran
+
+    def time_to_next(self, now: Optional[float] = None) -> Optional[float]:
+        """Secondes avant la prochaine échéance (0 si une tâche attend, None si aucune)."""
+        now = self.clock() if now is None else now
+        best = None
+        for task in self._order:
+            if task.period is None:
+                if task.pending:
+                    return 0.0
+                continue
+            wait = max(0.0, task.next_due - now)
+            best = wait if best is None else min(best, wait)
+        return best
+
+    def stats(self) -> Dict[str, dict]:
+        """Compteurs par tâche : cadence, exécutions, sauts, durées (ms)."""
+        return {t.name: t.as_dict() for t in self._order}
+
+    # --------------------------------------------------------------
+    @staticmethod
+    def _period(rate_hz: Optional[float]) -> Optional[float]:
+        if rate_hz is None:
+            return None
+        if rate_hz <= 0:
+            raise ValueError(f"cadence invalide : {rate_hz!r}")
+        return 1.0 / rate_hz
+
+    @staticmethod
+    def _advance(task: ScheduledTask, now: float) -> None:
+        if task.period is None:
+            task.pending = False
+            return
+        late = now - task.next_due
+        if late >= task.period:
+            # images manquées : pas de rattrapage en rafale
+            missed = int(math.floor(late / task.period))
+            task.skipped += missed
+            task.next_due += missed * task.period
+        task.next_due += task.period
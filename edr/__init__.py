@@ -8,7 +8,10 @@ des intervalles RR :
 - edr_premium.py : Méthode avancée RSA + filtre + autocorr + EMA.
 - respiration_edr.py : Backend EDR utilisant NeuroKit2 (filtrage / detrend).
 - fusion.py      : Combinaison pondérée des estimateurs.
-- helpers.py     : Fonctions utilitaires (interpolation, filtrage, normalisation).
+- backends.py    : Registre par nom ; respiration_edr (neurokit2) n'est
+                   importé qu'à la première utilisation.
+- helpers.py     : Fonctions utilitaires (interpolation, filtrage en cache /
+                   à état, normalisation).
 
 Le but de ce module est de centraliser toute la logique respiratoire afin
 que l'interface (UI) et le BLE restent indépendants et légers.
@@ -16,23 +19,38 @@ que l'interface (UI) et le BLE restent indépendants et légers.
 
 from .edr_basic import estimate_cpm_welch, generate_sinus
 from .edr_premium import EDRPremium
-from .respiration_edr import extract_respiration_edr
+from .backends import EDR_BACKENDS, get_edr_backend
 from .fusion import fuse_estimates
 from .helpers import (
     interpolate_rr,
     compute_rsa,
     normalize_signal,
+    design_bandpass,
+    StreamingBandpass,
     EDR_FS,
+    RESP_BAND,
 )
 
 __all__ = [
     "estimate_cpm_welch",
     "generate_sinus",
     "EDRPremium",
-    "extract_respiration_edr",
+    "EDR_BACKENDS",
+    "get_edr_backend",
     "fuse_estimates",
     "interpolate_rr",
     "compute_rsa",
     "normalize_signal",
+    "design_bandpass",
+    "StreamingBandpass",
     "EDR_FS",
+    "RESP_BAND",
 ]
+
+
+def __getattr__(name):
+    # compatibilité : `from edr import extract_respiration_edr` reste possible,
+    # mais neurokit2 n'est importé qu'à ce moment-là
+    if name == "extract_respiration_edr":
+        return EDR_BACKENDS.get("neurokit")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
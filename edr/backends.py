@@ -0,0 +1,25 @@
+"""
+backends.py
+-----------
+Registre des estimateurs EDR, importés à la première utilisation.
+
+- "premium"  : EDRPremium (RSA + filtre + Welch), NumPy / SciPy
+- "welch"    : estimate_cpm_welch (pic spectral simple)
+- "neurokit" : extract_respiration_edr, nécessite neurokit2 (import lourd)
+
+    from edr.backends import get_edr_backend
+    extract = get_edr_backend("neurokit")
+"""
+
+from core.registry import BackendRegistry
+
+EDR_BACKENDS = BackendRegistry("edr")
+EDR_BACKENDS.register("premium", "edr.edr_premium:EDRPremium")
+EDR_BACKENDS.register("welch", "edr.edr_basic:estimate_cpm_welch")
+EDR_BACKENDS.register("neurokit", "edr.respiration_edr:extract_respiration_edr",
+                      requires=("neurokit2",))
+
+
+def get_edr_backend(name: str):
+    """Implémentation EDR enregistrée sous `name` (import à la demande)."""
+    return EDR_BACKENDS.get(name)
@@ -12,24 +12,57 @@ Algorithme :
     - Pondération de la qualité (SNR)
     - Sortie : fréquence (cpm), qualité (0–1), signal reconstruit (t, y)
 
+Mode streaming (EDRPremium(streaming=True)) :
+    seuls les battements nouveaux depuis l'appel précédent sont
+    interpolés, dérivés et filtrés (sosfilt causal à état) ; le pic
+    spectral est cherché sur les `peak_window` derniers échantillons.
+    Le coût par appel dépend des nouvelles données, pas de la fenêtre.
+    Contrepartie : filtre causal → léger retard de phase à l'affichage.
+
+Instrumentation : `timings` (core.debug.StageTimings) garde les durées
+des étages "interpolation", "rsa_filter" (dérivée + passe-bande),
+"peak_search" (Welch + pic) et "normalize".
+
 Auteur : Damien × GPT-5
 Version : V10 Premium
 """
 
 import numpy as np
-from scipy.signal import butter, filtfilt, welch
+from scipy.signal import sosfiltfilt, welch
 from scipy.interpolate import interp1d
+from core.circular_buffer import ArrayRingBuffer
+from core.debug import StageTimings
 from core.math_utils import clamp
 
+from .helpers import StreamingBandpass, design_bandpass
+
 
 class EDRPremium:
     """Classe pour l’estimation respiratoire premium à partir du signal RR."""
 
-    def __init__(self, fs=4.0):
+    def __init__(self, fs=4.0, streaming=False, peak_window=256):
         self.fs = fs
+        self.streaming = streaming
+        self.peak_window = int(peak_window)
         self.ema_cpm = None
         self.last_quality = 0.0
         self.last_signal = (None, None)
+        self.timings = StageTimings()
+        if streaming:
+            self._bp = StreamingBandpass(fs)
+            self._t_buf = ArrayRingBuffer(self.peak_window)
+            self._y_buf = ArrayRingBuffer(self.peak_window)
+            self.reset_stream()
+
+    # ------------------------------------------------------------
+    def reset_stream(self):
+        """Repart de zéro (nouvelle session) en mode streaming."""
+        self._bp.reset()
+        self._t_buf.clear()
+        self._y_buf.clear()
+        self._last_beat = None      # (t, rr_s) du dernier battement traité
+        self._t_next = None         # prochain instant de la grille régulière
+        self._last_sample = None    # dernier échantillon interpolé (dérivée)
 
     # ------------------------------------------------------------
     def _welch_peak(self, y):
@@ -63,29 +96,88 @@ class EDRPremium:
         if len(rr_ms) < 30:
             return None, 0.0, (None, None)
 
+        if self.streaming:
+            return self._estimate_stream(t, rr_ms)
+
         # 1. Interpolation à 4 Hz
         rr = np.array(rr_ms, float) / 1000.0
         try:
-            t_reg = np.arange(t[0], t[-1], 1.0 / self.fs)
-            rr_interp = interp1d(t, rr, fill_value="extrapolate")(t_reg)
+            with self.timings.stage("interpolation"):
+                t_reg = np.arange(t[0], t[-1], 1.0 / self.fs)
+                rr_interp = interp1d(t, rr, fill_value="extrapolate")(t_reg)
         except Exception:
             return None, 0.0, (None, None)
 
         if len(rr_interp) < 64:
             return None, 0.0, (None, None)
 
-        # 2. Dérivée (RSA)
-        dy = np.gradient(rr_interp)
-
-        # 3. Filtrage passe-bande
-        b, a = butter(2, [0.07 / (self.fs / 2), 0.40 / (self.fs / 2)], btype="band")
+        # 2. Dérivée (RSA) + 3. filtrage passe-bande (coefficients SOS en cache)
         try:
-            y_filt = filtfilt(b, a, dy)
+            with self.timings.stage("rsa_filter"):
+                dy = np.gradient(rr_interp)
+                y_filt = sosfiltfilt(design_bandpass(self.fs), dy)
         except Exception:
             return None, 0.0, (None, None)
 
+        return self._finish(t_reg, y_filt)
+
+    # ------------------------------------------------------------
+    def _estimate_stream(self, t, rr_ms):
+        """Variante incrémentale : ne traite que les battements nouveaux."""
+        t = np.asarray(t, dtype=float)
+        rr = np.asarray(rr_ms, dtype=float) / 1000.0
+
+        # nouvelle session (temps qui recule) → on repart de zéro
+        if self._last_beat is not None and t[-1] < self._last_beat[0]:
+            self.reset_stream()
+
+        if self._last_beat is None:
+            t_beats, v_beats = t, rr
+            self._t_next = float(t[0])
+        else:
+            i0 = int(np.searchsorted(t, self._last_beat[0], side="right"))
+            if i0 >= t.size:
+                return self._result_or_empty()
+            t_beats = np.concatenate(([self._last_beat[0]], t[i0:]))
+            v_beats = np.concatenate(([self._last_beat[1]], rr[i0:]))
+        self._last_beat = (float(t_beats[-1]), float(v_beats[-1]))
+
+        # 1. Interpolation des seuls nouveaux instants de la grille
+        t_new = np.arange(self._t_next, t_beats[-1], 1.0 / self.fs)
+        if t_new.size == 0:
+            return self._result_or_empty()
+        self._t_next = float(t_new[-1]) + 1.0 / self.fs
+        with self.timings.stage("interpolation"):
+            y_new = np.interp(t_new, t_beats, v_beats)
+
+        with self.timings.stage("rsa_filter"):
+            # 2. Dérivée causale (différence arrière)
+            prev = y_new[0] if self._last_sample is None else self._last_sample
+            dy = np.diff(y_new, prepend=prev)
+            self._last_sample = float(y_new[-1])
+
+            # 3. Filtre à état sur les nouveaux échantillons uniquement
+            y_f = self._bp.process(dy)
+        self._t_buf.extend(t_new)
+        self._y_buf.extend(y_f)
+
+        if len(self._y_buf) < 64:
+            return None, 0.0, (None, None)
+
+        # 4+. Pic / EMA / normalisation sur la fenêtre fixe
+        return self._finish(self._t_buf.view(), self._y_buf.view())
+
+    def _result_or_empty(self):
+        if self.ema_cpm is None or self.last_signal[0] is None:
+            return None, 0.0, (None, None)
+        return float(self.ema_cpm), float(self.last_quality), self.last_signal
+
+    # ------------------------------------------------------------
+    def _finish(self, t_reg, y_filt):
+        """Pic spectral, EMA anti-saut, normalisation et qualité."""
         # 4. Pic spectral
-        cpm, snr = self._welch_peak(y_filt)
+        with self.timings.stage("peak_search"):
+            cpm, snr = self._welch_peak(y_filt)
         if cpm is None:
             return None, 0.0, (None, None)
 
@@ -99,16 +191,17 @@ class EDRPremium:
             self.ema_cpm = cpm
 
         # 6. Normalisation du signal (pour affichage)
-        y_norm = y_filt - np.mean(y_filt)
-        std = np.std(y_norm)
-        if std > 1e-6:
-            y_norm = y_norm / (2 * std) + 0.5
-        y_norm = np.clip(y_norm, 0, 1)
-
-        t_rel = t_reg - t_reg[-1]
-        mask = t_rel >= -20
-        t_plot = t_rel[mask]
-        y_plot = y_norm[mask]
+        with self.timings.stage("normalize"):
+            y_norm = y_filt - np.mean(y_filt)
+            std = np.std(y_norm)
+            if std > 1e-6:
+                y_norm = y_norm / (2 * std) + 0.5
+            y_norm = np.clip(y_norm, 0, 1)
+
+            t_rel = t_reg - t_reg[-1]
+            mask = t_rel >= -20
+            t_plot = t_rel[mask]
+            y_plot = y_norm[mask]
 
         # 7. Qualité = SNR normalisée
         quality = clamp((snr - 1.0) / 4.0, 0.0, 1.0)
@@ -5,17 +5,24 @@ Fonctions utilitaires utilisées par les différents algorithmes EDR :
 - interpolation régulière (RR → 4 Hz)
 - calcul RSA (dérivée du signal RR)
 - filtrage passe-bande 0.07–0.40 Hz (fréquence respiratoire)
+  · design_bandpass   : coefficients SOS mis en cache par (fs, bande, ordre)
+  · StreamingBandpass : filtre causal à état, ne traite que les nouveaux échantillons
 - normalisation 0..1 pour affichage
 """
 
+from functools import lru_cache
+
 import numpy as np
 from scipy.interpolate import interp1d
-from scipy.signal import butter, filtfilt
+from scipy.signal import butter, sosfilt, sosfilt_zi, sosfiltfilt
 
 
 # Fréquence de resampling (Hz) pour tous les traitements EDR
 EDR_FS = 4.0
 
+# Bande respiratoire (Hz)
+RESP_BAND = (0.07, 0.40)
+
 
 # ---------------------------------------------------------
 # Interpolation RR -> signal régulier à 4 Hz
@@ -59,6 +66,50 @@ def interpolate_rr(t, rr_ms):
         return None, None
 
 
+# ---------------------------------------------------------
+# Filtre passe-bande respiratoire
+# ---------------------------------------------------------
+@lru_cache(maxsize=16)
+def design_bandpass(fs=EDR_FS, band=RESP_BAND, order=2):
+    """
+    Butterworth passe-bande en sections d'ordre 2 (SOS).
+
+    Les coefficients ne dépendent que de (fs, band, order) : ils sont
+    calculés une seule fois puis servis depuis le cache. Le tableau est
+    partagé : ne pas le modifier (scipy refuse les tableaux en lecture
+    seule dans sosfilt).
+    """
+    nyq = fs / 2.0
+    return butter(order, [band[0] / nyq, band[1] / nyq], btype="band", output="sos")
+
+
+class StreamingBandpass:
+    """
+    Filtre passe-bande causal (sosfilt) qui conserve son état entre les
+    appels : process() ne traite que les échantillons nouvellement
+    arrivés, pour un coût proportionnel aux nouvelles données.
+    """
+
+    def __init__(self, fs=EDR_FS, band=RESP_BAND, order=2):
+        self.sos = design_bandpass(fs, tuple(band), order)
+        self._zi_unit = sosfilt_zi(self.sos)
+        self._zi = None
+
+    def reset(self):
+        self._zi = None
+
+    def process(self, x):
+        """Filtre un bloc de nouveaux échantillons et met à jour l'état."""
+        x = np.asarray(x, dtype=float)
+        if x.size == 0:
+            return x
+        if self._zi is None:
+            # démarrage en régime établi sur la première valeur
+            self._zi = self._zi_unit * x[0]
+        y, self._zi = sosfilt(self.sos, x, zi=self._zi)
+        return y
+
+
 # ---------------------------------------------------------
 # Calcul RSA (dérivée RR + filtrage passe-bande)
 # ---------------------------------------------------------
@@ -82,11 +133,11 @@ def compute_rsa(y, fs=EDR_FS):
 
     dy = np.gradient(np.asarray(y, dtype=float))
 
-    # Filtre passe-bande (0.07–0.40 Hz)
-    b, a = butter(2, [0.07 / (fs / 2), 0.40 / (fs / 2)], btype="band")
+    # Filtre passe-bande (0.07–0.40 Hz), coefficients en cache
+    sos = design_bandpass(fs)
 
     try:
-        y_f = filtfilt(b, a, dy)
+        y_f = sosfiltfilt(sos, dy)
         return y_f
     except Exception:
         return None
@@ -6,21 +6,34 @@ Package HRV
 Expose une API simple pour le reste de l'application :
 
 - clean_rr           : nettoyage des intervalles RR (outliers, ectopiques)
-- compute_time_domain: métriques temporelles (SDNN, RMSSD)
+- compute_time_domain: métriques temporelles (SDNN, RMSSD, pNN50, HR)
+- StreamingTimeDomain: mêmes métriques, mises à jour en O(1) par battement
 - compute_spectral   : LF, HF, ratio LF/HF via Welch
+- compute_spectral_lomb : LF, HF via Lomb–Scargle, sans interpolation
+- SlidingBandPower   : LF, HF, pic HF en continu par DFT glissante
+- compute_spectral_windows : Welch de toutes les fenêtres d'un enregistrement
 - detrend_signal     : suppression tendance linéaire
 - normalize_signal   : normalisation min-max (0..1)
 """
 
 from .hrv_backend import clean_rr
-from .time_domain import compute_time_domain
-from .spectral import compute_spectral
+from .time_domain import compute_time_domain, StreamingTimeDomain
+from .spectral import (
+    compute_spectral,
+    compute_spectral_lomb,
+    compute_spectral_windows,
+    SlidingBandPower,
+)
 from .utils import detrend_signal, normalize_signal
 
 __all__ = [
     "clean_rr",
     "compute_time_domain",
+    "StreamingTimeDomain",
     "compute_spectral",
+    "compute_spectral_lomb",
+    "compute_spectral_windows",
+    "SlidingBandPower",
     "detrend_signal",
     "normalize_signal",
 ]
@@ -0,0 +1,42 @@
+# hrv/clean_hrvanalysis.py
+"""
+Nettoyage RR via hrvanalysis (pip : "hrv-analysis").
+
+Module séparé pour que l'import, coûteux, n'ait lieu qu'à la première
+utilisation (voir CLEAN_BACKENDS dans hrv_backend).
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+
+# Le package pip est "hrv-analysis", le module python est "hrvanalysis"
+import hrvanalysis as hrv_lib  # type: ignore
+
+
+def clean_rr_hrvanalysis(rr: np.ndarray) -> List[float]:
+    """Outliers + ectopiques + interpolation des trous (pipeline hrvanalysis)."""
+    # Suppression des outliers grossiers (selon hrvanalysis)
+    rr_no_out = hrv_lib.remove_outliers(
+        rr_intervals=rr,
+        low_rri=300,
+        high_rri=2000
+    )
+
+    # Correction des battements ectopiques
+    rr_no_ect = hrv_lib.remove_ectopic_beats(
+        rr_intervals=rr_no_out,
+        method="malik"
+    )
+
+    # Interpolation des trous
+    rr_interp = hrv_lib.interpolate_nan(
+        rr_intervals=rr_no_ect,
+        method="linear"
+    )
+
+    clean = np.asarray(rr_interp, dtype=float)
+    clean = clean[np.isfinite(clean)]
+    return clean.tolist()
@@ -3,6 +3,8 @@
 Backend HRV : nettoyage RR + wrapper optionnel autour de hrvanalysis.
 
 - clean_rr(rr_ms)        : filtre les RR aberrants + ectopiques
+- CLEAN_BACKENDS         : registre des nettoyeurs ("hrvanalysis", "basic"),
+                           hrvanalysis n'est importé qu'à la première utilisation
 """
 
 from __future__ import annotations
@@ -11,19 +13,22 @@ from typing import Iterable, List
 
 import numpy as np
 
-try:
-    # Le package pip est "hrv-analysis", le module python est "hrvanalysis"
-    import hrvanalysis as hrv_lib  # type: ignore
-except Exception:  # pragma: no cover
-    hrv_lib = None
+from core.registry import BackendRegistry
+
+CLEAN_BACKENDS = BackendRegistry("clean")
+CLEAN_BACKENDS.register("hrvanalysis", "hrv.clean_hrvanalysis:clean_rr_hrvanalysis",
+                        requires=("hrvanalysis",))
+CLEAN_BACKENDS.register("basic", "hrv.hrv_backend:clean_rr_basic")
 
 
 def _np_array(rr_ms: Iterable[float]) -> np.ndarray:
     """Convertit en array float64."""
+    if isinstance(rr_ms, np.ndarray):
+        return rr_ms.astype(float, copy=False)
     return np.asarray(list(rr_ms), dtype=float)
 
 
-def clean_rr(rr_ms: Iterable[float]) -> List[float]:
+def clean_rr(rr_ms: Iterable[float], backend: str = "auto") -> List[float]:
     """
     Nettoie une série d'intervalles RR (ms).
 
@@ -36,6 +41,9 @@ def clean_rr(rr_ms: Iterable[float]) -> List[float]:
     ----------
     rr_ms : Iterable[float]
         Intervalles RR en millisecondes.
+    backend : str
+        "auto" (hrvanalysis si installé, sinon basic) ou un nom de
+        CLEAN_BACKENDS ; ValueError si le nom est inconnu.
 
     Returns
     -------
@@ -47,35 +55,33 @@ def clean_rr(rr_ms: Iterable[float]) -> List[float]:
         return []
 
     # --- Cas 1 : hrvanalysis disponible ---
-    if hrv_lib is not None:
+    if backend == "auto":
+        backend = "hrvanalysis" if CLEAN_BACKENDS.available("hrvanalysis") else "basic"
+
+    if backend not in CLEAN_BACKENDS.names():
+        raise ValueError(
+            f"backend de nettoyage inconnu : {backend!r} "
+            f"(connus : auto, {', '.join(CLEAN_BACKENDS.names())})"
+        )
+
+    if backend != "basic":
         try:
-            # Suppression des outliers grossiers (selon hrvanalysis)
-            rr_no_out = hrv_lib.remove_outliers(
-                rr_intervals=rr,
-                low_rri=300,
-                high_rri=2000
-            )
-
-            # Correction des battements ectopiques
-            rr_no_ect = hrv_lib.remove_ectopic_beats(
-                rr_intervals=rr_no_out,
-                method="malik"
-            )
-
-            # Interpolation des trous
-            rr_interp = hrv_lib.interpolate_nan(
-                rr_intervals=rr_no_ect,
-                method="linear"
-            )
-
-            clean = np.asarray(rr_interp, dtype=float)
-            clean = clean[np.isfinite(clean)]
-            return clean.tolist()
-        except Exception:
-            # Si quelque chose se passe mal, on tombe sur le fallback
-            pass
+            fn = CLEAN_BACKENDS.get(backend)
+        except ImportError:
+            fn = None                       # dépendance absente → fallback
+        if fn is not None:
+            try:
+                return fn(rr)
+            except Exception:
+                # Échec du backend lui-même (série trop courte…) → fallback
+                pass
 
     # --- Cas 2 : Fallback simple maison ---
+    return clean_rr_basic(rr)
+
+
+def clean_rr_basic(rr: np.ndarray) -> List[float]:
+    """Fallback maison : filtre [300, 2000] ms puis sigma-clipping (MAD)."""
     # Filtre très grossier sur les valeurs admissibles
     mask = (rr >= 300.0) & (rr <= 2000.0)
     rr = rr[mask]
@@ -1,3 +1,7 @@
+import math
+import time
+from functools import lru_cache
+
 import numpy as np
 from scipy.signal import welch
 from typing import Iterable, Dict, Optional
@@ -5,6 +9,10 @@ from typing import Iterable, Dict, Optional
 LF_BAND = (0.04, 0.15)
 HF_BAND = (0.15, 0.40)
 FS = 4.0  # fréquence d'échantillonnage interpolée
+SDFT_N = 256  # longueur de la fenêtre glissante (= nperseg de Welch)
+LOMB_MESH_FS = 4.0   # maillage d'extirpolation du Lomb–Scargle rapide (Hz)
+LOMB_OFAC = 2        # suréchantillonnage : pas de fréquence 1 / (LOMB_OFAC · durée)
+LOMB_MIN_NFFT = 256  # plancher (fenêtres très courtes : assez de points en LF)
 
 
 def detrend_signal(x: np.ndarray) -> np.ndarray:
@@ -19,9 +27,11 @@ def _band_power(freqs, psd, band):
     return np.trapz(psd[mask], freqs[mask])
 
 
-def compute_spectral(rr_intervals_ms: Iterable[float]) -> Dict[str, Optional[float]]:
+def compute_spectral(rr_intervals_ms: Iterable[float],
+                     timings=None) -> Dict[str, Optional[float]]:
     """
-    Calcule un spectre HRV complet.
+    Calcule un spectre HRV complet. `timings` (core.debug.StageTimings,
+    optionnel) reçoit les durées des étages "interpolation" et "welch".
     Retourne un dict :
       {
         "freq": ndarray,
@@ -31,8 +41,11 @@ def compute_spectral(rr_intervals_ms: Iterable[float]) -> Dict[str, Optional[flo
         "peak_hf": float
       }
     """
-    rr_list = list(rr_intervals_ms)
-    n = len(rr_list)
+    if isinstance(rr_intervals_ms, np.ndarray):
+        rr_ms = rr_intervals_ms
+    else:
+        rr_ms = list(rr_intervals_ms)
+    n = len(rr_ms)
 
     if n < 10:
         return {
@@ -44,7 +57,7 @@ def compute_spectral(rr_intervals_ms: Iterable[float]) -> Dict[str, Optional[flo
         }
 
     # Converti en secondes
-    rr = np.asarray(rr_list, dtype=float) / 1000.0
+    rr = np.asarray(rr_ms, dtype=float) / 1000.0
 
     # Axe temporel cumulé
     t = np.cumsum(rr) - rr[0]
@@ -68,14 +81,19 @@ def compute_spectral(rr_intervals_ms: Iterable[float]) -> Dict[str, Optional[flo
             "peak_hf": 0.0,
         }
 
+    t0 = time.perf_counter()
     rr_uniform = np.interp(t_uniform, t, rr)
 
     # Detrend
     rr_uniform = detrend_signal(rr_uniform)
+    t1 = time.perf_counter()
 
     # PSD de Welch
     nperseg = min(256, len(rr_uniform))
     freqs, psd = welch(rr_uniform, fs=FS, nperseg=nperseg)
+    if timings is not None:
+        timings.record_interval("interpolation", t0, t1)
+        timings.record_interval("welch", t1, time.perf_counter())
 
     # Puissances LF / HF
     lf = float(_band_power(freqs, psd, LF_BAND))
@@ -97,3 +115,328 @@ def compute_spectral(rr_intervals_ms: Iterable[float]) -> Dict[str, Optional[flo
         "peak_hf": peak_hf,
     }
 
+
+# ----------------------------------------------------------------------
+# Lomb–Scargle rapide (Press & Rybicki) : pas d'interpolation à 4 Hz
+# ----------------------------------------------------------------------
+@lru_cache(maxsize=8)
+def _lomb_grid(nfft: int):
+    """Indices FFT et fréquences de la grille LF+HF (précalculés par nfft)."""
+    freqs = np.arange(nfft // 2 + 1) * LOMB_MESH_FS / nfft
+    k = np.nonzero((freqs >= LF_BAND[0]) & (freqs <= HF_BAND[1]))[0]
+    return k, freqs[k]
+
+
+def _extirpolate(x: np.ndarray, y: np.ndarray, nfft: int) -> np.ndarray:
+    """
+    Répartit chaque valeur y (position flottante x sur le maillage) sur les
+    4 nœuds voisins avec les poids de Lagrange (inverse de l'interpolation).
+    Indices pris modulo nfft : la DFT est périodique. x et y peuvent être
+    2-D (une ligne par série) : une ligne de sortie par série.
+    """
+    rows = x.shape[0] if x.ndim == 2 else 1
+    ilo = np.floor(x).astype(np.int64) - 1
+    d0 = x - ilo
+    d1 = d0 - 1.0
+    d2 = d0 - 2.0
+    d3 = d0 - 3.0
+    w = np.stack((d1 * d2 * d3 * (y / -6.0),
+                  d0 * d2 * d3 * (y / 2.0),
+                  d0 * d1 * d3 * (y / -2.0),
+                  d0 * d1 * d2 * (y / 6.0)), axis=-1)
+    idx = (ilo[..., None] + np.arange(4)) % nfft
+    if x.ndim == 2:
+        idx += (np.arange(rows) * nfft)[:, None, None]
+    out = np.bincount(idx.ravel(), weights=w.ravel(), minlength=rows * nfft)
+    return out.reshape(rows, nfft) if x.ndim == 2 else out
+
+
+def compute_spectral_lomb(rr_intervals_ms: Iterable[float],
+                          t: Optional[Iterable[float]] = None) -> Dict[str, Optional[float]]:
+    """
+    Spectre HRV par Lomb–Scargle, directement sur les instants des
+    battements (pas de rééchantillonnage à 4 Hz).
+
+    Algorithme rapide de Press & Rybicki : les sommes Σ y·e^{iωt} et
+    Σ e^{2iωt} sont obtenues par FFT après extirpolation sur un maillage
+    à LOMB_MESH_FS ; la taille de FFT suit la durée de la fenêtre (pas de
+    fréquence 1 / (LOMB_OFAC · durée), puissance de 2 supérieure), la
+    grille 0.04–0.40 Hz est précalculée par taille. La puissance est
+    mise à l'échelle en densité (s²/Hz).
+
+    Coût mesuré (tests/bench_spectral.py) : du même ordre que
+    interpolation + Welch jusqu'à ~300 battements (≈ 0.2 ms), environ
+    1.5× plus cher à 1200 battements (FFT plus longue) : ce backend se
+    justifie par l'absence de rééchantillonnage, pas par la vitesse.
+    Accord avec Welch : LF à 4–8 % près, HF 30–45 % plus élevé
+    (l'interpolation linéaire à 4 Hz atténue la bande HF) — les seuils
+    calibrés sur Welch ne se transposent pas tels quels.
+
+    Même format de retour que compute_spectral (freq/power limités à
+    0.04–0.40 Hz).
+    """
+    if isinstance(rr_intervals_ms, np.ndarray):
+        rr_ms = rr_intervals_ms
+    else:
+        rr_ms = list(rr_intervals_ms)
+    empty = {"freq": None, "power": None, "lf": 0.0, "hf": 0.0, "peak_hf": 0.0}
+    if len(rr_ms) < 10:
+        return empty
+
+    y = np.asarray(rr_ms, dtype=float) / 1000.0
+    if t is None:
+        tb = np.cumsum(y) - y[0]
+    else:
+        tb = np.asarray(t, dtype=float)
+        tb = tb - tb[0]
+    span = float(tb[-1])
+    if span <= 0:
+        return empty
+
+    # taille de FFT suivant la fenêtre : durée × suréchantillonnage,
+    # arrondie à la puissance de 2 supérieure
+    nfft = max(LOMB_MIN_NFFT, 1 << math.ceil(math.log2(span * LOMB_MESH_FS * LOMB_OFAC)))
+    k, freqs = _lomb_grid(nfft)
+
+    n = y.size
+    x = tb * LOMB_MESH_FS
+    # les deux séries (y à ωt, 1 à 2ωt) extirpolées et transformées ensemble
+    grid = _extirpolate(np.stack((x, (2.0 * x) % nfft)),
+                        np.stack((y - y.mean(), np.ones(n))), nfft)
+    f1, f2 = np.fft.rfft(grid, axis=1)[:, k]
+
+    c, s_ = f1.real, f1.imag
+    c2, s2 = f2.real, f2.imag
+    hypo = np.hypot(c2, s2) + 1e-300
+    hc2wt = 0.5 * c2 / hypo
+    hs2wt = 0.5 * s2 / hypo
+    cwt = np.sqrt(np.maximum(0.5 + hc2wt, 0.0))
+    swt = np.copysign(np.sqrt(np.maximum(0.5 - hc2wt, 0.0)), hs2wt)
+    den = 0.5 * n + hc2wt * c2 + hs2wt * s2
+    cterm = (cwt * c + swt * s_) ** 2 / np.maximum(den, 1e-12)
+    sterm = (cwt * s_ - swt * c) ** 2 / np.maximum(n - den, 1e-12)
+    pgram = 0.5 * (cterm + sterm)               # = scipy.signal.lombscargle
+
+    psd = 2.0 * pgram * span / n                # densité one-sided (s²/Hz)
+
+    mask_lf = (freqs >= LF_BAND[0]) & (freqs <= LF_BAND[1])
+    mask_hf = (freqs >= HF_BAND[0]) & (freqs <= HF_BAND[1])
+    lf = float(np.trapz(psd[mask_lf], freqs[mask_lf]))
+    hf = float(np.trapz(psd[mask_hf], freqs[mask_hf]))
+    peak_hf = float(freqs[mask_hf][np.argmax(psd[mask_hf])]) if np.any(mask_hf) else 0.0
+
+    return {"freq": freqs, "power": psd, "lf": lf, "hf": hf, "peak_hf": peak_hf}
+
+
+# ----------------------------------------------------------------------
+# Mode batch : spectres de toutes les fenêtres glissantes d'un enregistrement
+# ----------------------------------------------------------------------
+def compute_spectral_windows(rr_intervals_ms: Iterable[float],
+                             window_s: float = 300.0,
+                             hop_s: float = 1.0,
+                             chunk: int = 1024) -> Dict[str, np.ndarray]:
+    """
+    Welch sur chaque fenêtre glissante d'un enregistrement complet, en
+    une passe vectorisée (analyse hors ligne).
+
+    Le RR est rééchantillonné une seule fois à FS ; les fenêtres puis les
+    segments de Welch sont des vues (stride tricks) et toutes les PSD
+    d'un bloc de `chunk` fenêtres sont obtenues par un seul rfft 2-D.
+    Par fenêtre, le résultat est celui de compute_spectral : moyenne
+    retirée, Welch (Hann, nperseg=min(256, W), 50 % de recouvrement).
+
+    Returns
+    -------
+    dict :
+        "t_end"   : (n_win,)          fin de chaque fenêtre (s, t=0 au 1er battement)
+        "freq"    : (n_freq,)
+        "power"   : (n_win, n_freq)   PSD de Welch
+        "lf", "hf", "peak_hf" : (n_win,)
+    """
+    rr = np.asarray(rr_intervals_ms if isinstance(rr_intervals_ms, np.ndarray)
+                    else list(rr_intervals_ms), dtype=float) / 1000.0
+    empty = {
+        "t_end": np.array([]),
+        "freq": np.array([]),
+        "power": np.empty((0, 0)),
+        "lf": np.array([]),
+        "hf": np.array([]),
+        "peak_hf": np.array([]),
+    }
+    if rr.size < 10:
+        return empty
+
+    # 1) Rééchantillonnage unique de tout l'enregistrement
+    t = np.cumsum(rr) - rr[0]
+    y = np.interp(np.arange(0, t[-1], 1.0 / FS), t, rr)
+
+    W = int(round(window_s * FS))
+    H = max(1, int(round(hop_s * FS)))
+    if W < 8 or y.size < W:
+        return empty
+
+    # 2) Fenêtres = vues, sans copie
+    windows = np.lib.stride_tricks.sliding_window_view(y, W)[::H]
+    n_win = windows.shape[0]
+
+    nperseg = min(256, W)
+    step = nperseg - nperseg // 2
+    n_seg = (W - nperseg) // step + 1
+    win = np.hanning(nperseg + 1)[:-1]            # Hann périodique (= scipy)
+    scale = 1.0 / (FS * np.sum(win * win))
+    freqs = np.fft.rfftfreq(nperseg, 1.0 / FS)
+
+    power = np.empty((n_win, freqs.size))
+    for lo in range(0, n_win, chunk):
+        x = windows[lo:lo + chunk]
+        x = x - x.mean(axis=1, keepdims=True)     # detrend_signal par fenêtre
+        segs = np.lib.stride_tricks.sliding_window_view(x, nperseg, axis=1)[:, ::step][:, :n_seg]
+        segs = segs - segs.mean(axis=2, keepdims=True)   # detrend "constant" de Welch
+        spec = np.fft.rfft(segs * win, axis=2)
+        p = (spec.real ** 2 + spec.imag ** 2) * scale
+        if nperseg % 2 == 0:
+            p[..., 1:-1] *= 2.0
+        else:
+            p[..., 1:] *= 2.0
+        power[lo:lo + chunk] = p.mean(axis=1)
+
+    # 3) Puissances de bande + pic HF, vectorisés
+    mask_lf = (freqs >= LF_BAND[0]) & (freqs <= LF_BAND[1])
+    mask_hf = (freqs >= HF_BAND[0]) & (freqs <= HF_BAND[1])
+    lf = np.trapz(power[:, mask_lf], freqs[mask_lf], axis=1) if np.any(mask_lf) else np.zeros(n_win)
+    hf = np.trapz(power[:, mask_hf], freqs[mask_hf], axis=1) if np.any(mask_hf) else np.zeros(n_win)
+    if np.any(mask_hf):
+        peak_hf = freqs[mask_hf][np.argmax(power[:, mask_hf], axis=1)]
+    else:
+        peak_hf = np.zeros(n_win)
+
+    t_end = (np.arange(n_win) * H + W - 1) / FS
+
+    return {
+        "t_end": t_end,
+        "freq": freqs,
+        "power": power,
+        "lf": lf,
+        "hf": hf,
+        "peak_hf": peak_hf,
+    }
+
+
+# ----------------------------------------------------------------------
+# Mode streaming : DFT glissante sur les seules bandes LF / HF
+# ----------------------------------------------------------------------
+class SlidingBandPower:
+    """
+    Suivi LF / HF / pic HF par DFT glissante (sliding DFT).
+
+    Les RR sont rééchantillonnés à `fs` au fil de l'eau (interpolation
+    linéaire entre le battement précédent et le nouveau), puis chaque
+    échantillon met à jour récursivement les seuls bins couvrant
+    0.04–0.40 Hz :
+
+        X_k(n) = e^{j2πk/N} · (X_k(n-1) - x(n-N) + x(n))
+
+    Le fenêtrage de Hann est appliqué dans le domaine fréquentiel
+    (0.5·X_k - 0.25·X_{k-1} - 0.25·X_{k+1}) et la mise à l'échelle est
+    celle de Welch (densité, one-sided), donc les valeurs sont
+    comparables à compute_spectral sur un seul segment de N points.
+    Coût fixe par échantillon, indépendant de la longueur de session ;
+    lecture de spectrum() en O(nombre de bins).
+
+    Les bins sont recalculés exactement tous les N échantillons pour
+    éliminer la dérive de la récurrence.
+    """
+
+    def __init__(self, n: int = SDFT_N, fs: float = FS,
+                 lf_band=LF_BAND, hf_band=HF_BAND):
+        self.n = int(n)
+        self.fs = float(fs)
+        self.lf_band = lf_band
+        self.hf_band = hf_band
+
+        k_min = int(math.ceil(lf_band[0] * self.n / self.fs))
+        k_max = int(math.floor(hf_band[1] * self.n / self.fs))
+        # bins suivis : voisins inclus (requis par le Hann fréquentiel)
+        self._k = np.arange(max(k_min - 1, 0), k_max + 2)
+        self._twiddle = np.exp(2j * np.pi * self._k / self.n)
+        self._basis = np.exp(-2j * np.pi * np.outer(np.arange(self.n), self._k) / self.n)
+
+        self.freq = self._k[1:-1] * self.fs / self.n
+        self._lf_mask = (self.freq >= lf_band[0]) & (self.freq <= lf_band[1])
+        self._hf_mask = (self.freq >= hf_band[0]) & (self.freq <= hf_band[1])
+        # densité one-sided, fenêtre de Hann périodique : sum(w²) = 3N/8
+        self._scale = 2.0 / (self.fs * 0.375 * self.n)
+
+        self.reset()
+
+    # --------------------------------------------------------------
+    def reset(self) -> None:
+        self._x = np.zeros(self.n, dtype=float)
+        self._pos = 0
+        self._count = 0
+        self._X = np.zeros(self._k.size, dtype=complex)
+        self._t_last: Optional[float] = None
+        self._v_last = 0.0
+        self._t_next = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Vrai dès que la fenêtre de N échantillons est pleine."""
+        return self._count >= self.n
+
+    # --------------------------------------------------------------
+    def push_rr(self, rr_ms: float) -> None:
+        """Ajoute un RR (ms) et pousse les échantillons uniformes qu'il complète."""
+        v = float(rr_ms) / 1000.0
+        if self._t_last is None:
+            # même convention que compute_spectral : 1er battement à t = 0
+            self._t_last = 0.0
+            self._v_last = v
+            self.push_samples((v,))
+            self._t_next = 1.0 / self.fs
+            return
+
+        t_new = self._t_last + v
+        if self._t_next < t_new:
+            t_grid = np.arange(self._t_next, t_new, 1.0 / self.fs)
+            w = (t_grid - self._t_last) / (t_new - self._t_last)
+            self.push_samples(self._v_last + w * (v - self._v_last))
+            self._t_next = float(t_grid[-1]) + 1.0 / self.fs
+        self._t_last = t_new
+        self._v_last = v
+
+    def push_samples(self, samples) -> None:
+        """Ajoute des échantillons déjà uniformes (à fs)."""
+        for x in samples:
+            x = float(x)
+            old = self._x[self._pos]
+            self._x[self._pos] = x
+            self._pos = (self._pos + 1) % self.n
+            self._X = (self._X + (x - old)) * self._twiddle
+            self._count += 1
+            if self._pos == 0:
+                self._resync()
+
+    def _resync(self) -> None:
+        """Recalcul exact des bins sur la fenêtre (ordre chronologique)."""
+        window = np.roll(self._x, -self._pos)
+        self._X = window @ self._basis
+
+    # --------------------------------------------------------------
+    def spectrum(self) -> Dict[str, Optional[float]]:
+        """Même format que compute_spectral, restreint aux bandes LF/HF."""
+        if not self.ready:
+            return {"freq": None, "power": None, "lf": 0.0, "hf": 0.0, "peak_hf": 0.0}
+
+        X = self._X
+        xw = 0.5 * X[1:-1] - 0.25 * (X[:-2] + X[2:])
+        psd = self._scale * (xw.real ** 2 + xw.imag ** 2)
+
+        lf = float(np.trapz(psd[self._lf_mask], self.freq[self._lf_mask]))
+        hf = float(np.trapz(psd[self._hf_mask], self.freq[self._hf_mask]))
+        if np.any(self._hf_mask):
+            peak_hf = float(self.freq[self._hf_mask][np.argmax(psd[self._hf_mask])])
+        else:
+            peak_hf = 0.0
+
+        return {"freq": self.freq, "power": psd, "lf": lf, "hf": hf, "peak_hf": peak_hf}
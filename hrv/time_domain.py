@@ -1,15 +1,20 @@
+import math
+
 import numpy as np
-from typing import Iterable, Dict
+from typing import Iterable, Dict, Optional
+
+PNN_THRESHOLD_MS = 50.0
+
 
 def compute_time_domain(rr_ms: Iterable[float]) -> Dict[str, float]:
     """
-    Renvoie un dictionnaire {"sdnn": ..., "rmssd": ...}
+    Renvoie un dictionnaire {"sdnn", "rmssd", "pnn50", "mean_nn", "mean_hr"}
     conforme à ce qu'attend Processor.
     """
-    rr = np.asarray(list(rr_ms), dtype=float)
+    rr = np.asarray(rr_ms if isinstance(rr_ms, np.ndarray) else list(rr_ms), dtype=float)
 
     if rr.size < 2:
-        return {"sdnn": 0.0, "rmssd": 0.0}
+        return {"sdnn": 0.0, "rmssd": 0.0, "pnn50": 0.0, "mean_nn": 0.0, "mean_hr": 0.0}
 
     # SDNN (écart-type)
     sdnn = float(np.std(rr, ddof=1))
@@ -18,7 +23,135 @@ def compute_time_domain(rr_ms: Iterable[float]) -> Dict[str, float]:
     diff = np.diff(rr)
     if diff.size == 0:
         rmssd = 0.0
+        pnn50 = 0.0
     else:
         rmssd = float(np.sqrt(np.mean(diff * diff)))
+        pnn50 = float(100.0 * np.mean(np.abs(diff) > PNN_THRESHOLD_MS))
+
+    mean_nn = float(np.mean(rr))
+    mean_hr = 60000.0 / mean_nn if mean_nn > 0 else 0.0
+
+    return {"sdnn": sdnn, "rmssd": rmssd, "pnn50": pnn50,
+            "mean_nn": mean_nn, "mean_hr": mean_hr}
+
+
+class StreamingTimeDomain:
+    """
+    Statistiques temporelles sur fenêtre glissante, mises à jour en O(1)
+    par battement (Welford avec ajout / retrait).
+
+    Usage (une fenêtre FIFO) :
+        st.add(rr)                        # nouveau RR en fin de fenêtre
+        st.remove_oldest(rr_old, rr_next) # RR évincé + son successeur
+
+    Les sommes flottantes dérivent très lentement ; resync(window) recalcule
+    tout exactement (Processor l'appelle une fois par tour de fenêtre).
+    """
+
+    def __init__(self, pnn_threshold_ms: float = PNN_THRESHOLD_MS):
+        self.pnn_threshold_ms = float(pnn_threshold_ms)
+        self.clear()
+
+    # --------------------------------------------------------------
+    def clear(self) -> None:
+        self.n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._ssd = 0.0        # somme des carrés des différences successives
+        self._n_diff = 0
+        self._nn50 = 0
+        self._last: Optional[float] = None
+
+    def resync(self, rr_ms: Iterable[float]) -> None:
+        """Reconstruit l'état exact à partir de la fenêtre complète."""
+        rr = np.asarray(rr_ms, dtype=float)
+        self.clear()
+        self.n = int(rr.size)
+        if self.n == 0:
+            return
+        self._mean = float(np.mean(rr))
+        self._m2 = float(np.sum((rr - self._mean) ** 2))
+        diff = np.diff(rr)
+        self._ssd = float(np.sum(diff * diff))
+        self._n_diff = int(diff.size)
+        self._nn50 = int(np.count_nonzero(np.abs(diff) > self.pnn_threshold_ms))
+        self._last = float(rr[-1])
+
+    # --------------------------------------------------------------
+    def add(self, x: float) -> None:
+        """Ajoute un RR (ms) en fin de fenêtre."""
+        x = float(x)
+        self.n += 1
+        delta = x - self._mean
+        self._mean += delta / self.n
+        self._m2 += delta * (x - self._mean)
+
+        if self._last is not None:
+            d = x - self._last
+            self._ssd += d * d
+            self._n_diff += 1
+            if abs(d) > self.pnn_threshold_ms:
+                self._nn50 += 1
+        self._last = x
+
+    def remove_oldest(self, x_old: float, x_next: Optional[float]) -> None:
+        """
+        Retire le RR le plus ancien. x_next est le RR qui le suivait
+        (nouveau plus ancien), ou None si la fenêtre devient vide.
+        """
+        if self.n <= 1:
+            self.clear()
+            return
+
+        x_old = float(x_old)
+        delta = x_old - self._mean
+        self._mean -= delta / (self.n - 1)
+        self._m2 -= delta * (x_old - self._mean)
+        self._m2 = max(0.0, self._m2)
+        self.n -= 1
+
+        if x_next is not None and self._n_diff > 0:
+            d = float(x_next) - x_old
+            self._ssd = max(0.0, self._ssd - d * d)
+            self._n_diff -= 1
+            if abs(d) > self.pnn_threshold_ms:
+                self._nn50 -= 1
+
+    # --------------------------------------------------------------
+    @property
+    def mean_nn(self) -> float:
+        return self._mean if self.n > 0 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Écart-type population (ddof=0)."""
+        return math.sqrt(self._m2 / self.n) if self.n > 0 else 0.0
+
+    @property
+    def sdnn(self) -> float:
+        """Écart-type échantillon (ddof=1), comme compute_time_domain."""
+        return math.sqrt(self._m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    @property
+    def rmssd(self) -> float:
+        return math.sqrt(self._ssd / self._n_diff) if self._n_diff > 0 else 0.0
+
+    @property
+    def pnn50(self) -> float:
+        return 100.0 * self._nn50 / self._n_diff if self._n_diff > 0 else 0.0
+
+    @property
+    def mean_hr(self) -> float:
+        return 60000.0 / self._mean if self.n > 0 and self._mean > 0 else 0.0
 
-    return {"sdnn": sdnn, "rmssd": rmssd}
+    def as_dict(self) -> Dict[str, float]:
+        """Même format que compute_time_domain."""
+        if self.n < 2:
+            return {"sdnn": 0.0, "rmssd": 0.0, "pnn50": 0.0, "mean_nn": 0.0, "mean_hr": 0.0}
+        return {
+            "sdnn": self.sdnn,
+            "rmssd": self.rmssd,
+            "pnn50": self.pnn50,
+            "mean_nn": self.mean_nn,
+            "mean_hr": self.mean_hr,
+        }
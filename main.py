@@ -1,10 +1,13 @@
 # main.py
 
+from app.config import AppConfig
 from app.main_window import MainWindow
+from core.debug import setup_logger
 from PySide6 import QtWidgets
 
 
 def main():
+    setup_logger(mode=AppConfig.LOG_MODE, log_file=AppConfig.LOG_FILE)
     app = QtWidgets.QApplication([])
     w = MainWindow()   # plus d'arguments !
     w.show()
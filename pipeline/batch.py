@@ -0,0 +1,214 @@
+# pipeline/batch.py
+"""
+Analyse batch (sans interface) de sessions RR enregistrées.
+
+Pour chaque fichier RR d'un répertoire, rejoue les RR dans un Processor
+et, tous les `hop` battements, calcule une ligne de synthèse :
+HRV (Processor), respiration (EDRPremium + Welch EDR), Sync% et score
+global. Les fichiers sont répartis sur un ProcessPoolExecutor.
+
+Usage :
+    python -m pipeline.batch SESSIONS_DIR -o resume.csv [--window 300]
+           [--hop 10] [--jobs N] [--pattern "*.txt"]
+
+Formats de fichier acceptés (texte, '#' = commentaire, en-têtes ignorés) :
+    - une colonne  : RR (ms) ; les temps sont reconstruits par cumul
+    - deux colonnes: temps (s), RR (ms) ; séparateur virgule, ';' ou blanc
+    - *.rrb        : enregistrement binaire (pipeline.recording), lu par memmap
+
+Ce module n'importe pas PySide6.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from pipeline.processor import Processor
+from pipeline.recording import RECORDING_SUFFIX, read_recording
+from pipeline.summary import METRIC_COLUMNS, window_metrics
+
+COLUMNS = ["file", "window", "t_end_s", "n_beats"] + METRIC_COLUMNS
+
+_SPLIT = re.compile(r"[,;\s]+")
+
+
+# ----------------------------------------------------------------------
+# Lecture des fichiers RR
+# ----------------------------------------------------------------------
+def load_rr_file(path) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Charge un fichier RR texte, ou un enregistrement binaire .rrb
+    (vues memmap sans copie).
+
+    Returns
+    -------
+    (t, rr_ms) : np.ndarray
+        Temps (s) de chaque battement et intervalles RR (ms).
+    """
+    if Path(path).suffix == RECORDING_SUFFIX:
+        return read_recording(path)
+
+    t_col: List[float] = []
+    rr_col: List[float] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            fields = [x for x in _SPLIT.split(line) if x]
+            try:
+                values = [float(x) for x in fields]
+            except ValueError:
+                continue  # en-tête
+            if len(values) == 1:
+                rr_col.append(values[0])
+            elif len(values) >= 2:
+                t_col.append(values[0])
+                rr_col.append(values[1])
+
+    rr = np.asarray(rr_col, dtype=float)
+    if len(t_col) == len(rr_col) and t_col:
+        t = np.asarray(t_col, dtype=float)
+    else:
+        t = np.cumsum(rr) / 1000.0
+    return t, rr
+
+
+# ----------------------------------------------------------------------
+# Analyse d'un fichier
+# ----------------------------------------------------------------------
+def analyze_rr(name: str, t: np.ndarray, rr: np.ndarray,
+               window: int = 300, hop: int = 10) -> List[Dict[str, object]]:
+    """Rejoue une série RR et produit une ligne de synthèse tous les `hop` battements."""
+    from edr.edr_premium import EDRPremium
+
+    processor = Processor(max_window=window)
+    edr = EDRPremium()
+    rows: List[Dict[str, object]] = []
+
+    for i, x in enumerate(rr):
+        processor.push_rr(x, t[i])
+        n = i + 1
+        if n < window and n != len(rr):
+            continue
+        if (n - window) % hop != 0 and n != len(rr):
+            continue
+
+        state = processor.compute_state()
+        lo = max(0, n - window)
+        t_win = t[lo:n]
+        rr_win = rr[lo:n]
+
+        row = {
+            "file": name,
+            "window": len(rows),
+            "t_end_s": float(t_win[-1]),
+            "n_beats": int(rr_win.size),
+        }
+        row.update(window_metrics(processor, state, edr, t_win, rr_win))
+        rows.append(row)
+    return rows
+
+
+def analyze_file(path, window: int = 300, hop: int = 10) -> List[Dict[str, object]]:
+    """Point d'entrée d'un worker : un fichier → ses lignes de synthèse."""
+    t, rr = load_rr_file(path)
+    if rr.size == 0:
+        return []
+    return analyze_rr(Path(path).name, t, rr, window=window, hop=hop)
+
+
+def _analyze_job(args):
+    return analyze_file(*args)
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+def run_batch(files, out, window: int = 300, hop: int = 10, jobs: int | None = None,
+              failed: List[Tuple[str, str]] | None = None) -> int:
+    """
+    Analyse `files` sur `jobs` processus et écrit le CSV dans `out`. Retourne le nb de lignes.
+
+    Un fichier en échec (illisible, mal formé…) est signalé sur stderr et
+    ignoré, les autres sont analysés ; (fichier, erreur) est ajouté à
+    `failed` si la liste est fournie.
+    """
+    writer = csv.DictWriter(out, fieldnames=COLUMNS)
+    writer.writeheader()
+
+    def report(path, err):
+        msg = f"{type(err).__name__}: {err}"
+        print(f"⚠️ {path} ignoré : {msg}", file=sys.stderr)
+        if failed is not None:
+            failed.append((str(path), msg))
+
+    n_rows = 0
+    jobs = jobs or os.cpu_count() or 1
+    tasks = [(str(f), window, hop) for f in files]
+    if jobs <= 1:
+        for task in tasks:
+            try:
+                rows = _analyze_job(task)
+            except Exception as e:
+                report(task[0], e)
+                continue
+            writer.writerows(rows)
+            n_rows += len(rows)
+        return n_rows
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # une tâche par fichier : résultats écrits dans l'ordre des fichiers
+        futures = [pool.submit(_analyze_job, task) for task in tasks]
+        for task, fut in zip(tasks, futures):
+            try:
+                rows = fut.result()
+            except Exception as e:
+                report(task[0], e)
+                continue
+            writer.writerows(rows)
+            n_rows += len(rows)
+    return n_rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pipeline.batch",
+        description="Analyse batch de sessions RR enregistrées (sans interface).",
+    )
+    parser.add_argument("directory", help="répertoire contenant les fichiers RR")
+    parser.add_argument("-o", "--output", default="-", help="fichier CSV de sortie (défaut : stdout)")
+    parser.add_argument("--pattern", default="*.txt", help="motif des fichiers RR (défaut : *.txt)")
+    parser.add_argument("--window", type=int, default=300, help="taille de fenêtre en battements")
+    parser.add_argument("--hop", type=int, default=10, help="pas entre deux fenêtres (battements)")
+    parser.add_argument("--jobs", type=int, default=None, help="nb de processus (défaut : nb de cœurs)")
+    args = parser.parse_args(argv)
+
+    files = sorted(p for p in Path(args.directory).glob(args.pattern) if p.is_file())
+    if not files:
+        print(f"Aucun fichier '{args.pattern}' dans {args.directory}", file=sys.stderr)
+        return 1
+
+    failed: List[Tuple[str, str]] = []
+    if args.output == "-":
+        n = run_batch(files, sys.stdout, args.window, args.hop, args.jobs, failed)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as out:
+            n = run_batch(files, out, args.window, args.hop, args.jobs, failed)
+
+    print(f"{len(files)} fichier(s), {n} fenêtre(s)"
+          + (f", {len(failed)} en échec" if failed else ""), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+# pipeline/headless.py
+"""
+Runtime sans interface : source RR → Processor → EDR → score → sink.
+
+Boucle asyncio simple, sans QApplication ni QTimer : utilisable comme
+démon longue durée sur un serveur. Ce module n'importe ni PySide6 ni
+Matplotlib.
+
+Cadences (temps du signal, pas de l'horloge murale, pour qu'un rejeu
+accéléré donne les mêmes résultats qu'un enregistrement en direct) :
+    - domaine temporel : à chaque battement
+    - spectre / EDR / Sync% / score : toutes les `heavy_interval_s` secondes
+    - une ligne écrite dans le sink tous les `every` battements
+
+Usage :
+    python -m pipeline.headless [--source sim|ble|FICHIER] [-o etats.jsonl]
+           [--format jsonl|csv] [--every 1] [--window 300 | --window-s 120]
+           [--speed 1.0] [--beats N] [--record session.rrb] [--trace trace.json]
+
+    --speed 0 : rejeu le plus rapide possible (fichier ou simulation)
+    --record  : enregistre les RR reçus (pipeline.recording, .rrb)
+    --trace   : spans du pipeline au format Chrome trace-event (core.debug.TRACER)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import math
+import signal
+import sys
+from typing import AsyncIterator, Callable, Dict, Iterator, NamedTuple, Optional, Union
+
+import numpy as np
+
+from ble.exceptions import BLEError
+from core.debug import TRACER
+from edr.edr_premium import EDRPremium
+from pipeline.processor import Processor
+from pipeline.summary import METRIC_COLUMNS, RESP_COLUMNS, hrv_metrics, resp_metrics
+
+COLUMNS = ["t", "n_beats"] + METRIC_COLUMNS
+
+
+class RRSample(NamedTuple):
+    t: float        # instant du battement (s)
+    rr_ms: float    # intervalle RR (ms)
+
+
+# ----------------------------------------------------------------------
+# Sources RR (itérateurs asynchrones de RRSample)
+# ----------------------------------------------------------------------
+def rr_model(base_hr_bpm: float = 75.0, resp_cpm: float = 6.0,
+             rsa_ms: float = 50.0, noise_ms: float = 5.0,
+             seed: Optional[int] = None) -> Iterator[RRSample]:
+    """
+    Modèle RR synthétique (sans fin, sans cadence) : base + RSA
+    sinusoïdale à resp_cpm + bruit gaussien. Partagé par simulated_rr
+    et pipeline.replay.synthetic_rr.
+    """
+    rng = np.random.default_rng(seed)
+    base_rr = 60000.0 / base_hr_bpm
+    w = 2 * math.pi * resp_cpm / 60.0
+    t = 0.0
+    while True:
+        rr = base_rr + rsa_ms * math.sin(w * t) + rng.normal(0.0, noise_ms)
+        t += rr / 1000.0
+        yield RRSample(t, float(rr))
+
+
+async def simulated_rr(base_hr_bpm: float = 75.0, resp_cpm: float = 6.0,
+                       rsa_ms: float = 50.0, noise_ms: float = 5.0,
+                       speed: float = 1.0, limit: Optional[int] = None,
+                       seed: Optional[int] = None) -> AsyncIterator[RRSample]:
+    """
+    RR simulés (rr_model) cadencés : speed=1 : temps réel ;
+    speed=0 : aussi vite que possible.
+    """
+    model = rr_model(base_hr_bpm, resp_cpm, rsa_ms, noise_ms, seed)
+    for sample in model if limit is None else itertools.islice(model, limit):
+        await _pace(sample.rr_ms / 1000.0, speed)
+        yield sample
+
+
+async def file_rr(path, speed: float = 0.0) -> AsyncIterator[RRSample]:
+    """Rejoue un fichier RR (formats de pipeline.batch.load_rr_file)."""
+    from pipeline.batch import load_rr_file
+
+    t, rr = load_rr_file(path)
+    prev = None
+    for ti, x in zip(t.tolist(), rr.tolist()):
+        await _pace(0.0 if prev is None else ti - prev, speed)
+        prev = ti
+        yield RRSample(ti, x)
+
+
+async def ble_rr(address: Optional[str] = None) -> AsyncIterator[RRSample]:
+    """Capteur réel (notifications 0x2A37 via bleak), battements par lots."""
+    from ble.bleak_backend import BleakHRBackend
+
+    backend = BleakHRBackend(address=address)
+    async for batch in backend.batches():
+        for t, rr in zip(batch.beat_times().tolist(), batch.rr_ms.tolist()):
+            yield RRSample(t, rr)
+
+
+async def recorded(source: AsyncIterator[RRSample], recorder) -> AsyncIterator[RRSample]:
+    """Laisse passer la source en ajoutant chaque battement à un RRRecorder."""
+    async for sample in source:
+        recorder.append(sample.t, sample.rr_ms)
+        yield sample
+
+
+async def _pace(dt_s: float, speed: float) -> None:
+    if speed > 0:
+        await asyncio.sleep(max(0.0, dt_s) / speed)
+    else:
+        await asyncio.sleep(0)      # laisse respirer la boucle
+
+
+# ----------------------------------------------------------------------
+# Sinks
+# ----------------------------------------------------------------------
+class JsonlSink:
+    """Une ligne JSON par état."""
+
+    def __init__(self, out):
+        self._own = isinstance(out, str)
+        self._f = open(out, "w", encoding="utf-8") if self._own else out
+
+    def write(self, row: Dict[str, object]) -> None:
+        self._f.write(json.dumps(row, separators=(",", ":")) + "\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        if self._own:
+            self._f.close()
+
+
+class CsvSink:
+    """CSV avec en-tête COLUMNS."""
+
+    def __init__(self, out):
+        self._own = isinstance(out, str)
+        self._f = open(out, "w", newline="", encoding="utf-8") if self._own else out
+        self._writer = csv.DictWriter(self._f, fieldnames=COLUMNS)
+        self._writer.writeheader()
+
+    def write(self, row: Dict[str, object]) -> None:
+        self._writer.writerow(row)
+        self._f.flush()
+
+    def close(self) -> None:
+        if self._own:
+            self._f.close()
+
+
+Sink = Union[JsonlSink, CsvSink, Callable[[Dict[str, object]], object]]
+
+
+# ----------------------------------------------------------------------
+# Analyse d'un flux RR
+# ----------------------------------------------------------------------
+class BeatAnalyzer:
+    """
+    Processor + EDRPremium (streaming) + score d'un flux RR, sans boucle :
+    process(t, rr_ms) renvoie la ligne à publier ou None. Partagé par
+    HeadlessRunner (un flux) et pipeline.hub (un analyseur par appareil).
+
+    window : fenêtre en battements ; window_s / hrv_window_s : fenêtres
+    en secondes (voir Processor), window devient alors la capacité.
+    """
+
+    def __init__(self, window: int = 300, every: int = 1, heavy_interval_s: float = 1.0,
+                 spectral_mode: str = "welch", welch_edr: bool = False,
+                 window_s: Optional[float] = None, hrv_window_s: Optional[float] = None):
+        self.every = max(1, int(every))
+        self.heavy_interval_s = float(heavy_interval_s)
+        self.welch_edr = welch_edr
+
+        if window_s is not None:
+            window = max(window, math.ceil(window_s * Processor.MAX_HR_BPM / 60.0))
+        self.processor = Processor(max_window=window, spectral_mode=spectral_mode,
+                                   window_s=window_s, hrv_window_s=hrv_window_s)
+        self.edr = EDRPremium(streaming=True)
+        self._next_heavy_t = None
+        self._resp = {c: "" for c in RESP_COLUMNS}
+
+        self.beats = 0
+        self.heavy_runs = 0
+
+    def stats(self) -> Dict[str, Dict[str, dict]]:
+        """Durées par étage : {"processor": {...}, "edr": {...}} (core.debug.StageTimings)."""
+        return {"processor": self.processor.stats(), "edr": self.edr.timings.stats()}
+
+    def process(self, t: float, rr_ms: float) -> Optional[Dict[str, object]]:
+        """Traite un battement ; renvoie la ligne à écrire ou None."""
+        self.processor.push_rr(rr_ms, t)
+        self.beats += 1
+
+        heavy = self._next_heavy_t is None or t >= self._next_heavy_t
+        if heavy:
+            self._next_heavy_t = t + self.heavy_interval_s
+        elif self.beats % self.every != 0:
+            return None
+
+        state = self.processor.compute_state(heavy=heavy)
+        if heavy:
+            self.heavy_runs += 1
+            # EDR en streaming : suit chaque appel, on lui passe la fenêtre
+            self._resp = resp_metrics(self.processor, state, self.edr,
+                                      self.processor.rr_times, state.rr_list,
+                                      welch=self.welch_edr)
+
+        if self.beats % self.every != 0:
+            return None
+        row = {"t": float(t), "n_beats": int(state.rr_list.size)}
+        row.update(hrv_metrics(state))
+        row.update(self._resp)
+        return row
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+class HeadlessRunner:
+    """
+    Relie une source RR asynchrone à un sink (objet .write(row) ou
+    simple callable) à travers un BeatAnalyzer.
+    """
+
+    def __init__(self, source: AsyncIterator[RRSample], sink: Sink, **analyzer_kw):
+        self.source = source
+        self._write = sink.write if hasattr(sink, "write") else sink
+        self.analyzer = BeatAnalyzer(**analyzer_kw)
+        self.rows = 0
+        self._stop = asyncio.Event()
+        self._waiting: Optional[asyncio.Task] = None    # tâche en attente de la source
+
+    @property
+    def processor(self) -> Processor:
+        return self.analyzer.processor
+
+    @property
+    def beats(self) -> int:
+        return self.analyzer.beats
+
+    @property
+    def heavy_runs(self) -> int:
+        return self.analyzer.heavy_runs
+
+    # --------------------------------------------------------------
+    def stop(self) -> None:
+        """Arrêt propre après le battement en cours, ou immédiat si la source est muette."""
+        self._stop.set()
+        if self._waiting is not None:
+            # en attente du battement suivant (ceinture muette ou
+            # déconnectée) : on interrompt l'attente
+            self._waiting.cancel()
+
+    async def run(self) -> int:
+        """Consomme la source jusqu'à épuisement ou stop() ; renvoie le nb de lignes."""
+        task = asyncio.current_task()
+        it = self.source.__aiter__()
+        try:
+            while not self._stop.is_set():
+                self._waiting = task
+                try:
+                    sample = await it.__anext__()
+                except StopAsyncIteration:
+                    break
+                except asyncio.CancelledError:
+                    if not self._stop.is_set():
+                        raise
+                    if hasattr(task, "uncancel"):   # Python ≥ 3.11
+                        task.uncancel()
+                    break
+                finally:
+                    self._waiting = None
+                row = self.analyzer.process(sample.t, sample.rr_ms)
+                if row is not None:
+                    self._write(row)
+                    self.rows += 1
+        finally:
+            aclose = getattr(it, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        return self.rows
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+async def _amain(args) -> int:
+    if args.source == "sim":
+        source = simulated_rr(args.hr, args.cpm, speed=args.speed, limit=args.beats)
+    elif args.source == "ble":
+        source = ble_rr(args.address)
+    else:
+        source = file_rr(args.source, speed=args.speed)
+
+    recorder = None
+    if args.record:
+        from pipeline.recording import RRRecorder
+
+        recorder = RRRecorder(args.record)
+        source = recorded(source, recorder)
+
+    out = sys.stdout if args.output == "-" else args.output
+    sink = CsvSink(out) if args.format == "csv" else JsonlSink(out)
+    runner = HeadlessRunner(source, sink, window=args.window, every=args.every,
+                            window_s=args.window_s, hrv_window_s=args.hrv_window_s,
+                            heavy_interval_s=args.heavy_interval,
+                            spectral_mode=args.spectral_mode, welch_edr=args.welch_edr)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, runner.stop)
+        except (NotImplementedError, RuntimeError):
+            pass    # Windows : Ctrl+C lève KeyboardInterrupt
+
+    if args.trace:
+        TRACER.enable()
+    try:
+        await runner.run()
+    finally:
+        sink.close()
+        if recorder is not None:
+            recorder.close()
+        if args.trace:
+            TRACER.disable()
+            TRACER.dump(args.trace)
+    print(f"{runner.beats} battement(s), {runner.rows} état(s)", file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pipeline.headless",
+        description="Pipeline HRV / EDR sans interface (asyncio).",
+    )
+    parser.add_argument("--source", default="sim",
+                        help="'sim', 'ble' (capteur 0x2A37) ou fichier RR à rejouer")
+    parser.add_argument("--address", default=None, help="ble : adresse du capteur (défaut : scan)")
+    parser.add_argument("-o", "--output", default="-", help="sortie (défaut : stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--every", type=int, default=1, help="une ligne tous les N battements")
+    parser.add_argument("--window", type=int, default=300, help="fenêtre en battements")
+    parser.add_argument("--window-s", type=float, default=None,
+                        help="fenêtre RR en secondes (remplace --window)")
+    parser.add_argument("--hrv-window-s", type=float, default=None,
+                        help="fenêtre du domaine temporel en secondes")
+    parser.add_argument("--heavy-interval", type=float, default=1.0,
+                        help="période (s) du spectre / EDR / score")
+    parser.add_argument("--spectral-mode", choices=Processor.SPECTRAL_MODES, default="welch")
+    parser.add_argument("--welch-edr", action="store_true", help="ajoute l'estimation Welch EDR")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="1 = temps réel, 0 = le plus vite possible "
+                             "(défaut : 1 en simulation, 0 pour un fichier)")
+    parser.add_argument("--record", default=None, metavar="FICHIER.rrb",
+                        help="enregistre les RR reçus (binaire, relu par memmap)")
+    parser.add_argument("--trace", default=None, metavar="FICHIER.json",
+                        help="trace Chrome (chrome://tracing, Perfetto) écrite à la fin")
+    parser.add_argument("--beats", type=int, default=None, help="simulation : nb de battements")
+    parser.add_argument("--hr", type=float, default=75.0, help="simulation : FC de base (bpm)")
+    parser.add_argument("--cpm", type=float, default=6.0, help="simulation : respiration (cpm)")
+    args = parser.parse_args(argv)
+    if args.speed is None:
+        args.speed = 1.0 if args.source == "sim" else 0.0
+
+    try:
+        return asyncio.run(_amain(args))
+    except KeyboardInterrupt:
+        return 130
+    except BLEError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
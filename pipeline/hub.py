@@ -0,0 +1,234 @@
+# pipeline/hub.py
+"""
+Hub multi-ceintures : N capteurs RR sur une seule boucle asyncio.
+
+- chaque appareil a sa source RR (simulated_rr, ble_rr, file_rr…) et son
+  propre BeatAnalyzer (Processor + EDR + score) ;
+- le calcul est réparti sur un pool de workers :
+    "thread"  : ThreadPoolExecutor partagé (NumPy / SciPy relâchent le GIL
+                sur les gros calculs) ;
+    "process" : K processus, chaque appareil épinglé sur l'un d'eux
+                (l'état de l'analyseur reste dans son processus) ;
+- pour un appareil, les battements sont traités dans l'ordre ; ceux qui
+  arrivent pendant un calcul sont envoyés ensemble au suivant ; au-delà
+  de MAX_PENDING battements en attente, la lecture de la source est
+  suspendue (rejeu de fichier ou simulation plus rapides que le calcul) ;
+- les états sont publiés sur un StateBus partagé (abonnés + dernier
+  état par appareil) ; la latence battement → publication est mesurée.
+
+Ce module n'importe pas PySide6. Test de charge : python -m tests.load_hub
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.circular_buffer import ArrayRingBuffer
+from pipeline.headless import BeatAnalyzer, RRSample
+
+Row = Dict[str, object]
+LATENCY_SAMPLES = 2048      # latences gardées par appareil
+MAX_PENDING = 256           # battements en attente avant de suspendre la lecture
+
+
+# ----------------------------------------------------------------------
+# Bus d'états
+# ----------------------------------------------------------------------
+class StateBus:
+    """Dernier état par appareil + abonnés appelés à chaque publication."""
+
+    def __init__(self):
+        self._latest: Dict[str, Row] = {}
+        self._subscribers: List[Callable[[str, Row], object]] = []
+        self.published = 0
+
+    def subscribe(self, callback: Callable[[str, Row], object]) -> Callable[[], None]:
+        """callback(device_id, row) ; renvoie la fonction de désabonnement."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def publish(self, device_id: str, row: Row) -> None:
+        self._latest[device_id] = row
+        self.published += 1
+        for cb in list(self._subscribers):
+            cb(device_id, row)
+
+    def latest(self, device_id: str) -> Optional[Row]:
+        return self._latest.get(device_id)
+
+    def snapshot(self) -> Dict[str, Row]:
+        """Copie du dernier état de chaque appareil."""
+        return dict(self._latest)
+
+
+# ----------------------------------------------------------------------
+# Workers
+# ----------------------------------------------------------------------
+_ANALYZERS: Dict[str, BeatAnalyzer] = {}    # état propre à chaque processus
+
+
+def _process_beats(device_id: str, samples: List[Tuple[float, float]],
+                   analyzer_kw: dict) -> List[Optional[Row]]:
+    """Exécuté dans un processus worker : analyseur de l'appareil en mémoire locale."""
+    analyzer = _ANALYZERS.get(device_id)
+    if analyzer is None:
+        analyzer = _ANALYZERS[device_id] = BeatAnalyzer(**analyzer_kw)
+    return [analyzer.process(t, rr) for t, rr in samples]
+
+
+class _Device:
+    __slots__ = ("device_id", "source", "analyzer", "executor", "pending",
+                 "wakeup", "drained", "latency", "beats", "rows", "error", "reader")
+
+    def __init__(self, device_id: str, source: AsyncIterator[RRSample]):
+        self.device_id = device_id
+        self.source = source
+        self.analyzer: Optional[BeatAnalyzer] = None
+        self.executor: Optional[Executor] = None
+        self.pending: List[Tuple[float, float, float]] = []   # (t, rr, reçu)
+        self.wakeup = asyncio.Event()
+        self.drained = asyncio.Event()
+        self.latency = ArrayRingBuffer(LATENCY_SAMPLES)
+        self.beats = 0
+        self.rows = 0
+        self.error: Optional[BaseException] = None
+        self.reader: Optional[asyncio.Task] = None
+
+
+class Hub:
+    """N appareils, une boucle asyncio, calcul sur un pool de workers."""
+
+    MODES = ("thread", "process")
+
+    def __init__(self, bus: Optional[StateBus] = None, mode: str = "thread",
+                 workers: Optional[int] = None, **analyzer_kw):
+        if mode not in self.MODES:
+            raise ValueError(f"mode inconnu : {mode!r}")
+        self.bus = bus or StateBus()
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.analyzer_kw = analyzer_kw
+        self._devices: Dict[str, _Device] = {}
+        self._executors: List[Executor] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # --------------------------------------------------------------
+    def add_device(self, device_id: str, source: AsyncIterator[RRSample]) -> None:
+        if device_id in self._devices:
+            raise ValueError(f"appareil déjà enregistré : {device_id!r}")
+        self._devices[device_id] = _Device(device_id, source)
+
+    def device_ids(self) -> List[str]:
+        return list(self._devices)
+
+    def stop(self) -> None:
+        """Arrête la lecture des sources ; les battements reçus sont traités (thread de la boucle)."""
+        for dev in self._devices.values():
+            if dev.reader is not None:
+                dev.reader.cancel()
+
+    # --------------------------------------------------------------
+    async def run(self) -> Dict[str, dict]:
+        """Tourne jusqu'à épuisement des sources ou stop() ; renvoie stats()."""
+        self._loop = asyncio.get_running_loop()
+        self._start_pool()
+        try:
+            tasks = []
+            for dev in self._devices.values():
+                dev.reader = asyncio.create_task(self._read(dev))
+                tasks += [dev.reader, asyncio.create_task(self._compute(dev))]
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for ex in self._executors:
+                ex.shutdown(wait=True)
+            self._executors.clear()
+        return self.stats()
+
+    def _start_pool(self) -> None:
+        devices = list(self._devices.values())
+        if self.mode == "thread":
+            pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hub")
+            self._executors = [pool]
+            for dev in devices:
+                dev.executor = pool
+                dev.analyzer = BeatAnalyzer(**self.analyzer_kw)
+        else:
+            # un processus par shard, appareils répartis à tour de rôle
+            n = max(1, min(self.workers, len(devices)))
+            self._executors = [ProcessPoolExecutor(max_workers=1) for _ in range(n)]
+            for i, dev in enumerate(devices):
+                dev.executor = self._executors[i % n]
+
+    async def _read(self, dev: _Device) -> None:
+        """Lecture de la source : ne fait qu'empiler (t, rr, instant de réception)."""
+        try:
+            async for sample in dev.source:
+                dev.pending.append((sample.t, sample.rr_ms, self._loop.time()))
+                dev.beats += 1
+                dev.wakeup.set()
+                if len(dev.pending) >= MAX_PENDING:
+                    dev.drained.clear()
+                    await dev.drained.wait()
+        except Exception as e:      # une ceinture en erreur n'arrête pas les autres
+            dev.error = e
+        finally:
+            dev.source = None
+            dev.wakeup.set()
+
+    async def _compute(self, dev: _Device) -> None:
+        """Battements en attente → worker (dans l'ordre) → bus."""
+        while True:
+            await dev.wakeup.wait()
+            dev.wakeup.clear()
+            while dev.pending:
+                batch, dev.pending = dev.pending, []
+                dev.drained.set()
+                try:
+                    rows = await self._submit(dev, [(t, rr) for t, rr, _ in batch])
+                except Exception as e:
+                    # analyse en échec : on coupe cet appareil seulement
+                    dev.error = e
+                    if dev.reader is not None:
+                        dev.reader.cancel()
+                    return
+                now = self._loop.time()
+                for (_, _, received), row in zip(batch, rows):
+                    if row is not None:
+                        dev.latency.append((now - received) * 1000.0)
+                        dev.rows += 1
+                        self.bus.publish(dev.device_id, row)
+            if dev.source is None and not dev.pending:
+                return
+
+    def _submit(self, dev: _Device, samples: List[Tuple[float, float]]):
+        if self.mode == "thread":
+            analyzer = dev.analyzer
+            fn = lambda: [analyzer.process(t, rr) for t, rr in samples]  # noqa: E731
+            return self._loop.run_in_executor(dev.executor, fn)
+        return self._loop.run_in_executor(dev.executor, _process_beats,
+                                          dev.device_id, samples, self.analyzer_kw)
+
+    # --------------------------------------------------------------
+    def latencies(self, device_id: str) -> np.ndarray:
+        """Dernières latences battement → publication (ms) d'un appareil."""
+        return self._devices[device_id].latency.view()
+
+    def stats(self) -> Dict[str, dict]:
+        """Par appareil : battements, états publiés, latence (ms) p50 / p95 / max."""
+        out = {}
+        for dev in self._devices.values():
+            lat = self.latencies(dev.device_id)
+            out[dev.device_id] = {
+                "beats": dev.beats,
+                "rows": dev.rows,
+                "latency_p50_ms": float(np.percentile(lat, 50)) if lat.size else 0.0,
+                "latency_p95_ms": float(np.percentile(lat, 95)) if lat.size else 0.0,
+                "latency_max_ms": float(lat.max()) if lat.size else 0.0,
+                "error": str(dev.error) if dev.error else None,
+            }
+        return out
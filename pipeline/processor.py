@@ -1,10 +1,14 @@
 # pipeline/processor.py
 
+import math
+
 import numpy as np
 from dataclasses import dataclass
 
-from hrv.time_domain import compute_time_domain
-from hrv.spectral import compute_spectral
+from core.circular_buffer import ArrayRingBuffer
+from core.debug import TRACER, StageTimings
+from hrv.time_domain import StreamingTimeDomain
+from hrv.spectral import compute_spectral, compute_spectral_lomb, SlidingBandPower
 
 
 # ----------------------------------------------------------------------
@@ -12,7 +16,7 @@ from hrv.spectral import compute_spectral
 # ----------------------------------------------------------------------
 @dataclass
 class ProcessorState:
-    rr_list: list
+    rr_list: np.ndarray
     rmssd: float
     lf: float
     hf: float
@@ -26,28 +30,226 @@ class ProcessorState:
     resp_signal: np.ndarray = None
     resp_time: np.ndarray = None
 
+    # Domaine temporel complémentaire
+    sdnn: float = 0.0
+    pnn50: float = 0.0
+    mean_nn: float = 0.0
+    mean_hr: float = 0.0
+
 
 # ----------------------------------------------------------------------
 # Processor : cœur du traitement HRV
 # ----------------------------------------------------------------------
 class Processor:
-    def __init__(self, max_window=300):  # ~ 300 RR ≈ 4 minutes
-        self.rr_list = []
+    """
+    spectral_mode :
+        "welch" : Welch complet sur la fenêtre à chaque compute_state (défaut)
+        "sdft"  : LF / HF / pic HF suivis par DFT glissante à chaque RR ;
+                  compute_state ne fait plus que lire les bins (freq/power
+                  limités à 0.04–0.40 Hz)
+        "lomb"  : Lomb–Scargle rapide sur les instants des battements,
+                  sans interpolation à 4 Hz (freq/power limités à 0.04–0.40 Hz)
+
+    Mémoïsation : chaque push_rr incrémente `generation`. compute_state
+    renvoie l'état en cache tant que la génération n'a pas bougé, et les
+    étages coûteux (spectre, RSA) ont leur propre cache : avec
+    spectral_every=N, le spectre n'est recalculé que tous les N RR alors
+    que le domaine temporel suit chaque battement.
+
+    compute_state(heavy=False) ne rafraîchit que le domaine temporel et
+    reprend les derniers spectre / RSA calculés : l'appelant cadence
+    lui-même les étages coûteux (ex. 1 Hz via core.scheduler).
+
+    Fenêtres : push_rr(rr, t) date chaque battement (t = fin de
+    l'intervalle, s ; sans t, les RR sont cumulés depuis le précédent).
+    window_s limite la fenêtre RR (spectre, RSA, rr_list) aux battements
+    des window_s dernières secondes, hrv_window_s celle du domaine
+    temporel (RMSSD, SDNN, pNN50, HR) — une durée fixe quel que soit le
+    rythme cardiaque. max_window reste la capacité de l'anneau (par
+    défaut assez grande pour window_s à MAX_HR_BPM) ; sans window_s, la
+    fenêtre est de max_window battements comme avant. Les bornes sont
+    trouvées par recherche dichotomique sur les instants (croissants).
+
+    Instrumentation : `timings` (core.debug.StageTimings) garde un
+    histogramme par étage — "compute" (compute_state complet, hors
+    cache), "time_domain", "spectral" (dont "interpolation" / "welch"
+    en mode welch), "score", "resp" ; pipeline.summary y ajoute "edr"
+    et "scoring". Seuls les étages réellement recalculés sont comptés.
+    stats() en donne le résumé (p50 / p95 / max). Quand core.debug.TRACER
+    est actif, push_rr et chaque étage sont aussi tracés.
+    """
+
+    SPECTRAL_MODES = ("welch", "sdft", "lomb")
+    MAX_HR_BPM = 220    # dimensionne l'anneau d'une fenêtre en secondes
+
+    def __init__(self, max_window=None, spectral_mode="welch",
+                 spectral_every=1, window_s=None, hrv_window_s=None):
+        if spectral_mode not in self.SPECTRAL_MODES:
+            raise ValueError(f"spectral_mode inconnu : {spectral_mode!r}")
+        if max_window is None:
+            # ~ 300 RR ≈ 4 minutes, ou window_s au rythme maximal
+            max_window = 300 if window_s is None else math.ceil(window_s * self.MAX_HR_BPM / 60.0)
         self.max_window = max_window
+        self.window_s = window_s
+        if hrv_window_s is not None and window_s is not None:
+            hrv_window_s = min(hrv_window_s, window_s)
+        self.hrv_window_s = hrv_window_s
+        self.spectral_mode = spectral_mode
+        self.spectral_every = max(1, int(spectral_every))
+        # fenêtre glissante préallouée : aucune allocation par battement ;
+        # _t : instant de chaque battement (s), aligné sur _rr
+        self._rr = ArrayRingBuffer(max_window)
+        self._t = ArrayRingBuffer(max_window)
+        # statistiques temporelles incrémentales (O(1) par battement) sur
+        # les _td_count derniers battements de la fenêtre
+        self._td = StreamingTimeDomain()
+        self._td_count = 0
+        self._pushes_since_resync = 0
+        # suivi spectral incrémental (mode "sdft")
+        self._sdft = SlidingBandPower() if spectral_mode == "sdft" else None
+
+        # mémoïsation : génération RR + caches par étage
+        self.generation = 0
+        self._state_cache = None          # (génération, heavy, ProcessorState)
+        self._stage_cache = {}            # nom -> (génération, valeur)
+        self._frozen = False              # étages coûteux figés (heavy=False)
+
+        self.timings = StageTimings()
+
+    # --------------------------------------------------------------
+    @property
+    def rr_list(self) -> np.ndarray:
+        """Fenêtre RR courante (ms), vue contiguë en lecture seule."""
+        return self._rr.view()
+
+    @property
+    def rr_times(self) -> np.ndarray:
+        """Instant (s) de chaque RR de la fenêtre, vue en lecture seule."""
+        return self._t.view()
+
+    def window_since(self, t_min):
+        """(instants, RR) des battements de la fenêtre avec t > t_min, vues sans copie."""
+        t = self._t.view()
+        k = int(np.searchsorted(t, t_min, side="right"))
+        return t[k:], self._rr.view()[k:]
+
+    # --------------------------------------------------------------
+    def push_rr(self, rr, t=None):
+        """Ajoute un RR (ms) terminé à l'instant t (s) et fait glisser les fenêtres."""
+        with TRACER.span("push_rr"):
+            # RR gardé en float (plus d'int()) : le capteur donne 1/1024 s,
+            # l'arrondi à la ms biaisait RMSSD / spectre sur les lots BLE
+            rr = float(rr)
+            t_last = self._t.last()
+            if t is None:
+                t = rr / 1000.0 if t_last is None else t_last + rr / 1000.0
+            elif t_last is not None:
+                t = max(float(t), t_last)   # instants croissants (dichotomie)
+            self.generation += 1
+            evicted = self._rr.append(rr)
+            self._t.append(t)
+            self._td.add(rr)
+            self._td_count += 1
+            if evicted is not None and self._td_count > len(self._rr):
+                self._td.remove_oldest(evicted, self._rr.view()[0])
+                self._td_count -= 1
+
+            if self.hrv_window_s is not None:
+                self._evict_td(t - self.hrv_window_s)
+            if self.window_s is not None:
+                self._evict_rr(t - self.window_s)
+
+            # recalage exact une fois par tour de fenêtre (dérive flottante)
+            self._pushes_since_resync += 1
+            if self._pushes_since_resync >= self.max_window:
+                self._td.resync(self._rr.view()[len(self._rr) - self._td_count:])
+                self._pushes_since_resync = 0
+
+            if self._sdft is not None:
+                self._sdft.push_rr(rr)
+
+    def _evict_td(self, t_min):
+        """Retire du domaine temporel les battements avec t <= t_min."""
+        t = self._t.view()
+        rr = self._rr.view()
+        n = len(rr)
+        keep = n - int(np.searchsorted(t, t_min, side="right"))
+        while self._td_count > keep:
+            i = n - self._td_count
+            self._td.remove_oldest(rr[i], rr[i + 1] if i + 1 < n else None)
+            self._td_count -= 1
+
+    def _evict_rr(self, t_min):
+        """Retire de la fenêtre les battements avec t <= t_min."""
+        k = int(np.searchsorted(self._t.view(), t_min, side="right"))
+        if k == 0:
+            return
+        self._evict_td(t_min)   # le domaine temporel ne déborde jamais de la fenêtre
+        self._rr.drop_oldest(k)
+        self._t.drop_oldest(k)
+
+    # --------------------------------------------------------------
+    @property
+    def time_domain(self) -> StreamingTimeDomain:
+        """Statistiques temporelles courantes (SDNN, RMSSD, pNN50, HR)."""
+        return self._td
+
+    @property
+    def time_domain_spans_window(self) -> bool:
+        """True si time_domain porte sur toute la fenêtre RR (pas de hrv_window_s plus court)."""
+        return self._td_count == len(self._rr)
+
+    def stats(self):
+        """Durées par étage : {étage: {count, mean_ms, p50_ms, p95_ms, max_ms, last_ms}}."""
+        return self.timings.stats()
 
     # --------------------------------------------------------------
-    def push_rr(self, rr):
-        """Ajoute un RR et maintient une fenêtre glissante."""
-        self.rr_list.append(int(rr))
+    def invalidate(self):
+        """Vide les caches (ex. après changement de paramètres)."""
+        self._state_cache = None
+        self._stage_cache.clear()
 
-        # fenêtre glissante (max 4 minutes)
-        if len(self.rr_list) > self.max_window:
-            self.rr_list = self.rr_list[-self.max_window:]
+    def _stage(self, name, fn, every=1):
+        """
+        Étage mémoïsé : fn() n'est réévalué que si au moins `every`
+        nouveaux RR sont arrivés depuis le dernier calcul de cet étage
+        (jamais en mode figé, sauf s'il n'a encore aucune valeur).
+        """
+        cached = self._stage_cache.get(name)
+        if cached is not None and (self._frozen or self.generation - cached[0] < every):
+            return cached[1]
+        with self.timings.stage(name):
+            value = fn()
+        self._stage_cache[name] = (self.generation, value)
+        return value
 
     # --------------------------------------------------------------
-    def compute_state(self) -> ProcessorState:
-        """Calcule tous les indicateurs HRV + spectre + score + respiration estimée."""
-        rr = self.rr_list
+    def compute_state(self, force=False, heavy=True) -> ProcessorState:
+        """
+        Calcule tous les indicateurs HRV + spectre + score + respiration estimée.
+
+        Sans nouveau RR depuis l'appel précédent, renvoie le même objet
+        ProcessorState (sauf force=True). heavy=False : spectre et RSA
+        repris du dernier calcul, seul le domaine temporel est à jour.
+        """
+        cached = self._state_cache
+        if (not force and cached is not None and cached[0] == self.generation
+                and (cached[1] or not heavy)):
+            return cached[2]
+
+        self._frozen = not heavy
+        try:
+            with self.timings.stage("compute"):
+                state = self._compute_state()
+        finally:
+            self._frozen = False
+        self._state_cache = (self.generation, heavy, state)
+        return state
+
+    def _compute_state(self) -> ProcessorState:
+        # copie unique par calcul : l'état envoyé à l'UI ne doit pas
+        # bouger quand de nouveaux RR arrivent dans l'anneau
+        rr = self._rr.view().copy()
 
         # Cas de base si pas assez de données
         if len(rr) < 4:
@@ -66,11 +268,20 @@ class Processor:
             )
 
         # ====== 1) TIME DOMAIN ======
-        td = compute_time_domain(rr)
-        rmssd = td.get("rmssd", 0.0)
+        with self.timings.stage("time_domain"):
+            td = self._td.as_dict()
+        rmssd = td["rmssd"]
 
         # ====== 2) SPECTRAL ======
-        spec = compute_spectral(rr)
+        if self._sdft is not None:
+            spec = self._stage("spectral", self._sdft.spectrum)
+        else:
+            if self.spectral_mode == "lomb":
+                spectral_fn = compute_spectral_lomb
+            else:
+                spectral_fn = lambda x: compute_spectral(x, timings=self.timings)  # noqa: E731
+            spec = self._stage("spectral", lambda: spectral_fn(rr),
+                               every=self.spectral_every)
 
         if spec["freq"] is not None:
             freq = spec["freq"]
@@ -85,21 +296,14 @@ class Processor:
             lf = hf = ratio = resp_freq = 0.0
 
         # ====== 3) SCORE SIMPLE ======
-        score = float(min(100.0, rmssd / 3.0 * 100.0))
+        with self.timings.stage("score"):
+            score = float(min(100.0, rmssd / 3.0 * 100.0))
 
         # ====== 4) RESPIRATION ESTIMÉE (RSA / EDR) ======
-
-        # Variation des RR : c’est la base du RSA
-        rr_array = np.array(rr)
-        rr_diff = rr_array - np.mean(rr_array)
-
-        # Normalisation pour tracer
-        if len(rr_diff) > 4:
-            resp_signal = rr_diff / (np.max(np.abs(rr_diff)) + 1e-9)
-        else:
-            resp_signal = np.array([])
-
-        resp_time = np.arange(len(resp_signal))
+        # centré sur la fenêtre RR elle-même : la moyenne du domaine
+        # temporel ne vaut que si hrv_window_s couvre toute la fenêtre
+        rr_mean = td["mean_nn"] if self.time_domain_spans_window else float(rr.mean())
+        resp_signal, resp_time = self._stage("resp", lambda: self._resp_signal(rr, rr_mean))
 
         # Retour complet
         return ProcessorState(
@@ -114,4 +318,24 @@ class Processor:
             score=score,
             resp_signal=resp_signal,
             resp_time=resp_time,
+            sdnn=td["sdnn"],
+            pnn50=td["pnn50"],
+            mean_nn=td["mean_nn"],
+            mean_hr=td["mean_hr"],
         )
+
+    # --------------------------------------------------------------
+    @staticmethod
+    def _resp_signal(rr, rr_mean):
+        """Signal RSA normalisé pour l'affichage : (signal, temps)."""
+        # Variation des RR : c’est la base du RSA
+        rr_diff = rr - rr_mean
+
+        # Normalisation pour tracer
+        if len(rr_diff) > 4:
+            resp_signal = rr_diff / (np.max(np.abs(rr_diff)) + 1e-9)
+        else:
+            resp_signal = np.array([])
+
+        resp_time = np.arange(len(resp_signal))
+        return resp_signal, resp_time
@@ -0,0 +1,221 @@
+# pipeline/recording.py
+"""
+Enregistrement RR binaire en ajout seul, relu par np.memmap.
+
+Format (little-endian) :
+    en-tête, 32 octets :
+        magic      4s   b"RRB1"
+        version    u16
+        rec_size   u16  taille d'un enregistrement (12)
+        t0         f8   instant de création (epoch, s)
+        réservé    16 octets
+    enregistrements, 12 octets chacun :
+        t          f8   instant du battement (s)
+        rr_ms      f4   intervalle RR (ms)
+
+Écriture (RRRecorder) : append() ne fait qu'empiler en mémoire ; un
+thread de fond écrit les enregistrements en attente puis fait un seul
+fsync toutes les `flush_interval_s`. Un plantage perd au plus cet
+intervalle. À la réouverture, un enregistrement incomplet en fin de
+fichier (écriture interrompue) est tronqué et l'ajout reprend.
+
+Lecture (RRRecording) : np.memmap en lecture seule sur les
+enregistrements, t et rr_ms sont des vues sans copie. L'ouverture ne
+lit que l'en-tête, quelle que soit la durée de la session ; un fichier
+en cours d'écriture peut être relu (enregistrements complets seulement).
+
+Ce module n'importe pas PySide6.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+RECORDING_SUFFIX = ".rrb"
+MAGIC = b"RRB1"
+VERSION = 1
+
+RECORD_DTYPE = np.dtype([("t", "<f8"), ("rr_ms", "<f4")])
+RECORD_SIZE = RECORD_DTYPE.itemsize
+
+_HEADER = struct.Struct("<4sHHd16x")
+HEADER_SIZE = _HEADER.size
+
+
+def _read_header(f, path) -> float:
+    """Valide l'en-tête ; renvoie t0."""
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"{path} : en-tête d'enregistrement RR tronqué")
+    magic, version, rec_size, t0 = _HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} : pas un enregistrement RR ({magic!r})")
+    if version != VERSION or rec_size != RECORD_SIZE:
+        raise ValueError(f"{path} : version {version} / enregistrement de "
+                         f"{rec_size} octets non supportés")
+    return t0
+
+
+# ----------------------------------------------------------------------
+# Écriture
+# ----------------------------------------------------------------------
+class RRRecorder:
+    """
+    Enregistreur (t, rr_ms) en ajout seul, fsync groupés dans un thread.
+
+    append() / append_many() sont appelables depuis n'importe quel
+    thread. close() écrit le reste et synchronise ; aussi utilisable
+    comme gestionnaire de contexte.
+
+    Si l'écriture de fond échoue (disque plein…), l'erreur est gardée
+    dans `error` et relevée par l'append() suivant, par flush() et par
+    close() : plus rien n'est accepté, la file en mémoire ne grossit pas.
+    """
+
+    def __init__(self, path, flush_interval_s: float = 1.0, t0: Optional[float] = None):
+        self.path = os.fspath(path)
+        self.flush_interval_s = float(flush_interval_s)
+
+        self._f = open(self.path, "a+b")
+        self._f.seek(0, os.SEEK_END)
+        size = self._f.tell()
+        if size == 0:
+            self.t0 = time.time() if t0 is None else float(t0)
+            self._f.write(_HEADER.pack(MAGIC, VERSION, RECORD_SIZE, self.t0))
+            self._sync()
+            size = HEADER_SIZE
+        else:
+            self._f.seek(0)
+            self.t0 = _read_header(self._f, self.path)
+            tail = (size - HEADER_SIZE) % RECORD_SIZE
+            if tail:                    # dernier enregistrement interrompu
+                size -= tail
+                self._f.truncate(size)
+                self._sync()
+        self.records = (size - HEADER_SIZE) // RECORD_SIZE
+
+        self._pending: List[Tuple[float, float]] = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closing = False
+        self.syncs = 0
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="rr-recorder", daemon=True)
+        self._thread.start()
+
+    # --------------------------------------------------------------
+    def append(self, t: float, rr_ms: float) -> None:
+        if self.error is not None:
+            raise self.error
+        with self._lock:
+            self._pending.append((t, rr_ms))
+
+    def append_many(self, t: Sequence[float], rr_ms: Sequence[float]) -> None:
+        """Un lot de battements (ex. RRBatch.beat_times(), RRBatch.rr_ms)."""
+        if self.error is not None:
+            raise self.error
+        items = list(zip(np.asarray(t, dtype=float).tolist(),
+                         np.asarray(rr_ms, dtype=float).tolist()))
+        with self._lock:
+            self._pending.extend(items)
+
+    def flush(self) -> None:
+        """Écrit et synchronise immédiatement (thread appelant)."""
+        if self.error is not None:
+            raise self.error
+        self._write_pending()
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self._closing = True
+        self._wake.set()
+        self._thread.join()
+        try:
+            if self.error is None:
+                self._write_pending()
+        finally:
+            self._f.close()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> "RRRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --------------------------------------------------------------
+    def _sync(self) -> None:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def _write_pending(self) -> None:
+        # _io_lock garde l'ordre entre flush() et le thread de fond ;
+        # _lock n'est tenu que le temps de l'échange : append() ne
+        # attend jamais un fsync
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            self._f.write(np.array(pending, dtype=RECORD_DTYPE).tobytes())
+            self._sync()
+            self.records += len(pending)
+            self.syncs += 1
+
+    def _run(self) -> None:
+        while not self._closing:
+            self._wake.wait(self.flush_interval_s)
+            try:
+                self._write_pending()
+            except Exception as e:      # disque plein, etc. : remonté par close()
+                self.error = e
+                return
+
+
+# ----------------------------------------------------------------------
+# Lecture
+# ----------------------------------------------------------------------
+class RRRecording:
+    """Enregistrement ouvert en lecture : vues memmap sans copie."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self.t0 = _read_header(f, self.path)
+            f.seek(0, os.SEEK_END)
+            n = (f.tell() - HEADER_SIZE) // RECORD_SIZE
+        if n:
+            self.records = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r",
+                                     offset=HEADER_SIZE, shape=(n,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    @property
+    def t(self) -> np.ndarray:
+        return self.records["t"]
+
+    @property
+    def rr_ms(self) -> np.ndarray:
+        return self.records["rr_ms"]
+
+    @property
+    def duration_s(self) -> float:
+        return float(self.t[-1] - self.t[0]) if len(self) > 1 else 0.0
+
+    def __len__(self) -> int:
+        return int(self.records.shape[0])
+
+
+def read_recording(path) -> Tuple[np.ndarray, np.ndarray]:
+    """(t, rr_ms) d'un enregistrement, vues memmap en lecture seule."""
+    rec = RRRecording(path)
+    return rec.t, rec.rr_ms
@@ -0,0 +1,248 @@
+# pipeline/replay.py
+"""
+Rejeu plus rapide que le temps réel : RR enregistrés ou synthétiques →
+Processor → EDR → score (BeatAnalyzer), sur une horloge virtuelle.
+
+- l'horloge virtuelle suit le temps du signal ; elle est utilisable
+  comme `clock` des composants qui en acceptent une (MultiRateScheduler,
+  RespGuideGenerator) pour qu'ils avancent au rythme du rejeu ;
+- speed=1 : temps réel, speed=N : N fois plus vite, speed=0 : aussi vite
+  que possible (aucune attente, le temps virtuel saute de battement en
+  battement) ;
+- en mode cadencé, chaque battement est attendu jusqu'à son échéance
+  absolue (pas de dérive cumulée comme avec sleep(rr)) ;
+- le rapport donne le débit soutenu (battements/s) et le facteur par
+  rapport au temps réel.
+
+Usage :
+    python -m pipeline.replay [FICHIER] [--minutes 20] [--speed 0]
+           [--every 1] [--window-s 120] [--heavy-interval 1.0]
+           [-o etats.jsonl] [--stages]
+           [--trace trace.json]
+
+Sans FICHIER, une session synthétique de --minutes minutes est rejouée.
+Ce module n'importe pas PySide6.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import sys
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core.debug import TRACER
+from pipeline.headless import BeatAnalyzer, JsonlSink, rr_model
+
+
+# ----------------------------------------------------------------------
+# Horloge virtuelle
+# ----------------------------------------------------------------------
+class VirtualClock:
+    """
+    Temps du signal (s). Avancé par advance_to() ; entre deux
+    battements, en mode cadencé, il progresse avec l'horloge murale
+    multipliée par `speed`.
+    """
+
+    def __init__(self, speed: float = 0.0, wall: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.speed = max(0.0, float(speed))
+        self.wall = wall
+        self.sleep = sleep
+        self._t = 0.0
+        self._t_origin = 0.0
+        self._wall_origin = None
+        self.slept_s = 0.0
+
+    def __call__(self) -> float:
+        if self.speed > 0 and self._wall_origin is not None:
+            return max(self._t, self._t_origin + (self.wall() - self._wall_origin) * self.speed)
+        return self._t
+
+    def start(self, t: float) -> None:
+        """Aligne le temps virtuel t sur l'instant mural courant."""
+        self._t = self._t_origin = float(t)
+        self._wall_origin = self.wall()
+
+    def advance_to(self, t: float) -> None:
+        """Attend (mode cadencé) que le temps virtuel atteigne t, puis s'y place."""
+        if self._wall_origin is None:
+            self.start(t)
+        elif self.speed > 0:
+            due = self._wall_origin + (t - self._t_origin) / self.speed
+            delay = due - self.wall()
+            if delay > 0:
+                self.sleep(delay)
+                self.slept_s += delay
+        self._t = max(self._t, float(t))
+
+
+# ----------------------------------------------------------------------
+# Sources
+# ----------------------------------------------------------------------
+def synthetic_rr(n: int, base_hr_bpm: float = 75.0, resp_cpm: float = 6.0,
+                 rsa_ms: float = 50.0, noise_ms: float = 5.0,
+                 seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    n battements de headless.rr_model (le modèle de simulated_rr) :
+    renvoie (t, rr_ms), t = fin de chaque intervalle (s).
+    """
+    beats = itertools.islice(rr_model(base_hr_bpm, resp_cpm, rsa_ms, noise_ms, seed), n)
+    rr = np.fromiter((s.rr_ms for s in beats), dtype=float, count=n)
+    return np.cumsum(rr) / 1000.0, rr
+
+
+class ReplayReport(NamedTuple):
+    beats: int
+    rows: int
+    heavy_runs: int
+    signal_s: float     # durée rejouée (temps du signal)
+    wall_s: float       # durée réelle du rejeu
+
+    @property
+    def beats_per_s(self) -> float:
+        return self.beats / self.wall_s if self.wall_s > 0 else math.inf
+
+    @property
+    def realtime_factor(self) -> float:
+        return self.signal_s / self.wall_s if self.wall_s > 0 else math.inf
+
+    def __str__(self) -> str:
+        return (f"{self.beats} battement(s), {self.rows} état(s), "
+                f"{self.signal_s:.0f} s de signal en {self.wall_s:.2f} s "
+                f"({self.beats_per_s:.0f} battements/s, ×{self.realtime_factor:.0f})")
+
+
+# ----------------------------------------------------------------------
+# Moteur de rejeu
+# ----------------------------------------------------------------------
+class ReplayEngine:
+    """
+    Rejoue une série (t, rr_ms) à travers un BeatAnalyzer au rythme
+    d'une VirtualClock. Les options de BeatAnalyzer (window, every,
+    heavy_interval_s, …) sont transmises telles quelles.
+    """
+
+    def __init__(self, t, rr_ms, speed: float = 0.0, clock: Optional[VirtualClock] = None,
+                 **analyzer_kw):
+        self.t = np.asarray(t, dtype=float)
+        self.rr_ms = np.asarray(rr_ms, dtype=float)
+        if self.t.shape != self.rr_ms.shape:
+            raise ValueError("t et rr_ms doivent avoir la même taille")
+        self.clock = clock or VirtualClock(speed)
+        self.analyzer = BeatAnalyzer(**analyzer_kw)
+        self._stopping = False
+
+    @classmethod
+    def from_file(cls, path, speed: float = 0.0, **kw) -> "ReplayEngine":
+        """Fichier RR texte ou enregistrement .rrb (pipeline.batch.load_rr_file)."""
+        from pipeline.batch import load_rr_file
+
+        t, rr = load_rr_file(path)
+        return cls(t, rr, speed=speed, **kw)
+
+    @classmethod
+    def synthetic(cls, minutes: float = 20.0, speed: float = 0.0, seed: Optional[int] = None,
+                  base_hr_bpm: float = 75.0, resp_cpm: float = 6.0, **kw) -> "ReplayEngine":
+        n = int(round(minutes * base_hr_bpm))
+        t, rr = synthetic_rr(n, base_hr_bpm, resp_cpm, seed=seed)
+        return cls(t, rr, speed=speed, **kw)
+
+    def stop(self) -> None:
+        """Arrêt après le battement en cours (depuis n'importe quel thread)."""
+        self._stopping = True
+
+    def run(self, on_row: Optional[Callable[[Dict[str, object]], object]] = None,
+            limit: Optional[int] = None) -> ReplayReport:
+        """Rejoue la série (ou ses `limit` premiers battements)."""
+        n = self.t.size if limit is None else min(limit, self.t.size)
+        analyzer = self.analyzer
+        clock = self.clock
+        rows = beats = 0
+        self._stopping = False
+
+        wall0 = time.perf_counter()
+        if n:
+            clock.start(self.t[0] - self.rr_ms[0] / 1000.0)
+        for t, rr in zip(self.t[:n].tolist(), self.rr_ms[:n].tolist()):
+            clock.advance_to(t)
+            row = analyzer.process(t, rr)
+            beats += 1
+            if row is not None:
+                rows += 1
+                if on_row is not None:
+                    on_row(row)
+            if self._stopping:
+                break
+        wall = time.perf_counter() - wall0
+
+        signal = float(self.t[beats - 1] - self.t[0] + self.rr_ms[0] / 1000.0) if beats else 0.0
+        return ReplayReport(beats, rows, analyzer.heavy_runs, signal, wall)
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pipeline.replay",
+        description="Rejeu accéléré d'une session RR (horloge virtuelle).",
+    )
+    parser.add_argument("file", nargs="?", default=None,
+                        help="fichier RR (texte ou .rrb) ; absent : session synthétique")
+    parser.add_argument("--minutes", type=float, default=20.0,
+                        help="durée de la session synthétique")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="1 = temps réel, N = N fois plus vite, 0 = le plus vite possible")
+    parser.add_argument("--every", type=int, default=1, help="un état tous les N battements")
+    parser.add_argument("--window", type=int, default=300, help="fenêtre en battements")
+    parser.add_argument("--window-s", type=float, default=None,
+                        help="fenêtre RR en secondes (remplace --window)")
+    parser.add_argument("--hrv-window-s", type=float, default=None,
+                        help="fenêtre du domaine temporel en secondes")
+    parser.add_argument("--heavy-interval", type=float, default=1.0,
+                        help="période (s du signal) du spectre / EDR / score")
+    parser.add_argument("-o", "--output", default=None, help="états en JSONL (défaut : aucun)")
+    parser.add_argument("--trace", default=None, metavar="FICHIER.json",
+                        help="trace Chrome des étages (chrome://tracing, Perfetto)")
+    parser.add_argument("--stages", action="store_true",
+                        help="affiche les durées par étage (p50 / p95 / max)")
+    args = parser.parse_args(argv)
+
+    kw = dict(speed=args.speed, window=args.window, every=args.every,
+              window_s=args.window_s, hrv_window_s=args.hrv_window_s,
+              heavy_interval_s=args.heavy_interval)
+    if args.file:
+        engine = ReplayEngine.from_file(args.file, **kw)
+    else:
+        engine = ReplayEngine.synthetic(args.minutes, seed=0, **kw)
+
+    sink = JsonlSink(args.output) if args.output else None
+    if args.trace:
+        TRACER.enable()
+    try:
+        report = engine.run(sink.write if sink else None)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if sink is not None:
+            sink.close()
+        if args.trace:
+            TRACER.disable()
+            TRACER.dump(args.trace)
+    print(report, file=sys.stderr)
+    if args.stages:
+        for group, stages in engine.analyzer.stats().items():
+            for name, s in stages.items():
+                print(f"  {group:>9}.{name:<13} n={s['count']:<6} p50 {s['p50_ms']:7.3f} ms"
+                      f"  p95 {s['p95_ms']:7.3f} ms  max {s['max_ms']:7.3f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# pipeline/summary.py
+"""
+Indicateurs de synthèse d'une fenêtre RR, partagés par l'analyse batch
+(pipeline.batch) et le runtime sans interface (pipeline.headless).
+
+- hrv_metrics  : lecture d'un ProcessorState (domaine temporel + spectre)
+- resp_metrics : respiration (EDRPremium + Welch EDR), Sync% et score global
+
+Les valeurs absentes (EDR pas encore calculable) valent "".
+Ce module n'importe pas PySide6.
+"""
+
+from typing import Dict
+
+from edr.edr_basic import estimate_cpm_welch
+from score.components import compute_sync_score
+from score.global_score import GlobalScore
+from score.normalizers import norm_hf_fraction, norm_ratio, norm_rmssd
+
+HRV_COLUMNS = [
+    "mean_hr", "sdnn", "rmssd", "pnn50",
+    "lf", "hf", "lf_hf_ratio", "resp_freq_hz",
+]
+RESP_COLUMNS = ["edr_cpm", "edr_quality", "welch_cpm", "sync", "score"]
+METRIC_COLUMNS = HRV_COLUMNS + RESP_COLUMNS
+
+
+def hrv_metrics(state) -> Dict[str, float]:
+    """Colonnes HRV_COLUMNS d'un ProcessorState."""
+    return {
+        "mean_hr": state.mean_hr,
+        "sdnn": state.sdnn,
+        "rmssd": state.rmssd,
+        "pnn50": state.pnn50,
+        "lf": state.lf,
+        "hf": state.hf,
+        "lf_hf_ratio": state.lf_hf_ratio,
+        "resp_freq_hz": state.resp_freq,
+    }
+
+
+def resp_metrics(processor, state, edr, t_win, rr_win, welch: bool = True) -> Dict[str, object]:
+    """
+    Colonnes RESP_COLUMNS : estimation EDR sur (t_win, rr_win), Welch EDR
+    (si welch=True), Sync% et score global à partir de `state`. Durées
+    enregistrées dans processor.timings ("edr", "welch_edr", "scoring").
+    """
+    timings = processor.timings
+    with timings.stage("edr"):
+        edr_cpm, edr_quality, _ = edr.estimate(t_win, rr_win)
+    welch_cpm = None
+    if welch:
+        with timings.stage("welch_edr"):
+            welch_cpm = estimate_cpm_welch(t_win, rr_win)
+
+    with timings.stage("scoring"):
+        # moyenne / écart-type en cache seulement s'ils portent sur rr_list
+        td = processor.time_domain if processor.time_domain_spans_window else None
+        sync = compute_sync_score(state.rr_list, edr_cpm, edr_quality,
+                                  rr_mean=td.mean_nn if td is not None else None,
+                                  rr_std=td.std if td is not None else None)
+        score = GlobalScore.compute(
+            norm_ratio(state.lf, state.hf),
+            norm_hf_fraction(state.lf, state.hf),
+            norm_rmssd(state.rmssd),
+            sync / 100.0,
+        )
+    return {
+        "edr_cpm": edr_cpm if edr_cpm is not None else "",
+        "edr_quality": edr_quality,
+        "welch_cpm": welch_cpm if welch_cpm is not None else "",
+        "sync": sync,
+        "score": score,
+    }
+
+
+def window_metrics(processor, state, edr, t_win, rr_win, welch: bool = True) -> Dict[str, object]:
+    """Toutes les colonnes METRIC_COLUMNS d'une fenêtre."""
+    row = hrv_metrics(state)
+    row.update(resp_metrics(processor, state, edr, t_win, rr_win, welch=welch))
+    return row
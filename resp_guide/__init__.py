@@ -15,4 +15,19 @@ Ce module fournit une API simple :
 
 L’objectif est d’isoler complètement la logique du guide respiratoire pour
 rendre la fenêtre principale plus légère et mieux structurée.
+
+- guide.py    : RespGuideGenerator (phase sur horloge monotone)
+- patterns.py : motifs inspi / apnée / expi / apnée compilés en table
 """
+
+from .guide import RespGuideGenerator
+from .patterns import PRESETS, SHAPES, BreathLUT, BreathPattern, compile_pattern
+
+__all__ = [
+    "RespGuideGenerator",
+    "BreathPattern",
+    "BreathLUT",
+    "compile_pattern",
+    "PRESETS",
+    "SHAPES",
+]
@@ -1,56 +1,88 @@
-import numpy as np
+import time
+from dataclasses import replace
+
+from .patterns import BreathPattern, compile_pattern
 
 
 class RespGuideGenerator:
     """
     Génère une respiration guidée basée sur un cycle inspi/expi
-    avec montée sur 'insp_duration' secondes et descente sur
-    'exp_duration' secondes, parfaitement synchronisée.
+    (apnées optionnelles), montée sur 'insp_duration' secondes et
+    descente sur 'exp_duration' secondes, parfaitement synchronisée.
+
+    Le cycle est compilé une fois en table (resp_guide.patterns) et
+    recompilé seulement quand le motif change. La phase suit une horloge
+    monotone (tick()) : le rendu peut tourner à 30 ou 60 FPS, ou sauter
+    des images, sans dériver.
     """
 
-    def __init__(self, insp_duration=4.0, exp_duration=6.0):
-        self.insp = insp_duration
-        self.exp = exp_duration
+    def __init__(self, insp_duration=4.0, exp_duration=6.0, hold_in=0.0,
+                 hold_out=0.0, shape="sinus", clock=time.monotonic):
+        self.clock = clock
         self.phase = 0.0     # phase dans le cycle (secondes)
-        self.dt = 0.2        # pas de temps nominal (lié au refresh)
+        self.dt = 0.2        # pas de temps de step() (sans horloge)
+
+        self._pattern = BreathPattern(float(insp_duration), float(exp_duration),
+                                      float(hold_in), float(hold_out), shape)
+        self._lut = compile_pattern(self._pattern)
+        self._t0 = self.clock()  # instant où phase == 0
+
+    # -------------------------------------------------------
+    @property
+    def pattern(self) -> BreathPattern:
+        return self._pattern
+
+    @property
+    def insp(self) -> float:
+        return self._pattern.inhale
+
+    @property
+    def exp(self) -> float:
+        return self._pattern.exhale
+
+    @property
+    def total(self) -> float:
+        return self._pattern.total
 
     # -------------------------------------------------------
     def set_durations(self, insp, exp):
         """Met à jour les durées du cycle."""
-        self.insp = max(0.5, float(insp))
-        self.exp = max(0.5, float(exp))
+        self.set_pattern(replace(self._pattern,
+                                 inhale=max(0.5, float(insp)),
+                                 exhale=max(0.5, float(exp))))
+
+    def set_pattern(self, pattern: BreathPattern):
+        """
+        Change de motif ; la position relative dans le cycle est conservée
+        pour éviter un saut du point. Sans effet si le motif est identique.
+        """
+        if pattern == self._pattern:
+            return
+        frac = self.phase / self._pattern.total
+        self._pattern = pattern
+        self._lut = compile_pattern(pattern)
+        self.phase = frac * pattern.total
+        self._t0 = self.clock() - self.phase
 
     # -------------------------------------------------------
+    def tick(self, now=None) -> float:
+        """Phase recalculée depuis l'horloge ; renvoie l'amplitude courante."""
+        now = self.clock() if now is None else now
+        self.phase = (now - self._t0) % self._pattern.total
+        return self._lut.value_at(self.phase)
+
     def step(self):
         """Avance la phase d'un pas de dt, en boucle."""
-        total = self.insp + self.exp
-        self.phase = (self.phase + self.dt) % total
+        self.phase = (self.phase + self.dt) % self._pattern.total
+        self._t0 = self.clock() - self.phase
 
     # -------------------------------------------------------
     def generate_waveform(self):
         """
-        Génère la courbe complète d'un cycle pour l'affichage :
-        - montée linéaire ou sinusoïdale sur phase inspi
-        - descente sur phase expi
+        Courbe complète d'un cycle pour l'affichage : (t, y) en lecture
+        seule, mêmes tableaux tant que le motif ne change pas.
         """
-        total = self.insp + self.exp
-
-        # 100 points par cycle → propre pour l'affichage
-        t = np.linspace(0, total, 200)
-
-        y = np.zeros_like(t)
-
-        # Inspir : 0 → +1
-        mask_insp = t < self.insp
-        x_insp = t[mask_insp] / self.insp
-        y[mask_insp] = np.sin(x_insp * np.pi / 2)   # montée douce
-
-        # Expi : +1 → -1
-        mask_exp = t >= self.insp
-        x_exp = (t[mask_exp] - self.insp) / self.exp
-        y[mask_exp] = np.cos(x_exp * np.pi)         # descend de +1 à -1
-
-        return t, y
+        return self._lut.t, self._lut.y
 
     # -------------------------------------------------------
     def get_instant_value(self):
@@ -58,10 +90,8 @@ class RespGuideGenerator:
         Donne la valeur Y instantanée de la respiration guidée,
         utile si tu veux synchroniser un point mobile.
         """
-        if self.phase < self.insp:
-            x = self.phase / self.insp
-            return np.sin(x * np.pi / 2)
-        else:
-            x = (self.phase - self.insp) / self.exp
-            return np.cos(x * np.pi)
+        return self._lut.value_at(self.phase)
 
+    def current_segment(self) -> str:
+        """"inhale", "hold_in", "exhale" ou "hold_out"."""
+        return self._lut.segment_at(self.phase)
@@ -0,0 +1,123 @@
+"""
+patterns.py
+-----------
+Motifs respiratoires et leur table précalculée (LUT).
+
+Un motif = 4 segments : inspiration, apnée poumons pleins, expiration,
+apnée poumons vides (les apnées peuvent durer 0 s), avec une forme de
+transition "sinus" ou "linear". Amplitude : -1 (vide) → +1 (plein).
+
+compile_pattern() échantillonne un cycle une seule fois (résultat en
+cache, le motif étant immuable) ; BreathLUT.value_at(phase) est ensuite
+une lecture O(1) avec interpolation linéaire entre deux points.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+SHAPES = ("sinus", "linear")
+SEGMENTS = ("inhale", "hold_in", "exhale", "hold_out")
+LUT_SIZE = 512   # points par cycle
+
+
+@dataclass(frozen=True)
+class BreathPattern:
+    """Durées (s) des quatre segments d'un cycle + forme des transitions."""
+
+    inhale: float = 4.0
+    exhale: float = 6.0
+    hold_in: float = 0.0
+    hold_out: float = 0.0
+    shape: str = "sinus"
+
+    def __post_init__(self):
+        if self.shape not in SHAPES:
+            raise ValueError(f"forme inconnue : {self.shape!r} (connues : {', '.join(SHAPES)})")
+        if self.inhale <= 0 or self.exhale <= 0:
+            raise ValueError("inspiration et expiration doivent durer plus de 0 s")
+        if self.hold_in < 0 or self.hold_out < 0:
+            raise ValueError("les apnées ne peuvent pas être négatives")
+
+    @property
+    def durations(self):
+        return (self.inhale, self.hold_in, self.exhale, self.hold_out)
+
+    @property
+    def total(self) -> float:
+        return float(sum(self.durations))
+
+    @property
+    def cpm(self) -> float:
+        """Cycles par minute."""
+        return 60.0 / self.total
+
+
+PRESETS = {
+    "default": BreathPattern(4.0, 6.0),
+    "coherence": BreathPattern(5.0, 5.0),                  # 6 cpm
+    "box": BreathPattern(4.0, 4.0, hold_in=4.0, hold_out=4.0, shape="linear"),
+    "relax_478": BreathPattern(4.0, 8.0, hold_in=7.0),
+}
+
+
+class BreathLUT:
+    """Un cycle échantillonné : t, y (lecture seule) + lecture O(1)."""
+
+    __slots__ = ("pattern", "t", "y", "size", "_step", "_y", "_bounds")
+
+    def __init__(self, pattern: BreathPattern, t: np.ndarray, y: np.ndarray):
+        self.pattern = pattern
+        self.t = t
+        self.y = y
+        self.size = len(t) - 1          # y[size] == y[0] (cycle fermé)
+        self._step = pattern.total / self.size
+        self._y = y.tolist()            # accès scalaire plus rapide que NumPy
+        self._bounds = np.cumsum((0.0,) + pattern.durations)[:-1].tolist()
+
+    def value_at(self, phase: float) -> float:
+        """Amplitude à `phase` secondes dans le cycle (modulo la durée)."""
+        pos = (phase % self.pattern.total) / self._step
+        i = min(int(pos), self.size - 1)
+        f = pos - i
+        y0 = self._y[i]
+        return y0 + f * (self._y[i + 1] - y0)
+
+    def segment_at(self, phase: float) -> str:
+        """Segment en cours ("inhale", "hold_in", "exhale", "hold_out")."""
+        phase = phase % self.pattern.total
+        i = bisect_right(self._bounds, phase) - 1
+        # segments de durée nulle : on prend le dernier qui commence ici
+        return SEGMENTS[i]
+
+
+def _ramp(x: np.ndarray, shape: str) -> np.ndarray:
+    """Transition 0 → 1 sur x ∈ [0, 1]."""
+    if shape == "linear":
+        return x
+    return 0.5 * (1.0 - np.cos(np.pi * x))
+
+
+@lru_cache(maxsize=32)
+def compile_pattern(pattern: BreathPattern, size: int = LUT_SIZE) -> BreathLUT:
+    """Échantillonne un cycle de `pattern` sur size + 1 points (en cache)."""
+    durations = np.asarray(pattern.durations)
+    bounds = np.concatenate(([0.0], np.cumsum(durations)))
+
+    t = np.linspace(0.0, pattern.total, size + 1)
+    seg = np.clip(np.searchsorted(bounds, t, side="right") - 1, 0, 3)
+    dur = durations[seg]
+    x = np.divide(t - bounds[seg], dur, out=np.zeros_like(t), where=dur > 0)
+    ramp = _ramp(np.clip(x, 0.0, 1.0), pattern.shape)
+
+    y = np.select(
+        [seg == 0, seg == 1, seg == 2],
+        [2.0 * ramp - 1.0, np.ones_like(t), 1.0 - 2.0 * ramp],
+        default=-1.0,
+    )
+
+    t.setflags(write=False)
+    y.setflags(write=False)
+    return BreathLUT(pattern, t, y)
@@ -11,7 +11,9 @@ from core.math_utils import clamp
 
 def compute_sync_score(rr_intervals: list[float],
                        resp_cpm: float | None,
-                       resp_quality: float | None) -> float:
+                       resp_quality: float | None,
+                       rr_mean: float | None = None,
+                       rr_std: float | None = None) -> float:
     """
     Calcule un pourcentage de synchronisation cœur–respiration.
     Combine :
@@ -19,20 +21,24 @@ def compute_sync_score(rr_intervals: list[float],
         - la qualité du signal respiratoire
         - la cohérence de phase approximée (simplifiée)
     Retourne un score entre 0 et 100 (%).
+
+    rr_mean / rr_std : moyenne et écart-type déjà connus (ex. StreamingTimeDomain
+    de Processor) pour éviter de les recalculer sur toute la fenêtre.
     """
-    if not rr_intervals or resp_cpm is None or resp_cpm <= 0:
+    if rr_intervals is None or len(rr_intervals) == 0 or resp_cpm is None or resp_cpm <= 0:
         return 0.0
 
     # Approximation : stabilité de respiration (6 cpm = cible)
     sync_freq = max(0.0, 1.0 - abs(resp_cpm - 6.0) / 6.0)
 
     # Variabilité stable (cohérence cardiaque régulière)
-    rr = np.asarray(rr_intervals, dtype=float)
-    if len(rr) < 10:
+    if len(rr_intervals) < 10:
         return 0.0
 
-    rr_std = np.std(rr)
-    rr_mean = np.mean(rr)
+    if rr_mean is None or rr_std is None:
+        rr = np.asarray(rr_intervals, dtype=float)
+        rr_std = np.std(rr)
+        rr_mean = np.mean(rr)
     stability = 1.0 - clamp(rr_std / (rr_mean * 0.2), 0.0, 1.0)
 
     # Pondération respiration / stabilité / qualité
@@ -8,7 +8,7 @@ Ce module est utilisé par :
 - les sous-scores
 """
 
-from score.utils import clamp, safe_float
+from core.math_utils import clamp, safe_float
 import math
 
 
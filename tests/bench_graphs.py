@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+bench_graphs.py
+---------------
+Benchmark des graphes de app.graphs, backend "matplotlib" vs "qpainter" :
+    - temps par image : update(...) + traitement des événements de rendu
+    - mémoire Python allouée à la construction + rendu (tracemalloc)
+    - coût d'import du backend dans un interpréteur neuf
+
+À lancer depuis la racine du projet (sans affichage : QT_QPA_PLATFORM=offscreen) :
+    python -m tests.bench_graphs [--frames 200]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+from PySide6 import QtWidgets
+
+from app.graphs import GRAPH_BACKENDS, GRAPH_KINDS, graph_class
+from core.registry import import_cost_ms
+
+SIZE = (600, 260)
+
+
+def _frames(kind, n_frames):
+    """Générateur d'arguments update(...) réalistes pour `kind`."""
+    rng = np.random.default_rng(0)
+    rr = 850.0 + 40.0 * np.sin(np.arange(400) * 0.3) + rng.normal(0, 10, 400)
+    ts = np.cumsum(rr) / 1000.0
+    t_guide = np.linspace(-20.0, 0.0, 400)
+
+    for i in range(n_frames):
+        if kind == "rr":
+            k = 150 + i % 250
+            yield "update", (ts[:k], rr[:k])
+        elif kind == "spectral":
+            yield "update", (600.0 + 50.0 * np.sin(i * 0.1), 400.0, 1.5)
+        elif kind == "respiration":
+            y = np.sin(2 * np.pi * (t_guide + i * 0.033) / 10.0)
+            yield "update", ((t_guide, y), (t_guide, 0.8 * y), float(y[-1]))
+        else:
+            t = t_guide + i * 0.033
+            yield "plot_guided_resp", (t, np.sin(2 * np.pi * t / 10.0))
+
+
+def _render(app):
+    """
+    Laisse la boucle Qt traiter draw_idle (Matplotlib) et les paintEvent
+    en attente (QPainter) : l'image est à l'écran au retour.
+    """
+    app.processEvents()
+
+
+def bench(app, kind, backend, n_frames):
+    cls = graph_class(kind, backend)
+
+    gc.collect()
+    tracemalloc.start()
+    w = cls()
+    w.resize(*SIZE)
+    w.show()
+    _render(app)
+
+    times = []
+    for method, args in _frames(kind, n_frames):
+        t0 = time.perf_counter()
+        getattr(w, method)(*args)
+        _render(app)
+        times.append((time.perf_counter() - t0) * 1000.0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    w.close()
+    w.deleteLater()
+    times = np.asarray(times)
+    return float(np.median(times)), float(np.percentile(times, 95)), peak / 1024.0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark Matplotlib vs QPainter")
+    ap.add_argument("--frames", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    print("Coût d'import (ms, interpréteur neuf) :")
+    for backend, reg in GRAPH_BACKENDS.items():
+        modules = sorted({reg.module(k) for k in GRAPH_KINDS})
+        ms = import_cost_ms(["PySide6.QtWidgets"] + modules)
+        print(f"  {backend:>10} : {ms:.0f}" if ms is not None else f"  {backend:>10} : n/a")
+
+    print(f"\n{'graphe':>11} {'backend':>10} {'médiane ms':>11} {'p95 ms':>8} {'pic KiB':>9}")
+    for kind in GRAPH_KINDS:
+        for backend in GRAPH_BACKENDS:
+            med, p95, kib = bench(app, kind, backend, args.frames)
+            print(f"{kind:>11} {backend:>10} {med:>11.2f} {p95:>8.2f} {kib:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
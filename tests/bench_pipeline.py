@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+bench_pipeline.py
+-----------------
+Benchmark des chemins chauds du pipeline sur des fenêtres RR
+synthétiques de 60, 300, 1200 et 5000 battements :
+
+    processor  : Processor.push_rr + compute_state (un battement neuf par appel)
+    spectral   : hrv.spectral.compute_spectral
+    clean_rr   : hrv.hrv_backend.clean_rr (backend "auto")
+    edr        : EDRPremium.estimate (hors streaming)
+    edr_nk     : edr.respiration_edr.extract_respiration_edr (NeuroKit2)
+    edr_welch  : edr.edr_basic.estimate_cpm_welch
+
+Chaque mesure : une série de chauffe, puis plusieurs séries de N appels
+(N choisi pour ~50 ms par série) ; on garde la médiane et le minimum du
+temps par appel. Un cas
+dont une dépendance manque est marqué "skipped" au lieu d'échouer.
+
+Résultats en JSON (--save), puis comparaison à une référence
+enregistrée (--compare) : un cas est une régression si son minimum
+(moins sensible au bruit de la machine que la médiane) dépasse celui
+de la référence de plus de --threshold (défaut 25 %).
+Code de sortie 1 en cas de régression.
+
+À lancer depuis la racine du projet :
+    python -m tests.bench_pipeline --save tests/bench_baseline.json
+    python -m tests.bench_pipeline --compare tests/bench_baseline.json
+    python -m tests.bench_pipeline --cases spectral edr --windows 300 1200
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from pipeline.replay import synthetic_rr
+
+WINDOWS = (60, 300, 1200, 5000)
+ROUNDS = 7
+ROUND_S = 0.05
+
+
+# ----------------------------------------------------------------------
+# Cas : setup(t, rr) -> fonction sans argument à chronométrer
+# ----------------------------------------------------------------------
+def _processor(t, rr):
+    from pipeline.processor import Processor
+
+    processor = Processor(max_window=len(rr))
+    for x in rr:
+        processor.push_rr(x)
+    feed = itertools.cycle(rr.tolist())
+
+    def run():
+        processor.push_rr(next(feed))
+        processor.compute_state()
+    return run
+
+
+def _spectral(t, rr):
+    from hrv.spectral import compute_spectral
+    return lambda: compute_spectral(rr)
+
+
+def _clean_rr(t, rr):
+    from hrv.hrv_backend import clean_rr
+    return lambda: clean_rr(rr)
+
+
+def _edr(t, rr):
+    from edr.edr_premium import EDRPremium
+    edr = EDRPremium()
+    return lambda: edr.estimate(t, rr)
+
+
+def _edr_nk(t, rr):
+    from edr.respiration_edr import extract_respiration_edr
+    return lambda: extract_respiration_edr(t, rr)
+
+
+def _edr_welch(t, rr):
+    from edr.edr_basic import estimate_cpm_welch
+    return lambda: estimate_cpm_welch(t, rr)
+
+
+CASES = {
+    "processor": _processor,
+    "spectral": _spectral,
+    "clean_rr": _clean_rr,
+    "edr": _edr,
+    "edr_nk": _edr_nk,
+    "edr_welch": _edr_welch,
+}
+
+
+# ----------------------------------------------------------------------
+# Mesure
+# ----------------------------------------------------------------------
+def _time_per_call(fn):
+    """(médiane, min) du temps par appel en ms, sur ROUNDS séries."""
+    fn()
+    t0 = time.perf_counter()
+    fn()
+    one = max(time.perf_counter() - t0, 1e-7)
+    calls = max(1, int(ROUND_S / one))
+    for _ in range(calls):      # chauffe (caches, fréquence CPU)
+        fn()
+    per_call = []
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        per_call.append((time.perf_counter() - t0) / calls * 1000.0)
+    return statistics.median(per_call), min(per_call)
+
+
+def run_suite(cases=CASES, windows=WINDOWS):
+    """Renvoie {"meta": …, "results": {"cas/fenêtre": {...}}}."""
+    results = {}
+    for n in windows:
+        t, rr = synthetic_rr(n, base_hr_bpm=70.0, resp_cpm=6.0, seed=n)
+        for name in cases:
+            key = f"{name}/{n}"
+            try:
+                fn = CASES[name](t, rr)
+            except ImportError as e:
+                results[key] = {"skipped": str(e)}
+                continue
+            median, best = _time_per_call(fn)
+            results[key] = {"median_ms": round(median, 5), "min_ms": round(best, 5)}
+    meta = {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(current, baseline, threshold=0.25):
+    """Lignes (clé, réf. ms, actuel ms, écart relatif, régression ?) sur min_ms."""
+    rows = []
+    for key, cur in current["results"].items():
+        ref = baseline["results"].get(key)
+        if not ref or "min_ms" not in ref or "min_ms" not in cur:
+            continue
+        ratio = cur["min_ms"] / ref["min_ms"] - 1.0 if ref["min_ms"] else 0.0
+        rows.append((key, ref["min_ms"], cur["min_ms"], ratio, ratio > threshold))
+    return rows
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tests.bench_pipeline")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--windows", type=int, nargs="+", default=list(WINDOWS))
+    parser.add_argument("--save", metavar="JSON", help="écrit les résultats (référence)")
+    parser.add_argument("--compare", metavar="JSON", help="compare à une référence enregistrée")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="écart relatif du minimum (min_ms) compté comme régression")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.cases, args.windows)
+    print(f"{'cas':>16} {'médiane ms':>11} {'min ms':>10}")
+    for key, r in report["results"].items():
+        if "skipped" in r:
+            print(f"{key:>16} {'ignoré':>11}  ({r['skipped']})")
+        else:
+            print(f"{key:>16} {r['median_ms']:>11.4f} {r['min_ms']:>10.4f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        print(f"\nréférence : {args.compare} ({baseline['meta'].get('date', '?')}), "
+              f"seuil +{args.threshold:.0%}")
+        print(f"{'cas':>16} {'réf. ms':>10} {'actuel ms':>10} {'écart':>8}")
+        for key, ref, cur, ratio, bad in rows:
+            flag = "  RÉGRESSION" if bad else ""
+            print(f"{key:>16} {ref:>10.4f} {cur:>10.4f} {ratio:>+8.1%}{flag}")
+        if any(bad for *_, bad in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
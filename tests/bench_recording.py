@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+bench_recording.py
+------------------
+Coût de l'enregistrement RR binaire (pipeline.recording) comparé à un
+export CSV texte, pour des sessions de plusieurs heures :
+    - append : temps par battement côté appelant (thread de fond à part)
+    - taille du fichier
+    - ouverture + première lecture : memmap vs pipeline.batch.load_rr_file
+
+À lancer depuis la racine du projet :
+    python -m tests.bench_recording
+"""
+
+import csv
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from pipeline.batch import load_rr_file
+from pipeline.recording import RRRecorder, RRRecording
+
+HOURS = (1, 8, 24)
+BPM = 75
+
+
+def main():
+    print(f"{'heures':>6} {'beats':>8} {'append µs':>10} {'rrb Ko':>8} {'csv Ko':>8} "
+          f"{'open rrb ms':>12} {'open csv ms':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for h in HOURS:
+            n = h * 3600 * BPM // 60
+            rr = 800.0 + np.random.default_rng(h).normal(0, 30, n)
+            t = np.cumsum(rr) / 1000.0
+            rrb = os.path.join(tmp, f"{h}.rrb")
+            txt = os.path.join(tmp, f"{h}.csv")
+
+            rec = RRRecorder(rrb, flush_interval_s=1.0)
+            t0 = time.perf_counter()
+            for ti, x in zip(t.tolist(), rr.tolist()):
+                rec.append(ti, x)
+            append_us = (time.perf_counter() - t0) / n * 1e6
+            rec.close()
+
+            with open(txt, "w", newline="") as f:
+                w = csv.writer(f)
+                w.writerows(zip(t.tolist(), rr.tolist()))
+
+            t0 = time.perf_counter()
+            r = RRRecording(rrb)
+            float(r.rr_ms[-1])
+            open_rrb = (time.perf_counter() - t0) * 1000.0
+            t0 = time.perf_counter()
+            load_rr_file(txt)
+            open_csv = (time.perf_counter() - t0) * 1000.0
+
+            print(f"{h:>6} {n:>8} {append_us:>10.2f} {os.path.getsize(rrb) / 1024:>8.0f} "
+                  f"{os.path.getsize(txt) / 1024:>8.0f} {open_rrb:>12.3f} {open_csv:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+bench_spectral.py
+-----------------
+Benchmark des backends spectraux de hrv.spectral :
+    - welch : interpolation 4 Hz + Welch (chemin historique)
+    - lomb  : Lomb–Scargle rapide sur les instants des battements
+    - sdft  : lecture du suivi par DFT glissante (coût par RR à part)
+
+Pour chaque taille de fenêtre : temps moyen par appel et accord des
+puissances LF / HF (écart relatif à Welch) et du pic HF.
+
+À lancer depuis la racine du projet :
+    python -m tests.bench_spectral
+"""
+
+import time
+
+import numpy as np
+
+from hrv.spectral import SlidingBandPower, compute_spectral, compute_spectral_lomb
+
+WINDOWS = (60, 300, 1200)
+
+
+def synthetic_rr(n, resp_hz=0.25, seed=0):
+    """RR (ms) avec composante LF à 0.1 Hz + RSA à resp_hz + bruit."""
+    rng = np.random.default_rng(seed)
+    rr = np.empty(n)
+    t = 0.0
+    for i in range(n):
+        rr[i] = (850.0 + 40.0 * np.sin(2 * np.pi * 0.1 * t)
+                 + 30.0 * np.sin(2 * np.pi * resp_hz * t) + rng.normal(0, 10))
+        t += rr[i] / 1000.0
+    return rr
+
+
+def _time_per_call(fn, repeat):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000.0
+
+
+def main():
+    print(f"{'beats':>6} {'backend':>7} {'ms/appel':>9} {'LF':>10} {'HF':>10} "
+          f"{'dLF %':>7} {'dHF %':>7} {'pic HF':>7}")
+    for n in WINDOWS:
+        rr = synthetic_rr(n)
+        repeat = max(20, 20000 // n)
+
+        sdft = SlidingBandPower()
+        for x in rr:
+            sdft.push_rr(x)
+
+        results = {
+            "welch": (compute_spectral(rr), _time_per_call(lambda: compute_spectral(rr), repeat)),
+            "lomb": (compute_spectral_lomb(rr), _time_per_call(lambda: compute_spectral_lomb(rr), repeat)),
+            "sdft": (sdft.spectrum(), _time_per_call(sdft.spectrum, repeat)),
+        }
+
+        ref = results["welch"][0]
+        for name, (spec, ms) in results.items():
+            d_lf = 100.0 * (spec["lf"] - ref["lf"]) / ref["lf"] if ref["lf"] else 0.0
+            d_hf = 100.0 * (spec["hf"] - ref["hf"]) / ref["hf"] if ref["hf"] else 0.0
+            print(f"{n:>6} {name:>7} {ms:>9.3f} {spec['lf']:>10.3e} {spec['hf']:>10.3e} "
+                  f"{d_lf:>7.1f} {d_hf:>7.1f} {spec['peak_hf']:>7.3f}")
+
+        t0 = time.perf_counter()
+        sdft_push = SlidingBandPower()
+        for x in rr:
+            sdft_push.push_rr(x)
+        print(f"{'':>6} {'':>7} sdft : {(time.perf_counter() - t0) / n * 1000.0:.3f} ms par RR")
+
+
+if __name__ == "__main__":
+    main()
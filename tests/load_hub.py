@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+load_hub.py
+-----------
+Test de charge du hub multi-ceintures (pipeline.hub) : N ceintures
+simulées, rythme réel accéléré (--speed), une ligne par battement.
+
+Pour chaque N et chaque mode de pool : débit (battements/s), latence
+battement → publication sur le bus (p50 / p95 / max, tous appareils
+confondus) et CPU (processus + workers) rapporté au temps mural.
+
+À lancer depuis la racine du projet :
+    python -m tests.load_hub [--devices 1 5 10 20] [--modes thread process]
+                             [--beats 300] [--speed 20] [--workers K]
+"""
+
+import argparse
+import asyncio
+import resource
+import time
+
+import numpy as np
+
+from pipeline.headless import simulated_rr
+from pipeline.hub import Hub
+
+
+def _cpu_s():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def run_once(n_devices, mode, beats, speed, workers):
+    """Une passe ; renvoie (battements/s, latences ms, CPU %)."""
+    hub = Hub(mode=mode, workers=workers)
+    for i in range(n_devices):
+        hr = 60.0 + (3.0 * i) % 30          # ceintures désynchronisées
+        hub.add_device(f"strap-{i}", simulated_rr(base_hr_bpm=hr, speed=speed,
+                                                  limit=beats, seed=i))
+
+    cpu0, t0 = _cpu_s(), time.perf_counter()
+    stats = asyncio.run(hub.run())
+    wall = time.perf_counter() - t0
+    cpu = _cpu_s() - cpu0
+
+    errors = [s["error"] for s in stats.values() if s["error"]]
+    if errors:
+        raise RuntimeError(errors[0])
+    lat = np.concatenate([hub.latencies(d) for d in hub.device_ids()])
+    total = sum(s["beats"] for s in stats.values())
+    return total / wall, lat, 100.0 * cpu / wall
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tests.load_hub")
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--modes", nargs="+", choices=Hub.MODES, default=list(Hub.MODES))
+    parser.add_argument("--beats", type=int, default=300, help="battements par ceinture")
+    parser.add_argument("--speed", type=float, default=20.0,
+                        help="accélération du temps réel (0 = saturation)")
+    parser.add_argument("--workers", type=int, default=None, help="taille du pool")
+    args = parser.parse_args(argv)
+
+    print(f"{'N':>4} {'mode':>8} {'beats/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'max ms':>8} {'CPU %':>7}")
+    for n in args.devices:
+        for mode in args.modes:
+            rate, lat, cpu = run_once(n, mode, args.beats, args.speed, args.workers)
+            print(f"{n:>4} {mode:>8} {rate:>9.0f} {np.percentile(lat, 50):>8.2f} "
+                  f"{np.percentile(lat, 95):>8.2f} {lat.max():>8.2f} {cpu:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+test_batch.py
+-------------
+Tests de l'analyse batch headless (pipeline.batch).
+"""
+
+import io
+
+import numpy as np
+
+from pipeline.batch import COLUMNS, load_rr_file, run_batch
+
+
+def _write_session(path, n=400, two_columns=False):
+    rng = np.random.default_rng(0)
+    tt = np.arange(n) * 0.85
+    rr = 850.0 + 40.0 * np.sin(2 * np.pi * 0.1 * tt) + rng.normal(0, 5, n)
+    if two_columns:
+        np.savetxt(path, np.c_[np.cumsum(rr) / 1000.0, rr], fmt="%.4f", delimiter=",",
+                   header="t_s,rr_ms")
+    else:
+        np.savetxt(path, rr, fmt="%.2f", header="rr_ms")
+    return rr
+
+
+def test_load_rr_file_formats(tmp_path):
+    rr = _write_session(tmp_path / "a.txt")
+    t, got = load_rr_file(tmp_path / "a.txt")
+    np.testing.assert_allclose(got, rr, atol=0.01)
+    np.testing.assert_allclose(t, np.cumsum(got) / 1000.0)
+
+    _write_session(tmp_path / "b.txt", two_columns=True)
+    t, got = load_rr_file(tmp_path / "b.txt")
+    assert t.size == got.size == 400
+    assert np.all(np.diff(t) > 0)
+
+
+def test_run_batch_rows(tmp_path):
+    for k in range(2):
+        _write_session(tmp_path / f"s{k}.txt", two_columns=bool(k))
+    out = io.StringIO()
+    n = run_batch(sorted(tmp_path.glob("*.txt")), out, window=300, hop=20, jobs=1)
+
+    lines = out.getvalue().strip().splitlines()
+    assert lines[0].split(",") == COLUMNS
+    assert n == len(lines) - 1 == 2 * 6   # fenêtres à 300, 320, …, 400
+
+
+def test_run_batch_skips_failing_files(tmp_path, capsys):
+    from pipeline.batch import main
+
+    _write_session(tmp_path / "a.rrb.txt")
+    (tmp_path / "b.rrb").write_bytes(b"pas un enregistrement")
+    _write_session(tmp_path / "c.txt")
+    files = [tmp_path / "a.rrb.txt", tmp_path / "b.rrb", tmp_path / "c.txt"]
+
+    for jobs in (1, 2):
+        out = io.StringIO()
+        failed = []
+        n = run_batch(files, out, window=300, hop=50, jobs=jobs, failed=failed)
+        assert n == 2 * 3                       # a et c analysés malgré b
+        assert [f for f, _ in failed] == [str(files[1])]
+        assert "ValueError" in failed[0][1]
+
+    assert main([str(tmp_path), "--pattern", "*", "-o", str(tmp_path / "out.csv"),
+                 "--jobs", "1"]) == 1
+    assert "b.rrb ignoré" in capsys.readouterr().err
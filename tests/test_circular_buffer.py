@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+test_circular_buffer.py
+-----------------------
+Tests des buffers circulaires : TimeSeriesBuffer et anneau
+un écrivain / un lecteur (SPSCRingBuffer).
+"""
+
+import threading
+
+import numpy as np
+
+from core.circular_buffer import SPSCRingBuffer, TimeSeriesBuffer
+
+
+def test_time_series_window_since_and_last():
+    buf = TimeSeriesBuffer(maxlen=5)
+    assert buf.last() is None
+    for i in range(8):
+        buf.append_point(float(i), i * 10)
+    assert len(buf) == 5
+    assert buf.last() == (7.0, 70.0)
+    assert buf.window_since(5.5) == [(6.0, 60.0), (7.0, 70.0)]
+    assert buf.window_since(0.0) == buf.snapshot()
+    assert buf.window_since(100.0) == []
+
+
+def test_spsc_latest_is_contiguous_view():
+    ring = SPSCRingBuffer(4, dtype=np.float32)
+    assert len(ring) == 0 and ring.last() is None
+    ts, values = ring.latest()
+    assert ts.size == 0 and values.size == 0
+
+    for i in range(6):
+        ring.append(float(i), 100.0 + i)
+    ts, values = ring.latest()
+    assert ts.tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert values.dtype == np.float32
+    assert values.tolist() == [102.0, 103.0, 104.0, 105.0]
+    assert ts.flags.c_contiguous and not ts.flags.writeable
+    assert np.shares_memory(ts, ring._ts)
+    assert ring.latest(2)[0].tolist() == [4.0, 5.0]
+    assert ring.last() == (5.0, 105.0)
+    assert ring.written == 6 and len(ring) == 4
+
+
+def test_spsc_since_extend_and_clear():
+    ring = SPSCRingBuffer(8)
+    t = np.arange(20, dtype=float)
+    ring.extend(t, t * 2.0)                 # lot plus grand que l'anneau
+    assert ring.latest()[0].tolist() == t[-8:].tolist()
+    ts, values = ring.since(15.5)
+    assert ts.tolist() == [16.0, 17.0, 18.0, 19.0]
+    assert values.tolist() == [32.0, 34.0, 36.0, 38.0]
+    assert ring.since(100.0)[0].size == 0
+    assert ring.since(-1.0, copy=True)[0].size == 8
+
+    ring.extend([20.0, 21.0], [1.0, 2.0])
+    assert ring.latest(3)[1].tolist() == [38.0, 1.0, 2.0]
+
+    ring.clear()
+    assert len(ring) == 0 and ring.last() is None
+    ring.append(30.0, 3.0)
+    assert ring.latest()[0].tolist() == [30.0]
+
+
+def test_spsc_read_since_streams_and_counts_losses():
+    ring = SPSCRingBuffer(4)
+    ts, values, cursor = ring.read_since(0)
+    assert ts.size == 0 and cursor == 0
+
+    ring.extend([1.0, 2.0, 3.0], [10.0, 20.0, 30.0])
+    ts, values, cursor = ring.read_since(cursor)
+    assert ts.tolist() == [1.0, 2.0, 3.0] and cursor == 3
+    assert ring.read_since(cursor)[0].size == 0
+
+    for i in range(4, 10):                  # l'écrivain prend un tour d'avance
+        ring.append(float(i), 10.0 * i)
+    ts, values, new_cursor = ring.read_since(cursor)
+    assert ts.tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert (new_cursor - cursor) - ts.size == 2   # 4.0 et 5.0 perdus
+
+
+def test_spsc_reader_never_sees_torn_points():
+    # écrivain : value = 2 * ts ; le lecteur vérifie chaque copie
+    ring = SPSCRingBuffer(256)
+    n = 20000
+    done = threading.Event()
+    errors = []
+
+    def producer():
+        for i in range(n):
+            ring.append(float(i), 2.0 * i)
+        done.set()
+
+    def consumer():
+        while not done.is_set():
+            ts, values = ring.latest(32, copy=True)
+            if not np.array_equal(values, 2.0 * ts) or np.any(np.diff(ts) != 1.0):
+                errors.append((ts, values))
+                return
+
+    threads = [threading.Thread(target=producer), threading.Thread(target=consumer)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert not errors
+    assert ring.last() == (n - 1.0, 2.0 * (n - 1))
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+test_compute_worker.py
+----------------------
+Thread de calcul : RR transmis par l'anneau sans lock depuis un autre
+thread (comme le thread BLE), dans l'ordre, avec leurs instants.
+"""
+
+import threading
+
+import numpy as np
+
+from app.compute_worker import ComputeWorker
+from pipeline.processor import Processor
+
+
+def test_rr_from_producer_thread_reach_processor_in_order():
+    worker = ComputeWorker(Processor(max_window=1000))
+    worker.start()
+    n = 600
+    t = 50.0 + np.arange(n) * 0.8
+    rr = 800.0 + np.arange(n) % 7 + 0.25
+
+    def producer():                 # lots de 3 comme des notifications 0x2A37
+        for i in range(0, n, 3):
+            worker.push_batch(t[i:i + 3], rr[i:i + 3])
+
+    th = threading.Thread(target=producer)
+    th.start()
+    th.join()
+    worker.push_rr(900.5)           # sans instant : cumul des RR
+    worker.stop()
+    assert worker.wait(5000)
+
+    p = worker.processor
+    assert worker.dropped_rr == 0
+    np.testing.assert_array_equal(p.rr_list[:n], rr)
+    np.testing.assert_array_equal(p.rr_times[:n], t)
+    assert p.rr_list[-1] == 900.5 and abs(p.rr_times[-1] - (t[-1] + 0.9005)) < 1e-9
+
+
+def test_stop_before_start_does_not_hang():
+    worker = ComputeWorker()
+    worker.stop()
+    worker.start()
+    assert worker.wait(5000)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+test_edr.py
+-----------
+Tests du module edr : filtre passe-bande en cache / à état et
+EDRPremium en mode streaming.
+"""
+
+import numpy as np
+
+from edr.edr_premium import EDRPremium
+from edr.helpers import StreamingBandpass, design_bandpass
+
+
+def _session(n=900, resp_hz=0.1, seed=0):
+    rng = np.random.default_rng(seed)
+    rr = np.empty(n)
+    ts = np.empty(n)
+    t = 0.0
+    for i in range(n):
+        rr[i] = 850.0 + 50.0 * np.sin(2 * np.pi * resp_hz * t) + rng.normal(0, 8)
+        t += rr[i] / 1000.0
+        ts[i] = t
+    return ts, rr
+
+
+def test_design_bandpass_is_cached():
+    assert design_bandpass(4.0) is design_bandpass(4.0)
+    assert design_bandpass(4.0) is not design_bandpass(8.0)
+
+
+def test_streaming_bandpass_matches_one_shot_sosfilt():
+    x = np.random.default_rng(1).normal(size=1000)
+    bp = StreamingBandpass(4.0)
+    chunks = [bp.process(c) for c in np.array_split(x, 37)]
+
+    ref_y = StreamingBandpass(4.0).process(x)
+    np.testing.assert_allclose(np.concatenate(chunks), ref_y, atol=1e-12)
+
+
+def test_edr_premium_streaming_agrees_with_batch():
+    ts, rr = _session()
+    batch, stream = EDRPremium(), EDRPremium(streaming=True)
+    for i in range(300, len(rr), 5):
+        cpm_b, _, _ = batch.estimate(ts[i - 300:i], rr[i - 300:i])
+        cpm_s, q_s, (t_plot, y_plot) = stream.estimate(ts[i - 300:i], rr[i - 300:i])
+    assert abs(cpm_b - 6.0) < 1.0
+    assert abs(cpm_s - cpm_b) < 1.0
+    assert t_plot[-1] == 0.0 and t_plot[0] >= -20.0
+    assert np.all((y_plot >= 0.0) & (y_plot <= 1.0))
+
+
+def test_backends_resolved_lazily():
+    import sys
+
+    import edr
+    from edr.backends import EDR_BACKENDS
+
+    assert "edr.respiration_edr" not in sys.modules
+    assert EDR_BACKENDS.get("premium") is EDRPremium
+    assert EDR_BACKENDS.is_loaded("premium")
+    assert edr.get_edr_backend("welch") is edr.estimate_cpm_welch
+    try:
+        EDR_BACKENDS.get("inconnu")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("KeyError attendu")
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+test_graphs.py
+--------------
+Tests des graphes QPainter (app.graphs.qt_plot / qt_graphs) et de la
+sélection du backend graphique. Rendu hors écran (offscreen).
+"""
+
+import os
+import subprocess
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PySide6 import QtCore, QtWidgets
+
+from app.graphs import create_graph
+from app.graphs.models import RRPlotModel
+from app.graphs.qt_plot import LinePlot, polygon_view
+
+_app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_to_pixels_writes_points_in_place():
+    plot = LinePlot()
+    i = plot.add_curve("#000000")
+    plot.set_xlim(0.0, 2.0)
+    plot.set_ylim(-1.0, 1.0)
+    x = np.linspace(0.0, 2.0, 50)
+    plot.set_data(i, x, np.sin(x))
+
+    c = plot._curves[i]
+    rect = QtCore.QRectF(10.0, 20.0, 200.0, 100.0)
+    plot._to_pixels(c, rect)
+    assert c.poly.size() == 50 and not c.dirty
+    pts = polygon_view(c.poly)
+    np.testing.assert_allclose(pts[:, 0], 10.0 + x * 100.0)
+    np.testing.assert_allclose(pts[:, 1], 120.0 - (np.sin(x) + 1.0) * 50.0)
+    assert c.poly.at(0).x() == 10.0 and c.poly.at(0).y() == 70.0
+
+    plot.set_data(i, x[:10], np.zeros(10))      # redimensionné si besoin
+    plot._to_pixels(c, rect)
+    assert c.poly.size() == 10
+
+
+def test_qpainter_rr_graph_matches_model():
+    w = create_graph("rr", backend="qpainter")
+    w.resize(400, 200)
+    rr = 850.0 + 40.0 * np.sin(np.arange(200) * 0.3)
+    ts = np.cumsum(rr) / 1000.0
+    w.update(ts, rr)
+
+    _, _, xlim, ylim = RRPlotModel().prepare(ts, rr)
+    assert w.plot.xlim() == xlim
+    assert w.plot.ylim() == ylim
+
+    img = w.grab().toImage()
+    assert not img.isNull() and w.plot.paints >= 1
+
+
+def test_qpainter_backend_does_not_import_matplotlib():
+    code = (
+        "import os; os.environ['QT_QPA_PLATFORM'] = 'offscreen'\n"
+        "import sys\n"
+        "from PySide6 import QtWidgets\n"
+        "app = QtWidgets.QApplication([])\n"
+        "from app.graphs import create_graph\n"
+        "for k in ('rr', 'spectral', 'respiration', 'guided'):\n"
+        "    create_graph(k, backend='qpainter')\n"
+        "print('matplotlib' in sys.modules)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                         text=True, cwd=root, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "False"
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+test_headless.py
+----------------
+Tests du runtime sans interface (pipeline.headless) : boucle asyncio,
+cadence des étages coûteux, absence de dépendance Qt.
+"""
+
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+
+from pipeline.headless import COLUMNS, HeadlessRunner, JsonlSink, RRSample, simulated_rr
+
+
+def test_runner_emits_rows_from_simulated_source():
+    rows = []
+    source = simulated_rr(resp_cpm=6.0, speed=0, limit=400, seed=1)
+    runner = HeadlessRunner(source, rows.append, window=300, every=50)
+    n = asyncio.run(runner.run())
+
+    assert n == len(rows) == 8
+    assert runner.beats == 400
+    assert set(rows[-1]) == set(COLUMNS)
+    assert rows[-1]["n_beats"] == 300
+    # respiration simulée à 6 cpm
+    assert abs(rows[-1]["edr_cpm"] - 6.0) < 1.0
+
+
+def test_heavy_stages_follow_signal_time():
+    source = simulated_rr(base_hr_bpm=60.0, speed=0, limit=200, seed=2)
+    runner = HeadlessRunner(source, lambda row: None, heavy_interval_s=10.0)
+    asyncio.run(runner.run())
+    # ~200 s de signal, spectre / EDR une fois toutes les 10 s
+    assert 19 <= runner.heavy_runs <= 21
+    assert runner.rows == 200
+
+
+def test_stop_and_jsonl_sink():
+    out = io.StringIO()
+    runner = HeadlessRunner(simulated_rr(speed=0, seed=3), JsonlSink(out), every=10)
+
+    async def go():
+        task = asyncio.create_task(runner.run())
+        while runner.rows < 3:
+            await asyncio.sleep(0)
+        runner.stop()
+        return await task
+
+    asyncio.run(go())
+    lines = out.getvalue().splitlines()
+    assert len(lines) == runner.rows >= 3
+    assert json.loads(lines[0])["n_beats"] == 10
+
+
+def test_stop_with_silent_source():
+    # ceinture muette : stop() doit interrompre l'attente du battement suivant
+    async def silent():
+        yield RRSample(1.0, 800.0)
+        await asyncio.Event().wait()
+
+    runner = HeadlessRunner(silent(), lambda row: None)
+
+    async def go():
+        task = asyncio.create_task(runner.run())
+        while runner.beats < 1:
+            await asyncio.sleep(0)
+        runner.stop()
+        return await asyncio.wait_for(task, 2.0)
+
+    assert asyncio.run(go()) == 1
+
+
+def test_headless_does_not_import_qt():
+    code = "import sys, pipeline.headless; print('PySide6' in sys.modules or 'matplotlib' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                         text=True, cwd=root, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+test_hr_parser.py
+-----------------
+Tests du décodage 0x2A37 (ble.hr_parser) et du backend bleak
+(ble.bleak_backend) contre un BleakClient factice qui rejoue des
+notifications capturées à haute cadence.
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from ble.bleak_backend import BleakHRBackend
+from ble.exceptions import BLEConnectionError, BLEDataError, BLENotificationError
+from ble.hr_parser import (
+    RR_UNIT_MS,
+    encode_hr_measurement,
+    parse_hr_measurement,
+    parse_packets,
+)
+from ble.polar_constants import POLAR_H10_UUID
+
+# Notifications au format d'une ceinture Polar H10 (flags 0x16 / 0x10 / 0x06)
+CAPTURED = [
+    bytes.fromhex("1648ee03"),              # FC 72, contact, 1 RR (1006 → 982.4 ms)
+    bytes.fromhex("144a0d04f703"),          # FC 74, 2 RR, contact supporté mais perdu
+    bytes.fromhex("0649"),                  # FC 73, pas de RR
+    bytes.fromhex("1049e203"),              # FC 73, 1 RR, contact non supporté
+]
+
+
+def test_parse_flags_hr_and_rr():
+    m = parse_hr_measurement(CAPTURED[1])
+    assert m.hr == 74 and m.contact is False and m.energy_kj is None
+    np.testing.assert_allclose(m.rr_ms, np.array([0x040D, 0x03F7]) * RR_UNIT_MS)
+
+    m = parse_hr_measurement(encode_hr_measurement(300, [800.0, 810.0], contact=True,
+                                                   energy_kj=12))
+    assert m.hr == 300 and m.contact is True and m.energy_kj == 12
+    np.testing.assert_allclose(m.rr_ms, [800.0, 810.0], atol=RR_UNIT_MS / 2)
+
+    assert parse_hr_measurement(CAPTURED[0]).contact is True
+    assert parse_hr_measurement(CAPTURED[2]).rr_ms.size == 0
+    assert parse_hr_measurement(CAPTURED[3]).contact is None
+
+
+def test_parse_rejects_truncated_packets():
+    with pytest.raises(BLEDataError):
+        parse_hr_measurement(b"\x10")
+    with pytest.raises(BLEDataError):
+        parse_hr_measurement(bytes.fromhex("1648ee"))     # RR incomplet
+    batch, bad = parse_packets([b"\x10", CAPTURED[0]], [0.0, 1.0])
+    assert bad == 1 and len(batch) == 1
+
+
+def test_parse_packets_matches_per_packet_parser():
+    rng = np.random.default_rng(0)
+    packets, expected = [], []
+    for i in range(500):
+        rr = rng.uniform(600, 1100, size=rng.integers(0, 4))
+        packets.append(encode_hr_measurement(70 + i % 20, rr, energy_kj=i if i % 7 == 0 else None))
+        expected.append(parse_hr_measurement(packets[-1]).rr_ms)
+    t = np.arange(500, dtype=float)
+
+    batch, bad = parse_packets(packets, t)
+    assert bad == 0
+    np.testing.assert_array_equal(batch.rr_ms, np.concatenate(expected))
+    counts = [e.size for e in expected]
+    np.testing.assert_array_equal(batch.t_arrival, np.repeat(t, counts))
+    # le dernier RR d'un paquet finit à la réception
+    ends = np.cumsum(counts)[np.asarray(counts) > 0] - 1
+    np.testing.assert_array_equal(batch.beat_times()[ends], batch.t_arrival[ends])
+    two = int(np.argmax(np.asarray(counts) >= 2))
+    i0 = int(np.sum(counts[:two]))
+    assert batch.offset_ms[i0] == pytest.approx(batch.rr_ms[i0 + 1:i0 + counts[two]].sum())
+
+
+# ----------------------------------------------------------------------
+# BleakClient factice
+# ----------------------------------------------------------------------
+class FakeBleakClient:
+    """Rejoue `packets` dès start_notify, par rafales, dans la boucle asyncio."""
+
+    def __init__(self, address, packets, burst=50, fail_notify=False):
+        self.address = address
+        self.packets = packets
+        self.burst = burst
+        self.fail_notify = fail_notify
+        self.is_connected = False
+        self.stopped = False
+        self._task = None
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    async def start_notify(self, uuid, callback):
+        assert uuid == POLAR_H10_UUID
+        if self.fail_notify:
+            raise RuntimeError("notify refusé")
+
+        async def replay():
+            for i, data in enumerate(self.packets):
+                callback(uuid, bytearray(data))
+                if i % self.burst == self.burst - 1:
+                    await asyncio.sleep(0)
+        self._task = asyncio.create_task(replay())
+
+    async def stop_notify(self, uuid):
+        self.stopped = True
+        if self._task is not None:
+            self._task.cancel()
+
+
+def _replay_packets(n=20000):
+    rng = np.random.default_rng(1)
+    rr = rng.uniform(700, 1000, size=n)
+    packets = [encode_hr_measurement(72, rr[i:i + 2]) for i in range(0, n, 2)]
+    return packets, np.rint(rr / RR_UNIT_MS) * RR_UNIT_MS
+
+
+def test_backend_receives_every_rr_from_fake_client():
+    packets, expected = _replay_packets()
+    clients = []
+
+    def factory(address):
+        clients.append(FakeBleakClient(address, packets))
+        return clients[-1]
+
+    backend = BleakHRBackend(address="AA:BB", batch_interval_s=0.005, client_factory=factory)
+
+    async def go():
+        received = []
+        async for batch in backend.batches():
+            received.append(batch.rr_ms)
+            if backend.rr_count >= expected.size:
+                backend.stop()
+        return np.concatenate(received)
+
+    rr = asyncio.run(go())
+    np.testing.assert_allclose(rr, expected)
+    assert backend.packets == len(packets) and backend.bad_packets == 0
+    assert clients[0].stopped and not clients[0].is_connected
+    assert backend.last_hr == 72
+
+
+def test_backend_in_background_thread():
+    packets, expected = _replay_packets(2000)
+    backend = BleakHRBackend(address="AA:BB", batch_interval_s=0.005,
+                             client_factory=lambda a: FakeBleakClient(a, packets))
+    got = []
+    done = threading.Event()
+    status = []
+
+    def on_batch(batch):
+        got.append(batch.rr_ms)
+        if backend.rr_count >= expected.size:
+            done.set()
+
+    backend.start_in_thread(on_batch, on_status=status.append)
+    assert done.wait(5.0)
+    backend.stop()
+    backend.join(5.0)
+    np.testing.assert_allclose(np.concatenate(got), expected)
+    assert status[0] == "Connexion…" and status[-1] == "Arrêt"
+
+
+async def _consume(backend):
+    async for _ in backend.batches():
+        pass
+
+
+def test_backend_maps_failures_to_ble_exceptions():
+    bad = BleakHRBackend(address="AA:BB",
+                         client_factory=lambda a: FakeBleakClient(a, [], fail_notify=True))
+    with pytest.raises(BLENotificationError):
+        asyncio.run(_consume(bad))
+
+    class Unreachable(FakeBleakClient):
+        async def connect(self):
+            raise OSError("hors de portée")
+
+    dead = BleakHRBackend(address="AA:BB", client_factory=lambda a: Unreachable(a, []))
+    with pytest.raises(BLEConnectionError):
+        asyncio.run(_consume(dead))
+
+
+def test_backend_thread_reports_unexpected_errors():
+    def no_bleak(address):      # comme _bleak_client sans bleak installé
+        raise ImportError("No module named 'bleak'")
+
+    backend = BleakHRBackend(address="AA:BB", client_factory=no_bleak)
+    errors = []
+    status = []
+    backend.start_in_thread(lambda batch: None, on_status=status.append,
+                            on_error=errors.append)
+    backend.join(5.0)
+    assert len(errors) == 1 and isinstance(errors[0], BLEConnectionError)
+    assert "bleak" in str(errors[0]) and isinstance(errors[0].__cause__, ImportError)
+    assert status == ["Connexion…"]
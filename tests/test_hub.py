@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+test_hub.py
+-----------
+Tests du hub multi-ceintures (pipeline.hub) : un analyseur par appareil,
+publication sur le bus, pool de threads ou de processus, arrêt.
+"""
+
+import asyncio
+
+import pytest
+
+from pipeline.headless import RRSample, simulated_rr
+from pipeline.hub import Hub, StateBus
+
+
+def _hub(n, mode="thread", limit=120, **kw):
+    hub = Hub(mode=mode, workers=2, **kw)
+    for i in range(n):
+        hub.add_device(f"strap-{i}", simulated_rr(base_hr_bpm=60.0 + 5 * i, speed=0,
+                                                  limit=limit, seed=i))
+    return hub
+
+
+@pytest.mark.parametrize("mode", Hub.MODES)
+def test_each_device_publishes_its_own_state(mode):
+    seen = {}
+    hub = _hub(3, mode=mode, window=100)
+    hub.bus.subscribe(lambda dev, row: seen.setdefault(dev, []).append(row))
+    stats = asyncio.run(hub.run())
+
+    assert sorted(seen) == hub.device_ids()
+    for dev, s in stats.items():
+        assert s["error"] is None
+        assert s["beats"] == s["rows"] == len(seen[dev]) == 120
+        # analyseurs séparés : fenêtre et FC propres à chaque appareil
+        last = hub.bus.latest(dev)
+        assert last["n_beats"] == 100
+    assert hub.bus.snapshot()["strap-0"]["mean_hr"] < hub.bus.snapshot()["strap-2"]["mean_hr"]
+
+
+def test_stop_ends_run_and_failing_source_is_isolated():
+    async def broken():
+        yield RRSample(0.8, 800.0)
+        raise OSError("ceinture perdue")
+
+    async def scenario():
+        hub = Hub(workers=1)
+        hub.add_device("live", simulated_rr(speed=0, seed=0))     # sans fin
+        hub.add_device("broken", broken())
+        task = asyncio.create_task(hub.run())
+        while hub.bus.published < 50:
+            await asyncio.sleep(0.01)
+        hub.stop()
+        return await asyncio.wait_for(task, 10.0)
+
+    stats = asyncio.run(scenario())
+    assert stats["live"]["rows"] >= 50
+    assert stats["broken"]["error"] == "ceinture perdue"
+
+
+def test_bus_unsubscribe_and_duplicate_device():
+    bus = StateBus()
+    got = []
+    unsubscribe = bus.subscribe(lambda dev, row: got.append(dev))
+    bus.publish("a", {"t": 0.0})
+    unsubscribe()
+    bus.publish("b", {"t": 1.0})
+    assert got == ["a"] and bus.published == 2 and bus.latest("b") == {"t": 1.0}
+
+    hub = Hub(bus=bus)
+    hub.add_device("a", simulated_rr(limit=1))
+    with pytest.raises(ValueError):
+        hub.add_device("a", simulated_rr(limit=1))
+    with pytest.raises(ValueError):
+        Hub(mode="gpu")
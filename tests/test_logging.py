@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+test_logging.py
+---------------
+Tests du logging non bloquant de core.debug : mode "queue" (écriture
+dans un thread de fond, fichier tournant), file bornée et messages
+perdus comptés.
+"""
+
+import logging
+import threading
+import time
+
+import pytest
+
+from core import debug
+from core.debug import dropped_log_records, setup_logger, shutdown_logging
+
+
+class SlowHandler(logging.Handler):
+    """Terminal lent : bloque jusqu'à gate.set()."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.gate.wait()
+        self.threads.add(threading.current_thread().name)
+        self.records.append(record.getMessage())
+
+
+def test_queue_mode_writes_rotating_file_in_background(tmp_path):
+    log_file = tmp_path / "app.log"
+    lg = setup_logger("t_queue", mode="queue", log_file=str(log_file),
+                      max_bytes=2000, backup_count=2, console=False)
+    assert setup_logger("t_queue", mode="queue") is lg     # idempotent
+    for i in range(200):
+        lg.info("message %03d", i)
+    shutdown_logging("t_queue")
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert lines[-1].endswith("INFO: message 199")
+    assert (tmp_path / "app.log.1").exists() and not (tmp_path / "app.log.3").exists()
+    assert dropped_log_records("t_queue") == 0
+
+
+def test_full_queue_drops_without_blocking_and_reports():
+    lg = setup_logger("t_drop", mode="queue", queue_size=10, console=False)
+    slow = SlowHandler()
+    debug._LISTENERS["t_drop"].handlers = (slow,)
+
+    t0 = time.perf_counter()
+    for i in range(100):
+        lg.warning("w%d", i)
+    assert time.perf_counter() - t0 < 0.5      # l'appelant n'attend jamais le handler
+    dropped = dropped_log_records("t_drop")
+    assert dropped >= 80
+
+    slow.gate.set()
+    time.sleep(0.05)
+    lg.warning("après")
+    shutdown_logging("t_drop")
+
+    assert slow.records[-1] == "après"
+    assert any("perdu" in m for m in slow.records)
+    assert slow.threads and threading.current_thread().name not in slow.threads
+
+
+def test_sync_mode_and_bad_mode():
+    lg = setup_logger("t_sync")
+    assert [type(h) for h in lg.handlers] == [logging.StreamHandler]
+    with pytest.raises(ValueError):
+        setup_logger("t_bad", mode="async")
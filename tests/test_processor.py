@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+test_processor.py
+-----------------
+Tests unitaires du pipeline : anneau RR préalloué, statistiques
+temporelles incrémentales, DFT glissante et Processor.
+"""
+
+import numpy as np
+import pytest
+from scipy.signal import lombscargle, welch
+
+from core.circular_buffer import ArrayRingBuffer
+from hrv.hrv_backend import CLEAN_BACKENDS, clean_rr, clean_rr_basic
+from hrv.spectral import (
+    FS,
+    SlidingBandPower,
+    compute_spectral,
+    compute_spectral_lomb,
+    compute_spectral_windows,
+)
+from hrv.time_domain import compute_time_domain
+from pipeline.processor import Processor
+from score.components import compute_sync_score
+
+
+def _synthetic_rr(n, base=850.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * base / 1000.0
+    return base + 40.0 * np.sin(2 * np.pi * 0.1 * t) + rng.normal(0, 5, n)
+
+
+def test_ring_buffer_window():
+    buf = ArrayRingBuffer(4)
+    assert buf.append(1.0) is None
+    buf.extend([2.0, 3.0, 4.0])
+    assert buf.full()
+    assert buf.append(5.0) == 1.0
+    assert buf.view().tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert buf.view().flags.c_contiguous
+    assert not buf.view().flags.writeable
+    buf.drop_oldest(2)
+    assert buf.view().tolist() == [4.0, 5.0]
+    assert buf.last() == 5.0
+
+
+def test_ring_buffer_no_reallocation():
+    buf = ArrayRingBuffer(8)
+    base = buf._data
+    for i in range(100):
+        buf.append(float(i))
+    assert buf._data is base
+    assert buf.view().tolist() == [float(i) for i in range(92, 100)]
+
+
+def test_processor_window_matches_last_beats():
+    rr = _synthetic_rr(500)
+    p = Processor(max_window=300)
+    for x in rr:
+        p.push_rr(x)
+    state = p.compute_state()
+    assert len(state.rr_list) == 300
+    np.testing.assert_allclose(state.rr_list, rr[-300:])
+    assert state.rmssd > 0.0
+    assert state.lf > 0.0 and state.hf > 0.0
+
+
+def test_processor_state_is_a_snapshot():
+    p = Processor(max_window=20)
+    for x in _synthetic_rr(30):
+        p.push_rr(x)
+    state = p.compute_state()
+    before = state.rr_list.copy()
+    p.push_rr(1234.0)
+    np.testing.assert_array_equal(state.rr_list, before)
+
+
+def test_streaming_time_domain_matches_batch():
+    rr = _synthetic_rr(700, seed=3)
+    rr[::37] += 80.0   # quelques sauts > 50 ms pour pNN50
+    p = Processor(max_window=256)
+    for i, x in enumerate(rr):
+        p.push_rr(x)
+        if i % 50 == 7:
+            ref = compute_time_domain(rr[max(0, i - 255):i + 1])
+            got = p.time_domain.as_dict()
+            for key in ref:
+                assert abs(got[key] - ref[key]) < 1e-6, key
+
+
+def test_processor_time_windows_follow_heart_rate():
+    # 60 bpm puis 120 bpm : même durée de fenêtre, deux fois plus de battements
+    p = Processor(window_s=30.0, hrv_window_s=10.0)
+    assert p.max_window >= 30 * Processor.MAX_HR_BPM / 60
+    for _ in range(100):
+        p.push_rr(1000.0)
+    assert len(p.rr_list) == 30 and p.time_domain.n == 10
+    for _ in range(200):
+        p.push_rr(500.0)
+    assert len(p.rr_list) == 60 and p.time_domain.n == 20
+    t = p.rr_times
+    assert t[-1] - t[0] < 30.0 and np.all(np.diff(t) > 0)
+
+    ts, rr = p.window_since(t[-1] - 2.0)
+    assert ts.size == 4 and rr.tolist() == [500.0] * 4
+
+
+def test_processor_time_window_stats_match_batch():
+    rr = _synthetic_rr(900, seed=5)
+    rr[::23] += 90.0
+    t = 1000.0 + np.cumsum(rr) / 1000.0      # instants explicites
+    p = Processor(window_s=120.0, hrv_window_s=45.0)
+    for i in range(rr.size):
+        p.push_rr(rr[i], t[i])
+        if i % 97 == 11:
+            sel = t[:i + 1] > t[i] - 120.0
+            np.testing.assert_allclose(p.rr_list, rr[:i + 1][sel])
+            ref = compute_time_domain(rr[:i + 1][t[:i + 1] > t[i] - 45.0])
+            got = p.time_domain.as_dict()
+            for key in ref:
+                assert abs(got[key] - ref[key]) < 1e-6, key
+
+
+def test_shorter_hrv_window_keeps_rr_window_stats():
+    # FC qui dérive : les moyennes des fenêtres 60 s et 120 s diffèrent
+    from pipeline.summary import resp_metrics
+
+    class FixedEDR:
+        def estimate(self, t, rr):
+            return 6.0, 0.8, None
+
+    rr = _synthetic_rr(400, seed=2) + np.linspace(0.0, 150.0, 400)
+    p = Processor(window_s=120.0, hrv_window_s=60.0)
+    for x in rr:
+        p.push_rr(x)
+    assert not p.time_domain_spans_window
+    state = p.compute_state()
+    assert abs(float(np.mean(state.resp_signal))) < 1e-9
+
+    row = resp_metrics(p, state, FixedEDR(), p.rr_times, state.rr_list, welch=False)
+    assert abs(row["sync"] - compute_sync_score(state.rr_list, 6.0, 0.8)) < 1e-9
+
+
+def test_sync_score_uses_precomputed_stats():
+    rr = _synthetic_rr(60)
+    ref = compute_sync_score(rr, 6.0, 0.8)
+    got = compute_sync_score(rr, 6.0, 0.8, rr_mean=float(np.mean(rr)), rr_std=float(np.std(rr)))
+    assert abs(ref - got) < 1e-9
+
+
+def test_sliding_band_power_matches_welch_segment():
+    rr = _synthetic_rr(400, seed=1)
+    sb = SlidingBandPower()
+    for x in rr:
+        sb.push_rr(x)
+
+    # même rééchantillonnage que compute_spectral, dernier segment de N points
+    r = rr / 1000.0
+    t = np.cumsum(r) - r[0]
+    y = np.interp(np.arange(0, t[-1], 1.0 / FS), t, r)[-sb.n:]
+    f, psd = welch(y - y.mean(), fs=FS, nperseg=sb.n)
+
+    spec = sb.spectrum()
+    idx = np.searchsorted(f, spec["freq"])
+    np.testing.assert_allclose(spec["power"], psd[idx], rtol=1e-6, atol=1e-12)
+
+
+def test_processor_sdft_mode():
+    p = Processor(spectral_mode="sdft")
+    for x in _synthetic_rr(400):
+        p.push_rr(x)
+    state = p.compute_state()
+    assert state.lf > 0.0 and state.hf > 0.0
+    assert 0.15 <= state.resp_freq <= 0.40
+
+
+def test_compute_state_is_memoized_by_generation():
+    p = Processor()
+    for x in _synthetic_rr(100):
+        p.push_rr(x)
+    gen = p.generation
+    s1 = p.compute_state()
+    assert p.compute_state() is s1
+    assert p.compute_state(force=True) is not s1
+    p.push_rr(900.0)
+    assert p.generation == gen + 1
+    assert p.compute_state() is not s1
+
+
+def test_spectral_stage_refreshes_every_n_beats():
+    p = Processor(spectral_every=4)
+    rr = _synthetic_rr(404)
+    for x in rr[:400]:
+        p.push_rr(x)
+    s1 = p.compute_state()
+    p.push_rr(rr[400])
+    s2 = p.compute_state()
+    assert s2.lf == s1.lf and s2.rmssd != s1.rmssd
+    for x in rr[401:]:
+        p.push_rr(x)
+    assert p.compute_state().lf != s1.lf
+
+
+def test_light_compute_keeps_heavy_stages():
+    p = Processor()
+    rr = _synthetic_rr(402)
+    for x in rr[:400]:
+        p.push_rr(x)
+    s1 = p.compute_state()
+    p.push_rr(rr[400])
+    light = p.compute_state(heavy=False)
+    assert light.power is s1.power and light.rmssd != s1.rmssd
+    assert p.compute_state(heavy=False) is light
+    # même génération, mais étages coûteux périmés : recalcul
+    full = p.compute_state()
+    assert full is not light and full.power is not s1.power
+    assert p.compute_state(heavy=False) is full
+
+
+def test_spectral_windows_match_per_window_welch():
+    rr = _synthetic_rr(1200, seed=2)
+    out = compute_spectral_windows(rr, window_s=120.0, hop_s=2.0)
+
+    r = rr / 1000.0
+    t = np.cumsum(r) - r[0]
+    y = np.interp(np.arange(0, t[-1], 1.0 / FS), t, r)
+    W, H = 480, 8
+    assert out["power"].shape[0] == (y.size - W) // H + 1
+    for i in (0, 11, out["power"].shape[0] - 1):
+        w = y[i * H:i * H + W]
+        f, psd = welch(w - w.mean(), fs=FS, nperseg=256)
+        np.testing.assert_allclose(out["power"][i], psd, rtol=1e-9, atol=1e-15)
+        assert out["peak_hf"][i] == f[(f >= 0.15) & (f <= 0.40)][np.argmax(psd[(f >= 0.15) & (f <= 0.40)])]
+
+
+def test_lomb_matches_exact_periodogram():
+    rr = _synthetic_rr(300, seed=4)
+    out = compute_spectral_lomb(rr)
+    r = rr / 1000.0
+    t = np.cumsum(r) - r[0]
+    exact = lombscargle(t, r - r.mean(), 2 * np.pi * out["freq"]) * 2.0 * t[-1] / r.size
+    np.testing.assert_allclose(out["power"], exact, rtol=0, atol=1e-3 * exact.max())
+
+    welch_lf = compute_spectral(rr)["lf"]
+    assert abs(out["lf"] - welch_lf) / welch_lf < 0.15
+
+
+def test_processor_lomb_mode():
+    p = Processor(spectral_mode="lomb")
+    for x in _synthetic_rr(300):
+        p.push_rr(x)
+    state = p.compute_state()
+    assert state.lf > 0.0 and state.hf > 0.0
+
+
+def test_clean_rr_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        clean_rr([800.0, 810.0, 820.0], backend="hrvanalysys")
+
+
+def test_clean_rr_falls_back_when_backend_fails():
+    def broken(rr):
+        raise RuntimeError("boom")
+
+    CLEAN_BACKENDS.register("broken", "hrv.hrv_backend:clean_rr_basic")
+    CLEAN_BACKENDS._loaded["broken"] = broken
+    try:
+        rr = _synthetic_rr(50)
+        assert clean_rr(rr, backend="broken") == clean_rr_basic(rr)
+    finally:
+        CLEAN_BACKENDS._specs.pop("broken")
+        CLEAN_BACKENDS._loaded.pop("broken")
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+test_recording.py
+-----------------
+Tests de l'enregistrement RR binaire (pipeline.recording) : aller-retour,
+reprise après écriture interrompue, relecture memmap sans copie.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from pipeline.batch import load_rr_file
+from pipeline.headless import HeadlessRunner, recorded, simulated_rr
+from pipeline.recording import (
+    HEADER_SIZE,
+    RECORD_SIZE,
+    RRRecorder,
+    RRRecording,
+    read_recording,
+)
+
+
+def test_roundtrip_is_memory_mapped(tmp_path):
+    path = tmp_path / "s.rrb"
+    t = np.cumsum(np.full(500, 0.8))
+    rr = 800.0 + 40.0 * np.sin(t)
+    with RRRecorder(path, flush_interval_s=0.01, t0=1.7e9) as rec:
+        for ti, x in zip(t[:200], rr[:200]):
+            rec.append(ti, x)
+        rec.append_many(t[200:], rr[200:])
+
+    assert path.stat().st_size == HEADER_SIZE + 500 * RECORD_SIZE
+    r = RRRecording(path)
+    assert len(r) == 500 and r.t0 == 1.7e9
+    assert isinstance(r.records, np.memmap) and not r.t.flags.writeable
+    assert np.shares_memory(r.t, r.records)
+    np.testing.assert_array_equal(r.t, t)
+    np.testing.assert_allclose(r.rr_ms, rr, rtol=1e-6)
+
+
+def test_reopen_truncates_interrupted_record_and_appends(tmp_path):
+    path = tmp_path / "s.rrb"
+    with RRRecorder(path) as rec:
+        rec.append_many([1.0, 2.0], [1000.0, 1000.0])
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 5)            # écriture interrompue
+    assert len(RRRecording(path)) == 2   # enregistrement incomplet ignoré
+
+    with RRRecorder(path) as rec:
+        assert rec.records == 2
+        rec.append(3.0, 900.0)
+        rec.flush()
+        # relisible pendant l'écriture
+        assert read_recording(path)[0].tolist() == [1.0, 2.0, 3.0]
+    assert read_recording(path)[1].tolist() == [1000.0, 1000.0, 900.0]
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "x.rrb"
+    path.write_bytes(b"t,rr\n" * 10)
+    with pytest.raises(ValueError):
+        RRRecording(path)
+    with pytest.raises(ValueError):
+        RRRecorder(path)
+
+
+def test_headless_recording_replays_through_batch_loader(tmp_path):
+    path = tmp_path / "live.rrb"
+    rec = RRRecorder(path)
+    source = recorded(simulated_rr(speed=0, limit=120, seed=3), rec)
+    runner = HeadlessRunner(source, lambda row: None)
+    asyncio.run(runner.run())
+    rec.close()
+
+    t, rr = load_rr_file(path)
+    assert t.size == rr.size == 120 == rec.records
+    assert np.all(np.diff(t) > 0) and 600 < rr.mean() < 1000
+
+
+def test_write_error_stops_appends_and_closes_file(tmp_path):
+    rec = RRRecorder(tmp_path / "s.rrb", flush_interval_s=0.01)
+
+    def disk_full():
+        raise OSError(28, "No space left on device")
+
+    rec._sync = disk_full                   # prochaine écriture de fond en échec
+    rec.append(1.0, 800.0)
+    rec._thread.join(2.0)
+    assert isinstance(rec.error, OSError)
+
+    with pytest.raises(OSError):
+        rec.append(2.0, 810.0)              # plus rien n'est accepté
+    with pytest.raises(OSError):
+        rec.append_many([3.0], [820.0])
+    assert rec._pending == []
+    with pytest.raises(OSError):
+        rec.close()
+    assert rec._f.closed
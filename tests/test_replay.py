@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+test_replay.py
+--------------
+Tests du rejeu accéléré (pipeline.replay) : horloge virtuelle, modes
+1× / N× / le plus vite possible, sessions de 20 minutes en test rapide.
+"""
+
+import asyncio
+
+import numpy as np
+
+from core.scheduler import MultiRateScheduler
+from pipeline.headless import JsonlSink, simulated_rr
+from pipeline.recording import RRRecorder
+from pipeline.replay import ReplayEngine, VirtualClock, synthetic_rr
+
+
+class FakeWall:
+    """Horloge murale factice : sleep() avance le temps sans attendre."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, dt):
+        self.now += dt
+
+
+def test_twenty_minute_session_replays_fast():
+    rows = []
+    engine = ReplayEngine.synthetic(minutes=20, resp_cpm=6.0, seed=0, every=60)
+    report = engine.run(rows.append)
+
+    assert report.beats == 1500 and report.rows == len(rows) == 25
+    assert 1190 < report.signal_s < 1210
+    assert report.realtime_factor > 50
+    # EDR + score au plus une fois par seconde de signal (RR ≈ 0.8 s)
+    assert report.signal_s / 2 <= report.heavy_runs <= report.signal_s
+    assert abs(rows[-1]["edr_cpm"] - 6.0) < 1.0
+
+
+def test_paced_modes_follow_signal_time_without_drift():
+    t, rr = synthetic_rr(200, seed=1)
+    results = []
+    for speed in (1.0, 10.0, 0.0):
+        wall = FakeWall()
+        clock = VirtualClock(speed, wall=wall, sleep=wall.sleep)
+        rows = []
+        engine = ReplayEngine(t, rr, clock=clock, every=20)
+        report = engine.run(rows.append)
+        expected = report.signal_s / speed if speed else 0.0
+        assert abs(clock.slept_s - expected) < 1e-6
+        assert clock() == t[-1]
+        results.append(rows)
+    # même signal, mêmes états, quelle que soit la vitesse
+    assert results[0] == results[1] == results[2]
+
+
+def test_virtual_clock_drives_scheduler():
+    clock = VirtualClock(0.0)
+    ticks = []
+    sched = MultiRateScheduler(clock=clock)
+    sched.add("spectral", lambda: ticks.append(clock()), rate_hz=1.0)
+    t, rr = synthetic_rr(120, base_hr_bpm=60.0, seed=2)
+    for ti in t:
+        clock.advance_to(ti)
+        sched.tick()
+    # ~120 s de signal rejoués sans attente : au plus une exécution par
+    # seconde virtuelle (les échéances tombées entre deux battements sautent)
+    assert 100 <= len(ticks) <= 121
+    assert np.diff(ticks).min() > 0.9
+
+
+def test_replay_from_recording(tmp_path):
+    t, rr = synthetic_rr(300, seed=3)
+    with RRRecorder(tmp_path / "s.rrb") as rec:
+        rec.append_many(t, rr)
+    report = ReplayEngine.from_file(tmp_path / "s.rrb", every=100).run(limit=250)
+    assert report.beats == 250 and report.rows == 2
+    np.testing.assert_allclose(report.signal_s, t[249], rtol=1e-6)
+
+
+def test_synthetic_rr_matches_simulated_source():
+    async def collect():
+        return [s async for s in simulated_rr(speed=0, limit=50, seed=7)]
+
+    samples = asyncio.run(collect())
+    t, rr = synthetic_rr(50, seed=7)
+    np.testing.assert_allclose(rr, [s.rr_ms for s in samples])
+    np.testing.assert_allclose(t, [s.t for s in samples])
+
+
+def test_jsonl_sink_truncates_existing_file(tmp_path):
+    path = tmp_path / "etats.jsonl"
+    path.write_text("ancienne session\n", encoding="utf-8")
+    sink = JsonlSink(str(path))
+    sink.write({"t": 1.0})
+    sink.close()
+    assert path.read_text(encoding="utf-8") == '{"t":1.0}\n'
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+test_resp_guide.py
+------------------
+Tests du guide respiratoire : motifs compilés en table, lecture O(1)
+de la phase, horloge monotone.
+"""
+
+import numpy as np
+import pytest
+
+from resp_guide import BreathPattern, RespGuideGenerator, compile_pattern
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 100.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_lut_is_cached_and_closed():
+    p = BreathPattern(4.0, 6.0)
+    lut = compile_pattern(p)
+    assert compile_pattern(BreathPattern(4.0, 6.0)) is lut
+    assert lut.y[0] == lut.y[-1] == -1.0
+    assert lut.value_at(4.0) == pytest.approx(1.0, abs=1e-4)
+    assert not lut.y.flags.writeable
+
+
+def test_value_at_matches_analytic_shape():
+    p = BreathPattern(4.0, 6.0, hold_in=2.0, hold_out=1.0)
+    lut = compile_pattern(p)
+    for phase in np.linspace(0.0, 13.0, 97):
+        if phase < 4.0:
+            ref = -np.cos(np.pi * phase / 4.0)
+        elif phase < 6.0:
+            ref = 1.0
+        elif phase < 12.0:
+            ref = np.cos(np.pi * (phase - 6.0) / 6.0)
+        else:
+            ref = -1.0
+        assert lut.value_at(phase) == pytest.approx(ref, abs=2e-3)
+    assert lut.segment_at(5.0) == "hold_in"
+    assert lut.segment_at(12.5) == "hold_out"
+    assert lut.segment_at(13.0 + 1.0) == "inhale"
+
+
+def test_linear_shape_and_validation():
+    lut = compile_pattern(BreathPattern(2.0, 2.0, shape="linear"))
+    assert lut.value_at(1.0) == pytest.approx(0.0)
+    assert lut.value_at(3.0) == pytest.approx(0.0)
+    with pytest.raises(ValueError):
+        BreathPattern(4.0, 6.0, shape="carre")
+    with pytest.raises(ValueError):
+        BreathPattern(0.0, 6.0)
+
+
+def test_guide_follows_clock_and_keeps_phase_on_change():
+    clock = FakeClock()
+    guide = RespGuideGenerator(4.0, 6.0, clock=clock)
+    t, _ = guide.generate_waveform()
+
+    clock.t += 12.5                     # un cycle + 2.5 s
+    guide.tick()
+    assert guide.phase == pytest.approx(2.5)
+
+    guide.set_durations(4, 6)           # identique : pas de recompilation
+    assert guide.generate_waveform()[0] is t
+
+    guide.set_durations(6, 9)           # même fraction du cycle
+    assert guide.phase == pytest.approx(3.75)
+    assert guide.generate_waveform()[0] is not t
+    clock.t += 1.0
+    guide.tick()
+    assert guide.phase == pytest.approx(4.75)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+test_scheduler.py
+-----------------
+Tests de core.scheduler : cadences, priorités, tâches événementielles,
+images sautées (retard / budget dépassé). Horloge simulée.
+"""
+
+import time
+
+from core.scheduler import MultiRateScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_tasks_run_at_their_own_rate():
+    clock = FakeClock()
+    sched = MultiRateScheduler(clock=clock)
+    runs = {"fast": 0, "slow": 0}
+    sched.add("fast", lambda: runs.__setitem__("fast", runs["fast"] + 1), rate_hz=30)
+    sched.add("slow", lambda: runs.__setitem__("slow", runs["slow"] + 1), rate_hz=1)
+
+    for _ in range(300):           # 3 s par pas de 10 ms
+        sched.tick()
+        clock.t += 0.01
+    assert 88 <= runs["fast"] <= 91
+    assert runs["slow"] == 3
+
+
+def test_event_task_runs_once_per_trigger_in_priority_order():
+    clock = FakeClock()
+    sched = MultiRateScheduler(clock=clock)
+    order = []
+    sched.add("labels", lambda: order.append("labels"), priority=0)
+    sched.add("plots", lambda: order.append("plots"), priority=1)
+
+    assert sched.tick() == 0
+    sched.trigger("labels")
+    sched.trigger("plots")
+    sched.trigger("labels")
+    assert sched.tick() == 2
+    assert order == ["plots", "labels"]
+    assert sched.tick() == 0
+    assert sched.time_to_next() is None
+
+
+def test_late_tick_skips_missed_frames_instead_of_catching_up():
+    clock = FakeClock()
+    sched = MultiRateScheduler(clock=clock)
+    calls = []
+    sched.add("guide", lambda: calls.append(clock.t), rate_hz=10)
+
+    sched.tick()
+    clock.t = 0.55                 # 5 images manquées
+    sched.tick()
+    sched.tick()
+    assert len(calls) == 2
+    assert sched.task("guide").skipped == 4
+    assert abs(sched.time_to_next() - 0.05) < 1e-9
+
+
+def test_budget_defers_skippable_tasks():
+    clock = FakeClock()
+    sched = MultiRateScheduler(budget_ms=1.0, clock=clock)
+    ran = []
+    sched.add("guide", lambda: (ran.append("guide"), time.sleep(0.003)),
+              rate_hz=30, priority=2, skippable=False)
+    sched.add("labels", lambda: ran.append("labels"), priority=0)
+
+    sched.trigger("labels")
+    sched.tick()
+    assert ran == ["guide"]
+    assert sched.task("labels").skipped == 1
+    # toujours en attente : exécutée au tick suivant (guide pas encore dû)
+    sched.tick()
+    assert ran == ["guide", "labels"]
+    assert sched.stats()["labels"]["runs"] == 1
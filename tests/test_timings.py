@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+test_timings.py
+---------------
+Tests de l'instrumentation par étage : histogrammes de core.debug,
+stats() du Processor / de l'EDR, texte du HUD de performance, traces
+Chrome trace-event (core.debug.Tracer).
+"""
+
+import io
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from core.debug import HIST_BINS, TRACER, StageTimings, TimingHistogram, Tracer, timeblock
+from edr.edr_premium import EDRPremium
+from pipeline.processor import Processor
+from pipeline.replay import synthetic_rr
+
+
+def test_histogram_percentiles_are_close_and_memory_is_fixed():
+    h = TimingHistogram()
+    values = np.random.default_rng(0).lognormal(mean=0.0, sigma=1.0, size=20000)
+    for v in values:
+        h.record(float(v))
+    assert len(h.counts) == HIST_BINS and h.count == values.size
+    for q in (50, 95):
+        assert h.percentile(q) == pytest.approx(np.percentile(values, q), rel=0.15)
+    assert h.percentile(100) == h.max_ms == values.max()
+    d = h.as_dict()
+    assert d["mean_ms"] == pytest.approx(values.mean())
+
+    h.record(0.0)                   # sous le premier bin
+    h.record(1e9)                   # au-delà du dernier
+    assert h.counts[0] == 1 and h.counts[-1] == 1
+
+
+def test_stage_timings_and_timeblock():
+    timings = StageTimings()
+    for _ in range(3):
+        with timings.stage("a"):
+            pass
+    with timeblock("b", timings=timings):
+        pass
+    stats = timings.stats()
+    assert list(stats) == ["a", "b"]
+    assert stats["a"]["count"] == 3 and stats["b"]["count"] == 1
+
+    timings.enabled = False
+    with timings.stage("a"):
+        pass
+    timings.record("c", 1.0)
+    assert timings.stats()["a"]["count"] == 3 and "c" not in timings.stats()
+    timings.reset()
+    assert timings.stats()["a"]["count"] == 0
+
+
+def test_processor_and_edr_record_stages():
+    t, rr = synthetic_rr(200, seed=0)
+    p = Processor(max_window=120)
+    for x in rr:
+        p.push_rr(x)
+        p.compute_state()
+    p.compute_state()               # en cache : non compté
+
+    stats = p.stats()
+    assert stats["compute"]["count"] == 200
+    assert {"time_domain", "spectral", "interpolation", "welch", "score", "resp"} <= set(stats)
+    # interpolation + Welch font partie de l'étage spectral
+    assert stats["welch"]["count"] == stats["interpolation"]["count"] <= stats["spectral"]["count"]
+
+    for edr in (EDRPremium(), EDRPremium(streaming=True)):
+        edr.estimate(t, rr)
+        assert set(edr.timings.stats()) == {"interpolation", "rsa_filter", "peak_search",
+                                            "normalize"}
+
+
+def test_hud_text_flags_stages_over_budget():
+    from app.perf_hud import format_sections
+
+    timings = StageTimings()
+    timings.record("frame", 5.0)
+    timings.record("draw_rr", 50.0)
+    text = format_sections([("interface", timings.stats())], budget_ms=33)
+    lines = text.splitlines()
+    assert lines[1] == "interface"
+    assert lines[2].startswith("  frame") and lines[3].startswith("! draw_rr")
+
+
+def test_tracer_ring_keeps_latest_spans_and_dumps_chrome_json():
+    tracer = Tracer(capacity=8)
+    with tracer.span("off"):
+        pass
+    assert len(tracer) == 0             # désactivé : rien n'est enregistré
+
+    tracer.enable()
+    for i in range(20):
+        with tracer.span(f"s{i}", {"i": i}):
+            pass
+    tracer.instant("mark")
+    assert len(tracer) == 8
+
+    out = io.StringIO()
+    tracer.dump(out)
+    events = json.loads(out.getvalue())["traceEvents"]
+    spans = [e for e in events if e["ph"] != "M"]
+    assert [e["name"] for e in spans] == [f"s{i}" for i in range(13, 20)] + ["mark"]
+    assert spans[0]["ph"] == "X" and spans[0]["dur"] >= 0 and spans[0]["args"] == {"i": 13}
+    assert spans[-1]["ph"] == "i"
+    assert [e["ts"] for e in spans] == sorted(e["ts"] for e in spans)
+    meta = [e for e in events if e["ph"] == "M"]
+    assert meta[0]["args"]["name"] == threading.current_thread().name
+
+
+def test_pipeline_stages_are_traced_from_several_threads():
+    TRACER.clear()
+    TRACER.enable()
+    try:
+        def work():
+            p = Processor(max_window=60)
+            for x in synthetic_rr(60, seed=1)[1]:
+                p.push_rr(x)
+            p.compute_state()
+
+        threads = [threading.Thread(target=work, name=f"w{i}") for i in range(3)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+    finally:
+        TRACER.disable()
+
+    events = TRACER.events()
+    names = {e["name"] for e in events}
+    assert {"push_rr", "compute", "spectral", "welch"} <= names
+    assert sum(e["name"] == "push_rr" for e in events) == 180
+    # noms notés au premier span, même si le thread est terminé (les
+    # identifiants peuvent être réutilisés par un thread suivant)
+    threads = {e["args"]["name"] for e in events if e["ph"] == "M"}
+    assert threads and threads <= {"w0", "w1", "w2"}
+    TRACER.clear()